@@ -20,25 +20,70 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 from __future__ import annotations
 
 import ctypes
+import operator
 import os
 import re
 import sys
+import threading
 import warnings
 from contextlib import contextmanager
 from ctypes.util import find_library
 from typing import TYPE_CHECKING, Any, ClassVar
 
 from .__about__ import __major__, __minor__, __patch__, __version__
+from .cache import OutputShadow, ReadCache, ReadCacheStats
 from .exceptions import UnknownPLCConfError
-from .lib_types import DigitalLevel, PinType
-from .mapping import PLCMappingDict
+from .filters import FilterPipeline, filtered_read
+from .lib_types import DigitalLevel, PeripheralType, PinType
+from .locking import DeviceLocks
+from .mapping import PLCMappingDict, PLCMappingIndex, make_pin_pca9685, split_pin
+from .pin import Pin
+from .process_image import ProcessImage
+from .registry import model_index
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable, Mapping
+
+    from .capture import CaptureResult
+    from .filters import AnalogFilter
+    from .streaming import SampleStream
 
 
 C_ABI_VERSION_4 = 4
 
+# Attributes that are only available once the C library is loaded
+_LIBRARY_ATTRIBUTES = frozenset(
+    (
+        "_dyn_lib",
+        "_is_library_old",
+        "c_version",
+        "c_version_major",
+        "c_version_minor",
+        "c_version_patch",
+    )
+)
+
+# Peripherals whose pins can be read all at once with digitalReadAll
+_DIGITAL_READ_ALL_PERIPHERALS = (PeripheralType.PLC_MCP23008, PeripheralType.PLC_MCP23017)
+# Peripherals whose pins can be written all at once with digitalWriteAll
+_DIGITAL_WRITE_ALL_PERIPHERALS = (
+    PeripheralType.PLC_MCP23008,
+    PeripheralType.PLC_MCP23017,
+    PeripheralType.PLC_PCA9685,
+)
+_EXPANDER_WIDTHS = {
+    PeripheralType.PLC_MCP23008: 8,
+    PeripheralType.PLC_MCP23017: 16,
+    PeripheralType.PLC_PCA9685: 16,
+}
+PCA9685_CHANNELS = 16
+# Value used to remember the PCA9685 channels that are fully on because of a digital write, as
+# it isn't the same as writing the maximum analog value
+_PCA9685_FULL_ON = 0x1000
+_PCA9685_MAX_VALUE = 0x0FFF
+# Largest value that analogWrite and analogWriteAll can take (uint16_t)
+_ANALOG_MAX_VALUE = 0xFFFF
+
 
 class CPeripherals(ctypes.Structure):
     """
@@ -78,6 +123,11 @@ class RPIPLCClass:
 
     This class provides methods to directly interface with the C library.
 
+    Its methods can be called from several threads at once. Every call into the C library holds
+    the lock of the device of the pin (each direct GPIO and each I2C peripheral has its own), and
+    the calls to I2C peripherals also hold the lock of the I2C bus, so the direct GPIOs never wait
+    on I2C traffic.
+
     Attributes:
         INPUT (PinType): Constant for input pin mode.
         OUTPUT (PinType): Constant for output pin mode.
@@ -93,35 +143,82 @@ class RPIPLCClass:
 
     def __init__(self) -> None:
         """
-        Initialize the RPIPLCClass instance and loads the C library into memory.
+        Initialize the RPIPLCClass instance.
+
+        The C library isn't loaded into memory until it's needed for the first time, or until
+        load_library() is called.
+
+        """
+        self._mapping: Mapping[str, int] = PLCMappingDict({})
+        self._index = PLCMappingIndex(self._mapping)
+        self._is_initialized = False
+
+        self.python_version_major = __major__
+        self.python_version_minor = __minor__
+        self.python_version_patch = __patch__
+        self.python_version = __version__
+
+        self._c_struct: CPeripherals | None = None
+
+        # Last value written by this process to each PCA9685 channel, and a bitmask of the
+        # channels whose value is known, as the PCA9685 outputs can't be read back
+        self._pca9685_outputs: dict[int, list[int]] = {}
+        self._pca9685_known: dict[int, int] = {}
+
+        self._write_all_buffers: dict[int, tuple[Any, Any]] = {}
+
+        self._output_shadow = OutputShadow()
+        self._read_cache = ReadCache()
+        self._analog_filters: dict[int, FilterPipeline] = {}
+
+        self._read_all_buffers: dict[int, tuple[Any, Any]] = {}
+
+        self._locks = DeviceLocks()
+        self._library_lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Load the C library the first time that one of its attributes is needed."""
+        if name in _LIBRARY_ATTRIBUTES and "_dyn_lib" not in self.__dict__:
+            self.load_library()
+            return getattr(self, name)
+        msg = f"'{type(self).__name__}' object has no attribute '{name}'"
+        raise AttributeError(msg)
+
+    def load_library(self, library_path: str | None = None) -> None:
+        """
+        Load the C library into memory, if it isn't already loaded.
 
-        If some symbol is undefined, it will raise UnknownPLCConfError.
+        It's called automatically the first time the C library is needed, but it can be called
+        before to load the C library from a specific path instead of searching it with
+        find_library (which spawns some subprocesses).
+
+        Args:
+            library_path (str | None): The path of the C library, or None to search it.
 
         Raises:
+            OSError: If the C library is not installed.
             UnknownPLCConfError: If the C library version is incompatible.
 
         """
-        self._mapping = PLCMappingDict({})
-        self._is_initialized = False
-        libname = find_library("rpiplc")
+        with self._library_lock:
+            if "_dyn_lib" not in self.__dict__:
+                self._load_library(library_path)
+
+    def _load_library(self, library_path: str | None) -> None:
+        """Load the C library into memory, see load_library()."""
+        libname = library_path or find_library("rpiplc")
         if not libname:
             msg = "librpiplc is not installed in this system"
             raise OSError(msg)
-        self._dyn_lib: ctypes.CDLL = ctypes.cdll.LoadLibrary(libname)
+        dyn_lib = ctypes.cdll.LoadLibrary(libname)
 
         incompatible_msg = "The librpiplc C library is not compatible with this Python library"
 
         try:
-            c_version_major = ctypes.c_int.in_dll(
-                self._dyn_lib, "LIB_RPIPLC_VERSION_MAJOR_NUM"
-            ).value
-            c_version_minor = ctypes.c_int.in_dll(
-                self._dyn_lib, "LIB_RPIPLC_VERSION_MINOR_NUM"
-            ).value
-            c_version_patch = ctypes.c_int.in_dll(
-                self._dyn_lib, "LIB_RPIPLC_VERSION_PATCH_NUM"
-            ).value
-            c_version = ctypes.c_char_p.in_dll(self._dyn_lib, "LIB_RPIPLC_VERSION").value
+            c_version_major = ctypes.c_int.in_dll(dyn_lib, "LIB_RPIPLC_VERSION_MAJOR_NUM").value
+            c_version_minor = ctypes.c_int.in_dll(dyn_lib, "LIB_RPIPLC_VERSION_MINOR_NUM").value
+            c_version_patch = ctypes.c_int.in_dll(dyn_lib, "LIB_RPIPLC_VERSION_PATCH_NUM").value
+            c_version = ctypes.c_char_p.in_dll(dyn_lib, "LIB_RPIPLC_VERSION").value
             if (
                 c_version is None
                 or c_version_patch is None
@@ -137,16 +234,15 @@ class RPIPLCClass:
         except ValueError as exc:
             raise UnknownPLCConfError(incompatible_msg) from exc
 
-        self.python_version_major = __major__
-        self.python_version_minor = __minor__
-        self.python_version_patch = __patch__
-        self.python_version = __version__
-
         self._is_library_old = self.c_version_major < C_ABI_VERSION_4
 
-        self._c_prepare_arg_and_return_types()
-
-        self._c_struct: CPeripherals | None = None
+        self._dyn_lib: ctypes.CDLL = dyn_lib
+        try:
+            self._c_prepare_arg_and_return_types()
+        except AttributeError as exc:
+            # A missing symbol must not look like a missing attribute of this class
+            del self._dyn_lib
+            raise UnknownPLCConfError(incompatible_msg) from exc
 
     def __new__(cls) -> RPIPLCClass:  # noqa: PYI034
         """Override method to make the class a singleton."""
@@ -286,43 +382,26 @@ class RPIPLCClass:
                 stacklevel=2,
             )
 
-        available_versions = {
-            "RPIPLC_V6": "rpiplc_mapping_v6",
-            "RPIPLC_V4": "rpiplc_mapping_v4",
-            "RPIPLC_V3": "rpiplc_mapping_v3",
-            "UPSAFEPI_V6": "upsafepi_mapping_v6",
-            "GATEBERRY_V9": "gateberry_mapping_v9",
-            "TOUCHBERRY_PI_V1": "touchberry_pi_mapping_v1",
-        }
-
-        hw = {}
-        try:
-            module_name = available_versions[version_name]
-            if self._is_library_old:
-                module_name = f"old_{module_name}"
-            hw = __import__(f"librpiplc.{module_name}", fromlist=["hw"]).hw
-        except KeyError as exc:
-            pretty_versions = "\n" + "\n".join(available_versions.keys())
-            error_str = (
-                f"Unknown version {version_name}, the only available versions "
-                f"are:{pretty_versions}"
-            )
-            raise UnknownPLCConfError(error_str) from exc
-
-        try:
-            self._mapping = hw[model_name]
-        except KeyError as exc:
-            pretty_models = "\n" + "\n".join(hw.keys())
-            error_str = (
-                f"Unknown model {model_name}, the only available models "
-                f"for {version_name} are:{pretty_models}"
-            )
-            raise UnknownPLCConfError(error_str) from exc
+        self._index = model_index(version_name, model_name, old_library=self._is_library_old)
+        self._mapping = self._index.mapping
 
-        if not self._is_library_old:
-            self._c_populate_arrays(version_name, model_name)
-        rc = int(self._dyn_lib.initExpandedGPIO(restart))
+        self._locks.old_library = self._is_library_old
+        with self._locks.bus:
+            if not self._is_library_old:
+                self._c_populate_arrays(version_name, model_name)
+            rc = int(self._dyn_lib.initExpandedGPIO(restart))
         self._is_initialized = rc in (0, 1)
+        self._pca9685_outputs.clear()
+        self._pca9685_known.clear()
+        if rc == 0 and restart and not self._is_library_old:
+            # The restarted PCA9685 have all their channels off
+            for peripheral_type, addr in self._index.peripherals():
+                if peripheral_type is PeripheralType.PLC_PCA9685:
+                    self._pca9685_outputs[addr] = [0] * PCA9685_CHANNELS
+                    self._pca9685_known[addr] = (1 << PCA9685_CHANNELS) - 1
+        self._output_shadow.invalidate()
+        self._read_cache.invalidate()
+        self._analog_filters.clear()
         return rc
 
     @contextmanager
@@ -367,21 +446,25 @@ class RPIPLCClass:
                             deinit.
 
         """
-        if not self._is_library_old:
+        if self._is_library_old and not restart:
+            msg = "This library version doesn't support de-initializing without restarting"
+            raise UnknownPLCConfError(msg)
+        with self._locks.bus:
             if restart:
                 rc = int(self._dyn_lib.deinitExpandedGPIO())
             else:
                 rc = int(self._dyn_lib.deinitExpandedGPIONoReset())
-        else:
-            if not restart:
-                msg = "This library version doesn't support de-initializing without restarting"
-                raise UnknownPLCConfError(msg)
-            rc = int(self._dyn_lib.deinitExpandedGPIO())
 
         if rc in (0, 2):
             self._mapping = PLCMappingDict({})
+            self._index = PLCMappingIndex(self._mapping)
             self._is_initialized = False
             self._c_struct = None
+            self._pca9685_outputs.clear()
+            self._pca9685_known.clear()
+            self._output_shadow.invalidate()
+            self._read_cache.invalidate()
+            self._analog_filters.clear()
 
         return rc
 
@@ -397,31 +480,252 @@ class RPIPLCClass:
             int: Return code from the pinMode function (0 for success, non-zero for failure).
 
         """
-        return int(self._dyn_lib.pinMode(self._mapping[pin_name], mode.value))
+        pin = self._mapping[pin_name]
+        with self._locks.device(pin), self._locks.bus_for(pin):
+            return int(self._dyn_lib.pinMode(pin, mode.value))
 
-    def digital_write(self, pin_name: str, level: DigitalLevel | int | bool) -> int:  # noqa: FBT001
+    def digital_write(
+        self,
+        pin_name: str,
+        level: DigitalLevel | int | bool,  # noqa: FBT001
+        *,
+        force: bool = False,
+    ) -> int:
         """
         Write a digital value to a specified pin.
 
         Args:
             pin_name (str): The name of the pin to write to.
             level (DigitalLevel): The digital level to write (LOW or HIGH).
+            force (bool): Whether to write the value even if the output shadow says that the pin
+                          already has it (default is False).
 
         Returns:
             int: Return code from the digitalWrite function (0 for success, non-zero for failure).
+                 If the write is skipped because of the output shadow, it returns 0.
+
+        """
+        pin = self._mapping[pin_name]
+        digital_level = self._as_digital_level(level, "digital_write")
+        if not force and self._output_shadow.digital_unchanged(pin, digital_level.value):
+            return 0
+        return self._digital_write_pin(pin, digital_level)
+
+    def digital_write_many(
+        self,
+        levels: Mapping[str, DigitalLevel | int | bool],
+        *,
+        force: bool = False,
+    ) -> int:
+        """
+        Write the digital values of several pins, coalescing the writes of each expander.
+
+        All the given pins that live on the same MCP23008/MCP23017/PCA9685 are folded into a
+        bitmask and written with a single digitalWriteAll call, while the rest of them are written
+        one by one with digitalWrite. The pins of the expander that aren't given keep their current
+        value:
+        - For the MCP23008/MCP23017, it is read back with digitalReadAll when needed.
+        - The PCA9685 can't be read back, so its pins are written one by one until the value of
+          all its channels used by the model is known (because they were written through this
+          class after init). The same happens when any of its other channels holds an analog
+          value.
+
+        With older versions of librpiplc (<4.X.X) every pin is written with digitalWrite.
+
+        If the output shadow is enabled, the pins that already have the given level are skipped.
+
+        Args:
+            levels (Mapping[str, DigitalLevel | int | bool]): The digital level to write to each
+                                                              pin name (LOW or HIGH).
+            force (bool): Whether to write all the pins, even the ones that the output shadow says
+                          that already have the given level (default is False).
+
+        Returns:
+            int: 0 for success, or the first non-zero return code of the underlying calls.
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model, in which case no
+                             pin is written.
+
+        """
+        # All the pins are resolved before writing any of them, so a bad pin name doesn't leave
+        # the write half applied
+        writes: list[tuple[tuple[int, PeripheralType | None, int, int], DigitalLevel]] = []
+        for pin_name, level in levels.items():
+            resolved = self._index.resolve(pin_name)
+            writes.append((resolved, self._as_digital_level(level, "digital_write_many")))
+
+        rc = 0
+        expanders: dict[tuple[PeripheralType, int], dict[int, tuple[int, DigitalLevel]]] = {}
+        for (pin, peripheral_type, addr, index), digital_level in writes:
+            if not force and self._output_shadow.digital_unchanged(pin, digital_level.value):
+                continue
+            if peripheral_type in _DIGITAL_WRITE_ALL_PERIPHERALS:
+                expanders.setdefault((peripheral_type, addr), {})[index] = (pin, digital_level)
+            else:
+                pin_rc = self._digital_write_pin(pin, digital_level)
+                rc = rc or pin_rc
+
+        for (peripheral_type, addr), expander_levels in expanders.items():
+            first_pin = next(iter(expander_levels.values()))[0]
+            with self._locks.device(first_pin):
+                expander_rc = self._digital_write_expander(peripheral_type, addr, expander_levels)
+            rc = rc or expander_rc
+
+        return rc
+
+    def _as_digital_level(
+        self,
+        level: DigitalLevel | int | bool,  # noqa: FBT001
+        method_name: str,
+    ) -> DigitalLevel:
+        """
+        Convert the level given to a digital write method into a DigitalLevel.
+
+        It must be called directly by the public method, so the deprecation warning of the
+        integers points at the caller of that method.
+
+        Args:
+            level (DigitalLevel | int | bool): The level given to the method.
+            method_name (str): The name of the method, for the deprecation warning.
+
+        Returns:
+            DigitalLevel: The digital level.
 
         """
+        if isinstance(level, DigitalLevel):
+            return level
         if isinstance(level, bool):
-            level = self.HIGH if level else self.LOW
-        elif isinstance(level, int):
-            warnings.warn(
-                "Passing an int to digital_write is not recommended, use HIGH, LOW, booleans, or "
-                "the DigitalLevel enum. The usage of integers will be removed in future versions.",
-                category=DeprecationWarning,
-                stacklevel=2,
-            )
-            level = self.HIGH if level > 0 else self.LOW
-        return int(self._dyn_lib.digitalWrite(self._mapping[pin_name], level.value))
+            return self.HIGH if level else self.LOW
+        warnings.warn(
+            f"Passing an int to {method_name} is not recommended, use HIGH, LOW, booleans, or "
+            "the DigitalLevel enum. The usage of integers will be removed in future versions.",
+            category=DeprecationWarning,
+            # This method, the public method and its caller
+            stacklevel=3,
+        )
+        return self.HIGH if level > 0 else self.LOW
+
+    def _digital_write_pin(self, pin: int, level: DigitalLevel) -> int:
+        """Write a digital value to a pin identifier, keeping track of the written outputs."""
+        with self._locks.device(pin):
+            with self._locks.bus_for(pin):
+                rc = int(self._dyn_lib.digitalWrite(pin, level.value))
+            self._output_shadow.digital_written(pin, level.value, rc)
+            self._read_cache.forget(pin)
+            if rc == 0 and not self._is_library_old:
+                peripheral_type, addr, index = split_pin(pin)
+                if peripheral_type is PeripheralType.PLC_PCA9685:
+                    self._record_pca9685_output(addr, index, _PCA9685_FULL_ON * level.value)
+        return rc
+
+    def _pca9685_digital_written(self, pin: int, level: int) -> None:
+        """Remember the digital level written to a PCA9685 pin identifier."""
+        _, addr, index = split_pin(pin)
+        self._record_pca9685_output(addr, index, _PCA9685_FULL_ON if level else 0)
+
+    def _pca9685_analog_written(self, pin: int, value: int) -> None:
+        """Remember the analog value written to a PCA9685 pin identifier."""
+        _, addr, index = split_pin(pin)
+        self._record_pca9685_output(addr, index, value)
+
+    def _record_pca9685_output(self, addr: int, index: int, value: int) -> None:
+        """Remember the value written to a PCA9685 channel."""
+        index &= PCA9685_CHANNELS - 1
+        outputs = self._pca9685_outputs.get(addr)
+        if outputs is None:
+            outputs = self._pca9685_outputs[addr] = [0] * PCA9685_CHANNELS
+        outputs[index] = value
+        self._pca9685_known[addr] = self._pca9685_known.get(addr, 0) | (1 << index)
+
+    def _expander_untouched_values(
+        self, peripheral_type: PeripheralType, addr: int, untouched_mask: int
+    ) -> int | None:
+        """
+        Get the current digital values of the expander pins that aren't going to be written.
+
+        Args:
+            peripheral_type (PeripheralType): The type of the expander.
+            addr (int): The address of the expander.
+            untouched_mask (int): Bitmask of the expander pins that aren't going to be written.
+
+        Returns:
+            int | None: The bitmask of the untouched pins that are HIGH, or None if their values
+                        can't be known.
+
+        """
+        if not untouched_mask:
+            return 0
+
+        if peripheral_type is not PeripheralType.PLC_PCA9685:
+            values = self._digital_read_all(addr)
+            return None if values is None else values & untouched_mask
+
+        # The channels that aren't used by any pin of the model are not connected to anything, so
+        # it doesn't matter if their values are unknown
+        known_mask = self._pca9685_known.get(addr, 0)
+        used_mask = self._index.peripheral_mask(PeripheralType.PLC_PCA9685, addr)
+        if untouched_mask & used_mask & ~known_mask:
+            return None
+        values = 0
+        for index, value in enumerate(self._pca9685_outputs.get(addr, [])):
+            if not untouched_mask & known_mask & (1 << index):
+                continue
+            if value == _PCA9685_FULL_ON:
+                values |= 1 << index
+            elif value != 0:
+                return None
+        return values
+
+    def _digital_write_expander(
+        self,
+        peripheral_type: PeripheralType,
+        addr: int,
+        levels: dict[int, tuple[int, DigitalLevel]],
+    ) -> int:
+        """
+        Write several pins of the same expander with a single digitalWriteAll call if possible.
+
+        The lock of the expander must be held while calling it.
+
+        Args:
+            peripheral_type (PeripheralType): The type of the expander.
+            addr (int): The address of the expander.
+            levels (dict[int, tuple[int, DigitalLevel]]): The pin identifier and the digital level
+                                                          to write for each expander index.
+
+        Returns:
+            int: Return code from the digitalWriteAll function, or the first non-zero return code
+                 of the digitalWrite calls if falling back to them.
+
+        """
+        full_mask = (1 << _EXPANDER_WIDTHS[peripheral_type]) - 1
+        untouched_mask = full_mask
+        for index in levels:
+            untouched_mask &= ~(1 << index)
+
+        values = self._expander_untouched_values(peripheral_type, addr, untouched_mask)
+        if values is None:
+            rc = 0
+            for pin, level in levels.values():
+                pin_rc = self._digital_write_pin(pin, level)
+                rc = rc or pin_rc
+            return rc
+
+        for index, (_, level) in levels.items():
+            if level is DigitalLevel.HIGH:
+                values |= 1 << index
+        with self._locks.bus:
+            rc = int(self._dyn_lib.digitalWriteAll(addr, values & full_mask))
+        for pin, level in levels.values():
+            self._output_shadow.digital_written(pin, level.value, rc)
+            self._read_cache.forget(pin)
+        if rc == 0 and peripheral_type is PeripheralType.PLC_PCA9685:
+            for index in range(PCA9685_CHANNELS):
+                self._record_pca9685_output(
+                    addr, index, _PCA9685_FULL_ON if values & (1 << index) else 0
+                )
+        return rc
 
     def digital_read(self, pin_name: str) -> int:
         """
@@ -434,7 +738,88 @@ class RPIPLCClass:
             int: The digital value read from the pin (0 or 1).
 
         """
-        return int(self._dyn_lib.digitalRead(self._mapping[pin_name]))
+        pin = self._mapping[pin_name]
+        value = self._read_cache.get_digital(pin)
+        if value is None:
+            value = self._digital_read_pin(pin)
+        return value
+
+    def _digital_read_pin(self, pin: int) -> int:
+        """Read a digital value from a pin identifier, keeping it in the read cache."""
+        with self._locks.device(pin):
+            with self._locks.bus_for(pin):
+                value = int(self._dyn_lib.digitalRead(pin))
+            self._read_cache.put_digital(pin, value)
+        return value
+
+    def _digital_read_all(self, addr: int) -> int | None:
+        """
+        Read all the pins of an MCP23008/MCP23017 with digitalReadAll.
+
+        The lock of the expander must be held while calling it.
+
+        Args:
+            addr (int): The address of the expander.
+
+        Returns:
+            int | None: The bitmask of the pins that are HIGH, or None if the read failed.
+
+        """
+        buffers = self._read_all_buffers.get(addr)
+        if buffers is None:
+            value = ctypes.c_uint32()
+            value_ptr = ctypes.cast(ctypes.pointer(value), ctypes.POINTER(ctypes.c_void_p))
+            buffers = self._read_all_buffers[addr] = (value, value_ptr)
+        value, value_ptr = buffers
+
+        value.value = 0
+        with self._locks.bus:
+            if self._dyn_lib.digitalReadAll(addr, value_ptr) != 0:
+                return None
+        return int(value.value)
+
+    def digital_read_many(self, pin_names: Iterable[str]) -> dict[str, int]:
+        """
+        Read the digital values of several pins, coalescing the reads of each expander.
+
+        All the requested pins that live on the same MCP23008/MCP23017 are read with a single
+        digitalReadAll call, while the rest of them are read one by one with digitalRead. With
+        older versions of librpiplc (<4.X.X) every pin is read with digitalRead.
+
+        The pins whose value is in the read cache aren't read again.
+
+        Args:
+            pin_names (Iterable[str]): The names of the pins to read from.
+
+        Returns:
+            dict[str, int]: The digital value read from each pin (0 or 1), in the same order as
+                            the given pin names.
+
+        """
+        levels: dict[str, int] = {}
+        expanders: dict[int, list[tuple[str, int, int]]] = {}
+        for pin_name in pin_names:
+            pin, peripheral_type, addr, index = self._index.resolve(pin_name)
+            cached = self._read_cache.get_digital(pin)
+            if cached is not None:
+                levels[pin_name] = cached
+            elif peripheral_type in _DIGITAL_READ_ALL_PERIPHERALS:
+                levels[pin_name] = 0
+                expanders.setdefault(addr, []).append((pin_name, pin, index))
+            else:
+                levels[pin_name] = self._digital_read_pin(pin)
+
+        for addr, expander_pins in expanders.items():
+            with self._locks.device(expander_pins[0][1]):
+                values = self._digital_read_all(addr)
+                for pin_name, pin, index in expander_pins:
+                    if values is None:
+                        levels[pin_name] = self._digital_read_pin(pin)
+                    else:
+                        levels[pin_name] = (values >> index) & 1
+                        self._read_cache.put_digital(pin, levels[pin_name])
+
+        return levels
 
     def analog_write_set_frequency(self, pin_name: str, freq: int) -> int:
         """
@@ -449,25 +834,192 @@ class RPIPLCClass:
                  failure).
 
         """
-        return int(self._dyn_lib.analogWriteSetFrequency(self._mapping[pin_name], freq))
+        pin = self._mapping[pin_name]
+        with self._locks.device(pin), self._locks.bus_for(pin):
+            return int(self._dyn_lib.analogWriteSetFrequency(pin, freq))
 
-    def analog_write(self, pin_name: str, value: int) -> int:
+    def analog_write(self, pin_name: str, value: int, *, force: bool = False) -> int:
         """
         Write an analog value to a specified pin.
 
         Args:
             pin_name (str): The name of the pin to write to.
             value (int): The analog value to write (it's normally a number between 0 and 4095).
+            force (bool): Whether to write the value even if the output shadow says that the pin
+                          already has it (default is False).
 
         Returns:
             int: Return code from the analogWrite function (0 for success, non-zero for failure).
+                 If the write is skipped because of the output shadow, it returns 0.
+
+        """
+        pin = self._mapping[pin_name]
+        if not force and self._output_shadow.analog_unchanged(pin, value):
+            return 0
+        return self._analog_write_pin(pin, value)
+
+    def analog_write_many(self, values: Mapping[str, int], *, force: bool = False) -> int:
+        """
+        Write the analog values of several pins, coalescing the writes of each PCA9685.
+
+        All the given pins that live on the same PCA9685 are written with a single analogWriteAll
+        call, while the rest of them are written one by one with analogWrite. The channels of the
+        PCA9685 that aren't given keep their current value: the channels that are fully on because
+        of a digital write are written again with digitalWrite after the analogWriteAll call, and
+        if the value of some channel used by the model is unknown (nothing was written to it since
+        init() without restart), the pins of that PCA9685 are written one by one.
+
+        All the pins and values are checked before writing any of them, so no pin is written if
+        any of them is wrong.
+
+        With older versions of librpiplc (<4.X.X) every pin is written with analogWrite.
+
+        If the output shadow is enabled, the pins that already have the given value are skipped.
+
+        Args:
+            values (Mapping[str, int]): The analog value to write to each pin name (it's normally
+                                        a number between 0 and 4095).
+            force (bool): Whether to write all the pins, even the ones that the output shadow says
+                          that already have the given value (default is False).
+
+        Returns:
+            int: 0 for success, or the first non-zero return code of the underlying calls.
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model.
+            TypeError: If any value isn't an integer.
+            ValueError: If any value isn't between 0 and 65535.
+
+        """
+        # All the pins and values are checked before writing any of them, so a bad one doesn't
+        # leave the write half applied
+        writes: list[tuple[tuple[int, PeripheralType | None, int, int], int]] = []
+        for pin_name, value in values.items():
+            resolved = self._index.resolve(pin_name)
+            int_value = operator.index(value)
+            if not 0 <= int_value <= _ANALOG_MAX_VALUE:
+                msg = f"The analog value of {pin_name} must be between 0 and {_ANALOG_MAX_VALUE}"
+                raise ValueError(msg)
+            writes.append((resolved, int_value))
+
+        rc = 0
+        chips: dict[int, dict[int, tuple[int, int]]] = {}
+        for (pin, peripheral_type, addr, index), value in writes:
+            if not force and self._output_shadow.analog_unchanged(pin, value):
+                continue
+            if peripheral_type is PeripheralType.PLC_PCA9685:
+                chips.setdefault(addr, {})[index & (PCA9685_CHANNELS - 1)] = (pin, value)
+            else:
+                pin_rc = self._analog_write_pin(pin, value)
+                rc = rc or pin_rc
+
+        for addr, chip_values in chips.items():
+            first_pin = next(iter(chip_values.values()))[0]
+            with self._locks.device(first_pin):
+                chip_rc = self._analog_write_pca9685(addr, chip_values)
+            rc = rc or chip_rc
+
+        return rc
+
+    def _analog_write_pin(self, pin: int, value: int) -> int:
+        """Write an analog value to a pin identifier, keeping track of the written outputs."""
+        with self._locks.device(pin):
+            with self._locks.bus_for(pin):
+                rc = int(self._dyn_lib.analogWrite(pin, value))
+            self._output_shadow.analog_written(pin, value, rc)
+            self._read_cache.forget(pin)
+            if rc == 0 and not self._is_library_old:
+                peripheral_type, addr, index = split_pin(pin)
+                if peripheral_type is PeripheralType.PLC_PCA9685:
+                    self._record_pca9685_output(addr, index, value)
+        return rc
+
+    def _fill_pca9685_buffer(
+        self, addr: int, values: dict[int, tuple[int, int]], buffer: ctypes.Array[ctypes.c_uint16]
+    ) -> list[int] | None:
+        """
+        Fill the analogWriteAll buffer of a PCA9685 with the new values and the current ones.
+
+        Args:
+            addr (int): The address of the PCA9685.
+            values (dict[int, tuple[int, int]]): The pin identifier and the analog value to write
+                                                 for each PCA9685 channel.
+            buffer (ctypes.Array[ctypes.c_uint16]): The buffer of the values of all the channels.
+
+        Returns:
+            list[int] | None: The channels that are fully on, which must be set fully on again
+                              after the analogWriteAll call, or None if the value of a channel
+                              used by the model is unknown.
+
+        """
+        known_mask = self._pca9685_known.get(addr, 0)
+        unknown_mask = self._index.peripheral_mask(PeripheralType.PLC_PCA9685, addr) & ~known_mask
+        outputs = self._pca9685_outputs.get(addr, [0] * PCA9685_CHANNELS)
+        full_on: list[int] = []
+        for index in range(PCA9685_CHANNELS):
+            if index in values:
+                buffer[index] = values[index][1]
+            elif unknown_mask & (1 << index):
+                return None
+            elif outputs[index] == _PCA9685_FULL_ON:
+                buffer[index] = _PCA9685_MAX_VALUE
+                full_on.append(index)
+            else:
+                buffer[index] = outputs[index] if known_mask & (1 << index) else 0
+        return full_on
+
+    def _analog_write_pca9685(self, addr: int, values: dict[int, tuple[int, int]]) -> int:
+        """
+        Write several channels of the same PCA9685 with a single analogWriteAll call if possible.
+
+        analogWriteAll can't set a channel fully on, so the other channels that are fully on
+        because of a digital write get the maximum analog value and are set fully on again with
+        digitalWrite right after it. The lock of the PCA9685 must be held while calling it.
+
+        Args:
+            addr (int): The address of the PCA9685.
+            values (dict[int, tuple[int, int]]): The pin identifier and the analog value to write
+                                                 for each PCA9685 channel.
+
+        Returns:
+            int: Return code from the analogWriteAll function (or the first non-zero return code of
+                 the digitalWrite calls after it), or the first non-zero return code of the
+                 analogWrite calls if falling back to them.
 
         """
-        return int(self._dyn_lib.analogWrite(self._mapping[pin_name], value))
+        buffers = self._write_all_buffers.get(addr)
+        if buffers is None:
+            buffer = (ctypes.c_uint16 * PCA9685_CHANNELS)()
+            buffer_ptr = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_void_p))
+            buffers = self._write_all_buffers[addr] = (buffer, buffer_ptr)
+        buffer, buffer_ptr = buffers
+
+        full_on = self._fill_pca9685_buffer(addr, values, buffer)
+        if full_on is not None:
+            with self._locks.bus:
+                rc = int(self._dyn_lib.analogWriteAll(addr, buffer_ptr))
+            for pin, value in values.values():
+                self._output_shadow.analog_written(pin, value, rc)
+                self._read_cache.forget(pin)
+            if rc == 0:
+                for index in range(PCA9685_CHANNELS):
+                    self._record_pca9685_output(addr, index, buffer[index])
+                for index in full_on:
+                    pin_rc = self._digital_write_pin(
+                        make_pin_pca9685(addr, index), DigitalLevel.HIGH
+                    )
+                    rc = rc or pin_rc
+            return rc
+
+        rc = 0
+        for pin, value in values.values():
+            pin_rc = self._analog_write_pin(pin, value)
+            rc = rc or pin_rc
+        return rc
 
     def analog_read(self, pin_name: str) -> int:
         """
-        Read an analog value from a specified pin.
+        Read an analog value from a specified pin, filtered if the pin has a filter.
 
         Args:
             pin_name (str): The name of the pin to read from.
@@ -476,7 +1028,287 @@ class RPIPLCClass:
             int: The analog value read from the pin (it's normally a number between 0 and 4095).
 
         """
-        return int(self._dyn_lib.analogRead(self._mapping[pin_name]))
+        pin = self._mapping[pin_name]
+        value = self._read_cache.get_analog(pin)
+        if value is None:
+            with self._locks.device(pin):
+                analog_filter = self._analog_filters.get(pin)
+                if analog_filter is None:
+                    with self._locks.bus_for(pin):
+                        value = int(self._dyn_lib.analogRead(pin))
+                else:
+                    value = filtered_read(
+                        analog_filter, self._dyn_lib.analogRead, pin, self._locks.bus_for(pin)
+                    )
+                self._read_cache.put_analog(pin, value)
+        return value
+
+    def set_analog_filter(self, pin_name: str, *filters: AnalogFilter) -> FilterPipeline | None:
+        """
+        Filter the analog reads of a pin.
+
+        Every analog read of the pin (including the ones of pin handles and process images) reads
+        as many samples as the decimation of the filters, passes them through the filters and
+        returns the new value of the last one. The pin names that share a pin identifier share
+        the filters. The filters are removed on init() and deinit().
+
+        Args:
+            pin_name (str): The name of the pin.
+            *filters (AnalogFilter): The filters, in the order that the samples go through them
+                                     (none to remove the filters of the pin).
+
+        Returns:
+            FilterPipeline | None: The pipeline of the filters, or None if they were removed.
+
+        """
+        pin = self._mapping[pin_name]
+        with self._locks.device(pin):
+            self._read_cache.forget(pin)
+            if not filters:
+                self._analog_filters.pop(pin, None)
+                return None
+            pipeline = FilterPipeline(*filters)
+            self._analog_filters[pin] = pipeline
+            return pipeline
+
+    def analog_filter(self, pin_name: str) -> FilterPipeline | None:
+        """
+        Get the filters of the analog reads of a pin.
+
+        Args:
+            pin_name (str): The name of the pin.
+
+        Returns:
+            FilterPipeline | None: The pipeline of the filters, or None if the pin doesn't have
+                                   any.
+
+        """
+        return self._analog_filters.get(self._mapping[pin_name])
+
+    @property
+    def mapping_index(self) -> PLCMappingIndex:
+        """The reverse index of the mapping of the initialized model (empty if not initialized)."""
+        return self._index
+
+    def pin(self, pin_name: str) -> Pin:
+        """
+        Get a handle to a pin of the initialized model.
+
+        The handle resolves the pin name once, so reading and writing it repeatedly is faster than
+        calling the methods of this class with the pin name.
+
+        Args:
+            pin_name (str): The name of the pin.
+
+        Returns:
+            Pin: The pin handle, see its documentation for more details.
+
+        """
+        pin, peripheral_type, _, _ = self._index.resolve(pin_name)
+        if peripheral_type is PeripheralType.PLC_PCA9685:
+            return Pin(
+                pin_name,
+                pin,
+                peripheral_type,
+                self._dyn_lib,
+                on_digital_write=self._pca9685_digital_written,
+                on_analog_write=self._pca9685_analog_written,
+                shadow=self._output_shadow,
+                read_cache=self._read_cache,
+                device_lock=self._locks.device(pin),
+                bus_lock=self._locks.bus_for(pin),
+                analog_filters=self._analog_filters,
+            )
+        return Pin(
+            pin_name,
+            pin,
+            peripheral_type,
+            self._dyn_lib,
+            shadow=self._output_shadow,
+            read_cache=self._read_cache,
+            device_lock=self._locks.device(pin),
+            bus_lock=self._locks.bus_for(pin),
+            analog_filters=self._analog_filters,
+        )
+
+    @property
+    def output_shadow_enabled(self) -> bool:
+        """Whether the output shadow is enabled or not (see enable_output_shadow())."""
+        return self._output_shadow.enabled
+
+    def enable_output_shadow(self, *, enabled: bool = True) -> None:
+        """
+        Enable or disable the output shadow.
+
+        The output shadow remembers the last value successfully written to each output, so writing
+        the same value again is skipped without calling the C library. The pin names that share a
+        pin identifier (like Q0.5 and A0.5) share the same value. Every write method accepts
+        force=True to write the value anyway.
+
+        The shadow starts empty when enabled, and it's emptied on init() and deinit(). If the
+        outputs can be changed from outside this process, invalidate_output_shadow() must be called
+        to write them again.
+
+        Args:
+            enabled (bool): Whether to enable or disable the output shadow (default is True).
+
+        """
+        self._output_shadow.enabled = enabled
+
+    def invalidate_output_shadow(self, pin_names: Iterable[str] | None = None) -> None:
+        """
+        Forget the values written to some outputs, so the next write to them calls the C library.
+
+        Args:
+            pin_names (Iterable[str] | None): The names of the pins to forget, or None to forget
+                                              all of them (default is None).
+
+        """
+        if pin_names is None:
+            self._output_shadow.invalidate()
+        else:
+            self._output_shadow.invalidate(self._mapping[pin_name] for pin_name in pin_names)
+
+    def set_read_cache_ttl(self, peripheral_type: PeripheralType, ttl: float) -> None:
+        """
+        Set how long the values read from the pins of a peripheral type are reused.
+
+        While a value read from a pin is younger than the time to live (TTL) of its peripheral,
+        reading the pin again returns the same value without calling the C library, so several
+        readers of the same pin share one physical read. Digital and analog reads are cached
+        separately, and writing a pin forgets its cached values. By default no peripheral has a
+        TTL, so nothing is cached.
+
+        The cached values are forgotten when any TTL changes, and on init() and deinit().
+
+        Args:
+            peripheral_type (PeripheralType): The peripheral type, for example
+                                              PeripheralType.PLC_LTC2309.
+            ttl (float): The TTL in seconds (0 to not cache the pins of the peripheral).
+
+        Raises:
+            ValueError: If the TTL is negative.
+            UnknownPLCConfError: If the librpiplc version doesn't support it.
+
+        """
+        if self._is_library_old:
+            msg = "This library version doesn't support the read cache"
+            raise UnknownPLCConfError(msg)
+        self._read_cache.set_ttl(peripheral_type, ttl)
+
+    def read_cache_ttl(self, peripheral_type: PeripheralType) -> float:
+        """
+        Get the time to live of the values read from the pins of a peripheral type.
+
+        Args:
+            peripheral_type (PeripheralType): The peripheral type.
+
+        Returns:
+            float: The TTL in seconds (0 if the pins of the peripheral aren't cached).
+
+        """
+        return self._read_cache.ttl(peripheral_type)
+
+    def invalidate_read_cache(self, pin_names: Iterable[str] | None = None) -> None:
+        """
+        Forget the cached values of some pins, so the next read of them calls the C library.
+
+        Args:
+            pin_names (Iterable[str] | None): The names of the pins to forget, or None to forget
+                                              all of them (default is None).
+
+        """
+        if pin_names is None:
+            self._read_cache.invalidate()
+        else:
+            self._read_cache.invalidate(self._mapping[pin_name] for pin_name in pin_names)
+
+    @property
+    def read_cache_stats(self) -> ReadCacheStats:
+        """The number of reads served from the read cache (hits) and from the C library (misses)."""
+        return self._read_cache.stats
+
+    def reset_read_cache_stats(self) -> None:
+        """Reset the hit and miss counters of the read cache."""
+        self._read_cache.reset_stats()
+
+    def process_image(self) -> ProcessImage:
+        """
+        Create a PLC-style process image of the I/O pins of the initialized model.
+
+        Returns:
+            ProcessImage: The process image, see its documentation for more details.
+
+        Raises:
+            UnknownPLCConfError: If the library isn't initialized, or if the librpiplc version
+                                 doesn't support it.
+
+        """
+        if not self._is_initialized:
+            msg = "The library must be initialized before creating a process image"
+            raise UnknownPLCConfError(msg)
+        if self._is_library_old:
+            msg = "This library version doesn't support process images"
+            raise UnknownPLCConfError(msg)
+        return ProcessImage(self, self._index)
+
+    def stream(
+        self,
+        pin_names: Iterable[str],
+        rate_hz: float,
+        block_size: int,
+        *,
+        max_blocks: int = 16,
+    ) -> SampleStream:
+        """
+        Sample several pins at a fixed rate in a background thread, in blocks of samples.
+
+        Args:
+            pin_names (Iterable[str]): The names of the pins to sample, in column order.
+            rate_hz (float): The number of samples of each pin per second.
+            block_size (int): The number of samples of each pin in every block.
+            max_blocks (int): The number of completed blocks that can wait for the iterator
+                              before the new ones are dropped (default is 16).
+
+        Returns:
+            SampleStream: The iterator of the blocks, which must be closed to stop the sampling
+                          (see its documentation for more details).
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model.
+            ValueError: If the rate isn't positive, or the block size or max_blocks is smaller
+                        than 1.
+
+        """
+        from .streaming import SampleStream  # noqa: PLC0415
+
+        return SampleStream(self, pin_names, rate_hz, block_size, max_blocks=max_blocks)
+
+    def capture(self, pin_name: str, n_samples: int) -> CaptureResult:
+        """
+        Read samples of an analog pin as fast as possible.
+
+        The pin is resolved once and its samples are read back to back with the analogRead
+        function of the C library into preallocated buffers, holding the locks of the pin during
+        the whole capture (so any other access to the same I2C bus waits for it). The samples are
+        raw: the read cache and the filters of the pin are bypassed.
+
+        Args:
+            pin_name (str): The name of the pin, normally an input of an LTC2309 or ADS1015.
+            n_samples (int): The number of samples to read.
+
+        Returns:
+            CaptureResult: The samples, their timestamps, the achieved rate and the jitter.
+
+        Raises:
+            ValueError: If the number of samples is smaller than 1.
+
+        """
+        from .capture import burst_capture  # noqa: PLC0415
+
+        pin = self._mapping[pin_name]
+        with self._locks.device(pin):
+            return burst_capture(self._dyn_lib.analogRead, pin, n_samples, self._locks.bus_for(pin))
 
     def delay(self, value: int) -> None:
         """
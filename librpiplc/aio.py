@@ -0,0 +1,415 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from . import RPIPLCClass
+    from .lib_types import DigitalLevel, PinType
+
+_T = TypeVar("_T")
+
+# Return codes of the digital and analog writes, and values of the digital and analog reads
+_BatchResult = tuple[int, int, dict[str, int], dict[str, int]]
+
+
+class _Write(NamedTuple):
+    pin_name: str
+    value: DigitalLevel | int | bool
+    analog: bool
+    force: bool
+
+
+class _Batch:
+    """Requests received during the same iteration of the event loop, run with one I/O call."""
+
+    def __init__(self) -> None:
+        # Last write to each pin identifier, in the order they were queued
+        self.writes: dict[int, _Write] = {}
+        self.digital_write_futures: list[asyncio.Future[int]] = []
+        self.analog_write_futures: list[asyncio.Future[int]] = []
+        self.digital_reads: dict[str, list[asyncio.Future[int]]] = {}
+        self.analog_reads: dict[str, list[asyncio.Future[int]]] = {}
+
+    def run(self, plc: RPIPLCClass) -> _BatchResult:
+        """
+        Run the requests in the I/O thread: first the writes and then the reads.
+
+        Args:
+            plc (RPIPLCClass): The rpiplc instance.
+
+        Returns:
+            _BatchResult: The return codes of the digital and analog writes, and the values of the
+                          digital and analog reads.
+
+        """
+        # Only the last write to each pin is left, so the writes of different kinds or force can
+        # be grouped without changing the result
+        groups: dict[tuple[bool, bool], dict[str, Any]] = {}
+        for write in self.writes.values():
+            groups.setdefault((write.analog, write.force), {})[write.pin_name] = write.value
+        digital_rc = 0
+        analog_rc = 0
+        for (analog, force), values in groups.items():
+            if analog:
+                rc = plc.analog_write_many(values, force=force)
+                analog_rc = analog_rc or rc
+            else:
+                rc = plc.digital_write_many(values, force=force)
+                digital_rc = digital_rc or rc
+        digital_values = plc.digital_read_many(self.digital_reads) if self.digital_reads else {}
+        analog_values = {pin_name: plc.analog_read(pin_name) for pin_name in self.analog_reads}
+        return digital_rc, analog_rc, digital_values, analog_values
+
+    def waiters(self) -> list[asyncio.Future[int]]:
+        """Get the futures of all the requests of the batch."""
+        return [
+            *self.digital_write_futures,
+            *self.analog_write_futures,
+            *(waiter for waiters in self.digital_reads.values() for waiter in waiters),
+            *(waiter for waiters in self.analog_reads.values() for waiter in waiters),
+        ]
+
+    def resolve(self, future: asyncio.Future[_BatchResult]) -> None:
+        """Fan out the results of the I/O call to the futures of the requests."""
+        exc = asyncio.CancelledError() if future.cancelled() else future.exception()
+        if exc is not None:
+            for waiter in self.waiters():
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            return
+
+        digital_rc, analog_rc, digital_values, analog_values = future.result()
+        results = [
+            *((waiter, digital_rc) for waiter in self.digital_write_futures),
+            *((waiter, analog_rc) for waiter in self.analog_write_futures),
+            *(
+                (waiter, digital_values[pin_name])
+                for pin_name, waiters in self.digital_reads.items()
+                for waiter in waiters
+            ),
+            *(
+                (waiter, analog_values[pin_name])
+                for pin_name, waiters in self.analog_reads.items()
+                for waiter in waiters
+            ),
+        ]
+        for waiter, result in results:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    def write(self, pin: int, write: _Write) -> None:
+        """Queue a write to a pin identifier, replacing the previous write to it by any name."""
+        self.writes.pop(pin, None)
+        self.writes[pin] = write
+
+
+class AsyncRPIPLC:
+    """
+    asyncio facade of the rpiplc instance.
+
+    All the calls into the C library are run in a dedicated I/O thread, so the event loop is never
+    blocked by them. The reads and writes requested during the same iteration of the event loop
+    (for example, by several tasks or by asyncio.gather) are coalesced into a single trip to the
+    I/O thread: the digital reads are done with digital_read_many and the writes with
+    digital_write_many/analog_write_many, so the pins of the same expander share one I2C
+    transaction. The writes of a batch are done before its reads, and the last write to a pin wins
+    (even if it's written with different names, like Q0.5 and A0.5), with its own force. The
+    coalesced writes return the return code of all the writes of their kind in the batch.
+
+    The pin names are checked when requesting the operation, so an unknown pin raises
+    UnknownPinError right away.
+
+    """
+
+    def __init__(self, plc: RPIPLCClass | None = None) -> None:
+        """
+        Initialize the facade and its I/O thread.
+
+        Args:
+            plc (RPIPLCClass | None): The rpiplc instance to use, or None to use the rpiplc
+                                      singleton (default is None).
+
+        """
+        if plc is None:
+            from . import rpiplc  # noqa: PLC0415
+
+            plc = rpiplc
+        self._plc = plc
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rpiplc-io")
+        self._batch: _Batch | None = None
+        self._batch_handle: asyncio.Handle | None = None
+
+    @property
+    def plc(self) -> RPIPLCClass:
+        """The rpiplc instance used by the facade."""
+        return self._plc
+
+    def close(self) -> None:
+        """Wait for the pending I/O calls and stop the I/O thread."""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> AsyncRPIPLC:  # noqa: PYI034
+        """Enter an "async with" block, closing the facade when exiting it."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the facade, see close()."""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def _run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:  # noqa: ANN401
+        """Run a function in the I/O thread, after the batch that is being collected."""
+        self._dispatch()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    def _current_batch(self) -> _Batch:
+        """Get the batch that is being collected, scheduling its dispatch if it's a new one."""
+        if self._batch is None:
+            self._batch = _Batch()
+            self._batch_handle = asyncio.get_running_loop().call_soon(self._dispatch)
+        return self._batch
+
+    def _dispatch(self) -> None:
+        """Send the batch that is being collected to the I/O thread."""
+        batch = self._batch
+        if batch is None:
+            return
+        if self._batch_handle is not None:
+            self._batch_handle.cancel()
+        self._batch = None
+        self._batch_handle = None
+
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(self._executor, batch.run, self._plc).add_done_callback(batch.resolve)
+
+    async def init(self, version_name: str, model_name: str, *, restart: bool = False) -> int:
+        """Initialize the library, see RPIPLCClass.init()."""
+        return await self._run(self._plc.init, version_name, model_name, restart=restart)
+
+    async def deinit(self, *, restart: bool = True) -> int:
+        """Deinitialize the library, see RPIPLCClass.deinit()."""
+        return await self._run(self._plc.deinit, restart=restart)
+
+    async def pin_mode(self, pin_name: str, mode: PinType) -> int:
+        """Set the mode of a pin, see RPIPLCClass.pin_mode()."""
+        return await self._run(self._plc.pin_mode, pin_name, mode)
+
+    async def analog_write_set_frequency(self, pin_name: str, freq: int) -> int:
+        """Set the PWM frequency of a pin, see RPIPLCClass.analog_write_set_frequency()."""
+        return await self._run(self._plc.analog_write_set_frequency, pin_name, freq)
+
+    async def digital_read(self, pin_name: str) -> int:
+        """
+        Read a digital value from a pin, coalesced with the other reads of the same batch.
+
+        Args:
+            pin_name (str): The name of the pin to read from.
+
+        Returns:
+            int: The digital value read from the pin (0 or 1).
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+
+        """
+        self._plc.mapping_index.resolve(pin_name)
+        waiter: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self._current_batch().digital_reads.setdefault(pin_name, []).append(waiter)
+        return await waiter
+
+    async def read_many(self, pin_names: Iterable[str]) -> dict[str, int]:
+        """
+        Read the digital values of several pins, coalesced with the other reads of the same batch.
+
+        Args:
+            pin_names (Iterable[str]): The names of the pins to read from.
+
+        Returns:
+            dict[str, int]: The digital value read from each pin (0 or 1), in the same order as
+                            the given pin names.
+
+        Raises:
+            UnknownPinError: If some pin doesn't exist in the initialized model.
+
+        """
+        pin_names = list(pin_names)
+        for pin_name in pin_names:
+            self._plc.mapping_index.resolve(pin_name)
+        loop = asyncio.get_running_loop()
+        batch = self._current_batch()
+        waiters: dict[str, asyncio.Future[int]] = {}
+        for pin_name in pin_names:
+            if pin_name not in waiters:
+                waiters[pin_name] = loop.create_future()
+                batch.digital_reads.setdefault(pin_name, []).append(waiters[pin_name])
+        await asyncio.gather(*waiters.values())
+        return {pin_name: waiter.result() for pin_name, waiter in waiters.items()}
+
+    async def analog_read(self, pin_name: str) -> int:
+        """
+        Read an analog value from a pin, coalesced with the other reads of the same batch.
+
+        Several reads of the same pin in the same batch share one analogRead call.
+
+        Args:
+            pin_name (str): The name of the pin to read from.
+
+        Returns:
+            int: The analog value read from the pin (it's normally a number between 0 and 4095).
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+
+        """
+        self._plc.mapping_index.resolve(pin_name)
+        waiter: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self._current_batch().analog_reads.setdefault(pin_name, []).append(waiter)
+        return await waiter
+
+    async def digital_write(
+        self,
+        pin_name: str,
+        level: DigitalLevel | int | bool,  # noqa: FBT001
+        *,
+        force: bool = False,
+    ) -> int:
+        """
+        Write a digital value to a pin, coalesced with the other writes of the same batch.
+
+        Args:
+            pin_name (str): The name of the pin to write to.
+            level (DigitalLevel | int | bool): The digital level to write (LOW or HIGH).
+            force (bool): Whether to write the value even if the output shadow says that the pin
+                          already has it (default is False).
+
+        Returns:
+            int: 0 for success, or the first non-zero return code of the digital writes of the
+                 batch.
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+
+        """
+        return await self.digital_write_many({pin_name: level}, force=force)
+
+    async def digital_write_many(
+        self,
+        levels: Mapping[str, DigitalLevel | int | bool],
+        *,
+        force: bool = False,
+    ) -> int:
+        """
+        Write the digital values of several pins, coalesced with the other writes of the batch.
+
+        Args:
+            levels (Mapping[str, DigitalLevel | int | bool]): The digital level to write to each
+                                                              pin name (LOW or HIGH).
+            force (bool): Whether to write all the pins, even the ones that the output shadow says
+                          that already have the given level (default is False).
+
+        Returns:
+            int: 0 for success, or the first non-zero return code of the digital writes of the
+                 batch.
+
+        Raises:
+            UnknownPinError: If some pin doesn't exist in the initialized model.
+
+        """
+        pins = [self._plc.mapping_index.resolve(pin_name)[0] for pin_name in levels]
+        waiter: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        batch = self._current_batch()
+        for pin, (pin_name, level) in zip(pins, levels.items()):
+            batch.write(pin, _Write(pin_name, level, analog=False, force=force))
+        batch.digital_write_futures.append(waiter)
+        return await waiter
+
+    async def analog_write(self, pin_name: str, value: int, *, force: bool = False) -> int:
+        """
+        Write an analog value to a pin, coalesced with the other writes of the same batch.
+
+        Args:
+            pin_name (str): The name of the pin to write to.
+            value (int): The analog value to write (it's normally a number between 0 and 4095).
+            force (bool): Whether to write the value even if the output shadow says that the pin
+                          already has it (default is False).
+
+        Returns:
+            int: 0 for success, or the first non-zero return code of the analog writes of the
+                 batch.
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+
+        """
+        return await self.analog_write_many({pin_name: value}, force=force)
+
+    async def analog_write_many(self, values: Mapping[str, int], *, force: bool = False) -> int:
+        """
+        Write the analog values of several pins, coalesced with the other writes of the batch.
+
+        Args:
+            values (Mapping[str, int]): The analog value to write to each pin name (it's normally
+                                        a number between 0 and 4095).
+            force (bool): Whether to write all the pins, even the ones that the output shadow says
+                          that already have the given value (default is False).
+
+        Returns:
+            int: 0 for success, or the first non-zero return code of the analog writes of the
+                 batch.
+
+        Raises:
+            UnknownPinError: If some pin doesn't exist in the initialized model.
+
+        """
+        pins = [self._plc.mapping_index.resolve(pin_name)[0] for pin_name in values]
+        waiter: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        batch = self._current_batch()
+        for pin, (pin_name, value) in zip(pins, values.items()):
+            batch.write(pin, _Write(pin_name, value, analog=True, force=force))
+        batch.analog_write_futures.append(waiter)
+        return await waiter
+
+    async def delay(self, value: int) -> None:
+        """
+        Pause the calling task for a number of milliseconds, without blocking the event loop.
+
+        Args:
+            value (int): The number of milliseconds to wait.
+
+        """
+        await asyncio.sleep(value / 1000)
+
+    async def delay_microseconds(self, value: int) -> None:
+        """
+        Pause the calling task for a number of microseconds, without blocking the event loop.
+
+        The actual resolution depends on the event loop, which is usually around 1 millisecond.
+
+        Args:
+            value (int): The number of microseconds to wait.
+
+        """
+        await asyncio.sleep(value / 1_000_000)
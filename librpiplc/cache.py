@@ -0,0 +1,308 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .lib_types import PeripheralType
+
+
+class OutputShadow:
+    """
+    Write-through shadow of the values written to the outputs, keyed by pin identifier.
+
+    It remembers the last value successfully written to each pin identifier, so a write of the
+    same value can be skipped. As the pin names that share a pin identifier (like Q0.5 and A0.5)
+    share the same entry, a digital write and an analog write are told apart: digital levels are
+    stored as negative numbers (~level), and analog values as they are.
+
+    While disabled, it doesn't remember anything and every write goes to the C library.
+
+    """
+
+    __slots__ = ("_enabled", "_values")
+
+    def __init__(self) -> None:
+        """Initialize the shadow, disabled and empty."""
+        self._enabled = False
+        self._values: dict[int, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the shadow is enabled or not."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        # The writes done while disabled weren't remembered, so the shadow starts empty
+        self._values.clear()
+        self._enabled = enabled
+
+    def digital_unchanged(self, pin: int, level: int) -> bool:
+        """
+        Check if a digital level is the last value written to a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+            level (int): The digital level (0 or 1).
+
+        Returns:
+            bool: True if the shadow is enabled and the write can be skipped, False otherwise.
+
+        """
+        return self._enabled and self._values.get(pin) == ~level
+
+    def analog_unchanged(self, pin: int, value: int) -> bool:
+        """
+        Check if an analog value is the last value written to a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+            value (int): The analog value.
+
+        Returns:
+            bool: True if the shadow is enabled and the write can be skipped, False otherwise.
+
+        """
+        return self._enabled and self._values.get(pin) == value
+
+    def digital_written(self, pin: int, level: int, rc: int) -> None:
+        """
+        Remember the result of a digital write to a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+            level (int): The digital level written (0 or 1).
+            rc (int): The return code of the write, the value of the pin is forgotten if it's
+                      non-zero, as it can't be known.
+
+        """
+        if self._enabled:
+            if rc == 0:
+                self._values[pin] = ~level
+            else:
+                self._values.pop(pin, None)
+
+    def analog_written(self, pin: int, value: int, rc: int) -> None:
+        """
+        Remember the result of an analog write to a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+            value (int): The analog value written.
+            rc (int): The return code of the write, the value of the pin is forgotten if it's
+                      non-zero, as it can't be known.
+
+        """
+        if self._enabled:
+            if rc == 0:
+                self._values[pin] = value
+            else:
+                self._values.pop(pin, None)
+
+    def invalidate(self, pins: Iterable[int] | None = None) -> None:
+        """
+        Forget the values written to some pin identifiers, so they are written again.
+
+        Args:
+            pins (Iterable[int] | None): The pin identifiers to forget, or None to forget all of
+                                         them (default is None).
+
+        """
+        if pins is None:
+            self._values.clear()
+            return
+        for pin in pins:
+            self._values.pop(pin, None)
+
+
+class ReadCacheStats(NamedTuple):
+    """Number of reads served from the read cache (hits) and from the C library (misses)."""
+
+    hits: int
+    misses: int
+
+
+class ReadCache:
+    """
+    Cache of the values read from the pins, keyed by pin identifier.
+
+    Each peripheral type has its own time to live (TTL): a value read from a pin is reused while it
+    is younger than the TTL of its peripheral, and the pins of the peripherals without a TTL are
+    never cached. Digital and analog reads are cached separately, as reading the same pin both ways
+    gives different values.
+
+    Only the reads of pins that can be cached are counted in the statistics.
+
+    """
+
+    __slots__ = ("_analog", "_digital", "_enabled", "_ttls", "hits", "misses")
+
+    def __init__(self) -> None:
+        """Initialize the cache without any TTL, so nothing is cached."""
+        # TTL in nanoseconds of each peripheral type, indexed by the type byte of the pin identifier
+        self._ttls = [0] * 256
+        self._enabled = False
+        self._digital: dict[int, tuple[int, int]] = {}
+        self._analog: dict[int, tuple[int, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def ttl(self, peripheral_type: PeripheralType) -> float:
+        """
+        Get the TTL of a peripheral type.
+
+        Args:
+            peripheral_type (PeripheralType): The peripheral type.
+
+        Returns:
+            float: The TTL in seconds (0 if its pins aren't cached).
+
+        """
+        return self._ttls[peripheral_type.value] / 1e9
+
+    def set_ttl(self, peripheral_type: PeripheralType, ttl: float) -> None:
+        """
+        Set the TTL of a peripheral type, forgetting the values already cached.
+
+        Args:
+            peripheral_type (PeripheralType): The peripheral type.
+            ttl (float): The TTL in seconds (0 to not cache its pins).
+
+        Raises:
+            ValueError: If the TTL is negative.
+
+        """
+        if ttl < 0:
+            msg = f"The TTL can't be negative, got {ttl}"
+            raise ValueError(msg)
+        self._ttls[peripheral_type.value] = round(ttl * 1e9)
+        self._enabled = any(self._ttls)
+        self.invalidate()
+
+    def _get(self, values: dict[int, tuple[int, int]], pin: int) -> int | None:
+        """Get a cached value of a pin identifier, counting the hits and misses."""
+        ttl = self._ttls[(pin >> 24) & 0xFF]
+        if not ttl:
+            return None
+        entry = values.get(pin)
+        if entry is not None and time.monotonic_ns() - entry[1] < ttl:
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def _put(self, values: dict[int, tuple[int, int]], pin: int, value: int) -> None:
+        """Cache the value read from a pin identifier, if its peripheral type has a TTL."""
+        if self._ttls[(pin >> 24) & 0xFF]:
+            values[pin] = (value, time.monotonic_ns())
+
+    def get_digital(self, pin: int) -> int | None:
+        """
+        Get the cached digital value of a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+
+        Returns:
+            int | None: The cached value, or None if it must be read from the C library.
+
+        """
+        return self._get(self._digital, pin) if self._enabled else None
+
+    def put_digital(self, pin: int, value: int) -> None:
+        """
+        Cache the digital value read from a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+            value (int): The digital value read.
+
+        """
+        if self._enabled:
+            self._put(self._digital, pin, value)
+
+    def get_analog(self, pin: int) -> int | None:
+        """
+        Get the cached analog value of a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+
+        Returns:
+            int | None: The cached value, or None if it must be read from the C library.
+
+        """
+        return self._get(self._analog, pin) if self._enabled else None
+
+    def put_analog(self, pin: int, value: int) -> None:
+        """
+        Cache the analog value read from a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+            value (int): The analog value read.
+
+        """
+        if self._enabled:
+            self._put(self._analog, pin, value)
+
+    def forget(self, pin: int) -> None:
+        """
+        Forget the cached values of a pin identifier, because it was written.
+
+        Args:
+            pin (int): The pin identifier.
+
+        """
+        if self._enabled:
+            self._digital.pop(pin, None)
+            self._analog.pop(pin, None)
+
+    def invalidate(self, pins: Iterable[int] | None = None) -> None:
+        """
+        Forget the cached values of some pin identifiers, so they are read again.
+
+        Args:
+            pins (Iterable[int] | None): The pin identifiers to forget, or None to forget all of
+                                         them (default is None).
+
+        """
+        if pins is None:
+            self._digital.clear()
+            self._analog.clear()
+            return
+        for pin in pins:
+            self._digital.pop(pin, None)
+            self._analog.pop(pin, None)
+
+    @property
+    def stats(self) -> ReadCacheStats:
+        """The number of hits and misses since the statistics were last reset."""
+        return ReadCacheStats(self.hits, self.misses)
+
+    def reset_stats(self) -> None:
+        """Reset the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
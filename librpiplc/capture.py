@@ -0,0 +1,387 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, NamedTuple
+
+from .polling import Edge
+from .scheduler import ScanScheduler
+from .streaming import PinSampler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from contextlib import AbstractContextManager
+
+    from . import RPIPLCClass
+
+
+class CaptureResult(NamedTuple):
+    """
+    Samples of a burst capture of an analog pin.
+
+    Attributes:
+        samples (array[int]): The raw samples, in an array("H").
+        timestamps (array[int]): The time.monotonic_ns() before each conversion, in an
+                                 array("q").
+        rate_hz (float): The achieved number of samples per second.
+        jitter_ns (float): The standard deviation of the time between samples, in ns.
+
+    """
+
+    samples: array[int]
+    timestamps: array[int]
+    rate_hz: float
+    jitter_ns: float
+
+
+def _timing(timestamps: array[int]) -> tuple[float, float]:
+    """Get the rate and the standard deviation of the intervals of some timestamps."""
+    intervals = len(timestamps) - 1
+    if intervals < 1 or timestamps[-1] == timestamps[0]:
+        return 0.0, 0.0
+    mean = (timestamps[-1] - timestamps[0]) / intervals
+    variance = (
+        sum(
+            (timestamps[sample + 1] - timestamps[sample] - mean) ** 2 for sample in range(intervals)
+        )
+        / intervals
+    )
+    return 1e9 / mean, variance**0.5
+
+
+def burst_capture(
+    read: Callable[[int], int],
+    pin: int,
+    n_samples: int,
+    lock: AbstractContextManager[None] | threading.Lock,
+) -> CaptureResult:
+    """
+    Read samples of a pin back to back into preallocated buffers.
+
+    The lock is held during the whole capture, and the loop only calls the C function and the
+    clock, so it doesn't create any Python object per sample besides the integers they return.
+
+    Args:
+        read (Callable[[int], int]): The analogRead function of the C library.
+        pin (int): The pin identifier.
+        n_samples (int): The number of samples to read.
+        lock (AbstractContextManager[None] | threading.Lock): The lock held during the capture.
+
+    Returns:
+        CaptureResult: The samples, their timestamps, the achieved rate and the jitter.
+
+    Raises:
+        ValueError: If the number of samples is smaller than 1.
+
+    """
+    if n_samples < 1:
+        msg = "The number of samples must be at least 1"
+        raise ValueError(msg)
+    samples = array("H", bytes(2 * n_samples))
+    timestamps = array("q", bytes(8 * n_samples))
+    clock = time.monotonic_ns
+    with lock:
+        for sample in range(n_samples):
+            timestamps[sample] = clock()
+            samples[sample] = read(pin)
+    return CaptureResult(samples, timestamps, *_timing(timestamps))
+
+
+class Trigger(NamedTuple):
+    """
+    Trigger condition of a scope capture: a pin crossing a threshold.
+
+    A rising crossing is a sample at or above the threshold after one below it, and a falling
+    crossing the opposite. Digital pins are sampled as 0 or 1, so with the default threshold of 1
+    the crossings are their edges.
+
+    """
+
+    pin_name: str
+    threshold: int = 1
+    edge: Edge = Edge.RISING
+
+
+class ScopeTrace(NamedTuple):
+    """
+    Samples of several pins around a trigger.
+
+    Attributes:
+        pin_names (tuple[str, ...]): The names of the pins, in column order.
+        timestamps (array[int]): The time.monotonic_ns() of each row, in an array("q").
+        samples (array[int]): The samples in an array("H"), a row after the other with a column
+                              per pin.
+        trigger_index (int): The index of the row that fired the trigger, which is also the
+                             number of pre-trigger rows.
+
+    """
+
+    pin_names: tuple[str, ...]
+    timestamps: array[int]
+    samples: array[int]
+    trigger_index: int
+
+
+class _ArmedTrigger:
+    """Trigger waiting to fire, or capturing the post-trigger rows once it fired."""
+
+    def __init__(self, column: int, trigger: Trigger, post_samples: int) -> None:
+        self.column = column
+        self.threshold = trigger.threshold
+        self.edge = trigger.edge
+        self.post_samples = post_samples
+        self.previous: int | None = None
+        self.trace: ScopeTrace | None = None
+        self.rows = 0
+        self.future: Future[ScopeTrace] = Future()
+
+    def fired(self, value: int) -> bool:
+        """Check if a sample of the trigger pin crosses the threshold."""
+        previous = self.previous
+        self.previous = value
+        if previous is None:
+            return False
+        threshold = self.threshold
+        return bool(
+            (self.edge & Edge.RISING and previous < threshold <= value)
+            or (self.edge & Edge.FALLING and previous >= threshold > value)
+        )
+
+
+class ScopeCapture:
+    """
+    Oscilloscope-like capture of several pins, with pre-trigger and post-trigger samples.
+
+    A sampler thread reads the pins at a fixed rate with a PinSampler, driven by a scan
+    scheduler, and keeps the last pre_samples rows in a circular buffer. Arming a trigger only
+    makes the sampler compare each new sample of the trigger pin with the threshold. When it
+    fires, the pre-trigger rows are copied out of the circular buffer, followed by the trigger row
+    and the next rows up to post_samples, and the future returned by arm() gets the trace.
+
+    """
+
+    def __init__(
+        self,
+        pin_names: Iterable[str],
+        rate_hz: float,
+        pre_samples: int,
+        *,
+        plc: RPIPLCClass | None = None,
+    ) -> None:
+        """
+        Initialize the capture, without starting its sampler thread.
+
+        Args:
+            pin_names (Iterable[str]): The names of the pins to sample, in column order.
+            rate_hz (float): The number of samples of each pin per second.
+            pre_samples (int): The number of rows before the trigger kept in the traces.
+            plc (RPIPLCClass | None): The rpiplc instance to use, or None to use the rpiplc
+                                      singleton (default is None).
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model.
+            ValueError: If the rate isn't positive or pre_samples is negative.
+
+        """
+        if plc is None:
+            from . import rpiplc  # noqa: PLC0415
+
+            plc = rpiplc
+        if rate_hz <= 0:
+            msg = "The rate must be positive"
+            raise ValueError(msg)
+        if pre_samples < 0:
+            msg = "pre_samples can't be negative"
+            raise ValueError(msg)
+        self._sampler = PinSampler(plc, pin_names)
+        self._columns = len(self._sampler.pin_names)
+        self._row = array("H", bytes(2 * self._columns))
+        self._ring_samples = array("H", bytes(2 * pre_samples * self._columns))
+        self._ring_timestamps = array("q", bytes(8 * pre_samples))
+        self._ring_next = 0
+        self._ring_rows = 0
+        self._sampled = False
+        self._armed: _ArmedTrigger | None = None
+        self._lock = threading.Lock()
+        self._scheduler = ScanScheduler(1 / rate_hz)
+        self._scheduler.add_cycle(self._sample)
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> ScopeCapture:  # noqa: PYI034
+        """Start the sampling when entering a "with" block, and stop it when exiting it."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the sampling, see stop()."""
+        self.stop()
+
+    @property
+    def pin_names(self) -> tuple[str, ...]:
+        """The names of the sampled pins, in column order."""
+        return self._sampler.pin_names
+
+    @property
+    def armed(self) -> bool:
+        """Whether a trigger is armed (or capturing its post-trigger rows) or not."""
+        return self._armed is not None
+
+    @property
+    def scheduler(self) -> ScanScheduler:
+        """The scan scheduler of the sampling, with its statistics."""
+        return self._scheduler
+
+    def start(self) -> None:
+        """Start the sampler thread, if it isn't already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="rpiplc-scope", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampler thread, cancelling the armed trigger."""
+        if self._thread is None:
+            return
+        self._scheduler.stop()
+        self._thread.join()
+        self._thread = None
+        self.disarm()
+
+    def arm(self, trigger: Trigger, post_samples: int) -> Future[ScopeTrace]:
+        """
+        Arm a trigger.
+
+        Args:
+            trigger (Trigger): The trigger condition, on one of the sampled pins.
+            post_samples (int): The number of rows of the trace from the trigger row on.
+
+        Returns:
+            Future[ScopeTrace]: The future of the trace, which can be cancelled to disarm the
+                                trigger.
+
+        Raises:
+            ValueError: If the trigger pin isn't sampled or post_samples is smaller than 1.
+            RuntimeError: If a trigger is already armed.
+
+        """
+        if trigger.pin_name not in self.pin_names:
+            msg = f"The trigger pin {trigger.pin_name} isn't sampled"
+            raise ValueError(msg)
+        if post_samples < 1:
+            msg = "post_samples must be at least 1"
+            raise ValueError(msg)
+        with self._lock:
+            if self._armed is not None and not self._armed.future.cancelled():
+                msg = "A trigger is already armed"
+                raise RuntimeError(msg)
+            column = self.pin_names.index(trigger.pin_name)
+            self._armed = _ArmedTrigger(column, trigger, post_samples)
+            if self._sampled:
+                self._armed.previous = self._row[column]
+            return self._armed.future
+
+    def disarm(self) -> None:
+        """Cancel the armed trigger, if any."""
+        with self._lock:
+            armed = self._armed
+            self._armed = None
+        # The future is completed without the lock, since its callbacks may arm a trigger again
+        if armed is not None:
+            armed.future.cancel()
+
+    def _run(self) -> None:
+        """Sample the pins until stop() is called."""
+        try:
+            self._scheduler.run()
+        except BaseException as exc:
+            with self._lock:
+                armed = self._armed
+                self._armed = None
+            if armed is not None and armed.future.set_running_or_notify_cancel():
+                armed.future.set_exception(exc)
+            raise
+
+    def _sample(self) -> None:
+        """Read a row, pass it to the armed trigger and keep it in the circular buffer."""
+        now = time.monotonic_ns()
+        row = self._row
+        trace = None
+        with self._lock:
+            self._sampler.read_row(row, 0)
+            self._sampled = True
+            armed = self._armed
+            if armed is not None:
+                if armed.future.cancelled():
+                    self._armed = None
+                elif armed.trace is not None or armed.fired(row[armed.column]):
+                    trace = self._capture(armed, now)
+                    if trace is not None:
+                        self._armed = None
+        # The future is completed without the lock, since its callbacks may arm a trigger again
+        if armed is not None and trace is not None and armed.future.set_running_or_notify_cancel():
+            armed.future.set_result(trace)
+
+        ring_size = len(self._ring_timestamps)
+        if ring_size:
+            slot = self._ring_next
+            self._ring_timestamps[slot] = now
+            self._ring_samples[slot * self._columns : (slot + 1) * self._columns] = row
+            self._ring_next = (slot + 1) % ring_size
+            self._ring_rows = min(self._ring_rows + 1, ring_size)
+
+    def _capture(self, armed: _ArmedTrigger, now: int) -> ScopeTrace | None:
+        """
+        Add the current row to the trace, starting it with the pre-trigger rows if needed.
+
+        Returns:
+            ScopeTrace | None: The trace if it's complete, or None otherwise.
+
+        """
+        columns = self._columns
+        trace = armed.trace
+        if trace is None:
+            pre_rows = self._ring_rows
+            rows = pre_rows + armed.post_samples
+            trace = ScopeTrace(
+                self.pin_names,
+                array("q", bytes(8 * rows)),
+                array("H", bytes(2 * rows * columns)),
+                pre_rows,
+            )
+            ring_size = len(self._ring_timestamps)
+            first = self._ring_next - pre_rows
+            for index in range(pre_rows):
+                slot = (first + index) % ring_size
+                trace.timestamps[index] = self._ring_timestamps[slot]
+                trace.samples[index * columns : (index + 1) * columns] = self._ring_samples[
+                    slot * columns : (slot + 1) * columns
+                ]
+            armed.trace = trace
+            armed.rows = pre_rows
+
+        index = armed.rows
+        trace.timestamps[index] = now
+        trace.samples[index * columns : (index + 1) * columns] = self._row
+        armed.rows += 1
+        return trace if armed.rows == len(trace.timestamps) else None
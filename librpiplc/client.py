@@ -0,0 +1,470 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import operator
+import selectors
+import socket
+import struct
+import threading
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from .daemon import (
+    DEFAULT_SOCKET_PATH,
+    HEADER,
+    Opcode,
+    PayloadReader,
+    Status,
+    pack_frame,
+    pack_str,
+)
+from .exceptions import PLCDaemonError, UnknownPinError, UnknownPLCConfError
+from .lib_types import DigitalLevel, PinType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_MAX_COUNT = 0xFFFF
+
+_R = TypeVar("_R")
+
+
+class _Request(Generic[_R]):
+    """Encoded request, with the function that decodes the payload of its response."""
+
+    __slots__ = ("decode", "opcode", "payload")
+
+    def __init__(
+        self, opcode: Opcode, payload: bytes, decode: Callable[[PayloadReader], _R]
+    ) -> None:
+        self.opcode = opcode
+        self.payload = payload
+        self.decode = decode
+
+
+def _decode_i32(reader: PayloadReader) -> int:
+    return reader.i32()
+
+
+def _level(level: DigitalLevel | int | bool) -> int:  # noqa: FBT001
+    return 1 if level else 0
+
+
+def _pack_unsigned(packer: struct.Struct, value: int, what: str) -> bytes:
+    """Encode an unsigned value, raising ValueError if the protocol can't carry it."""
+    value = operator.index(value)
+    if not 0 <= value < 1 << (8 * packer.size):
+        msg = f"The {what} {value} is out of range for the protocol"
+        raise ValueError(msg)
+    return packer.pack(value)
+
+
+def _pack_count(count: int) -> bytes:
+    """Encode the number of pins of a request, raising PLCDaemonError if there are too many."""
+    if count > _MAX_COUNT:
+        msg = f"Too many pins for the protocol: {count}"
+        raise PLCDaemonError(msg)
+    return _U16.pack(count)
+
+
+def _pin_mode(pin_name: str, mode: PinType) -> _Request[int]:
+    payload = pack_str(pin_name) + _U8.pack(mode.value)
+    return _Request(Opcode.PIN_MODE, payload, _decode_i32)
+
+
+def _digital_write(pin_name: str, level: DigitalLevel | int | bool, force: bool) -> _Request[int]:  # noqa: FBT001
+    payload = pack_str(pin_name) + _U8.pack(_level(level)) + _U8.pack(force)
+    return _Request(Opcode.DIGITAL_WRITE, payload, _decode_i32)
+
+
+def _digital_write_many(
+    levels: Mapping[str, DigitalLevel | int | bool],
+    force: bool,  # noqa: FBT001
+) -> _Request[int]:
+    payload = _U8.pack(force) + _pack_count(len(levels))
+    payload += b"".join(
+        pack_str(pin_name) + _U8.pack(_level(level)) for pin_name, level in levels.items()
+    )
+    return _Request(Opcode.DIGITAL_WRITE_MANY, payload, _decode_i32)
+
+
+def _digital_read(pin_name: str) -> _Request[int]:
+    return _Request(Opcode.DIGITAL_READ, pack_str(pin_name), _decode_i32)
+
+
+def _digital_read_many(pin_names: Iterable[str]) -> _Request[dict[str, int]]:
+    unique_names = list(dict.fromkeys(pin_names))
+    payload = _pack_count(len(unique_names)) + b"".join(map(pack_str, unique_names))
+
+    def decode(reader: PayloadReader) -> dict[str, int]:
+        return {pin_name: reader.i32() for pin_name in unique_names}
+
+    return _Request(Opcode.DIGITAL_READ_MANY, payload, decode)
+
+
+def _analog_write_set_frequency(pin_name: str, freq: int) -> _Request[int]:
+    payload = pack_str(pin_name) + _pack_unsigned(_U32, freq, "frequency")
+    return _Request(Opcode.ANALOG_WRITE_SET_FREQUENCY, payload, _decode_i32)
+
+
+def _analog_write(pin_name: str, value: int, force: bool) -> _Request[int]:  # noqa: FBT001
+    payload = pack_str(pin_name) + _pack_unsigned(_U16, value, "analog value") + _U8.pack(force)
+    return _Request(Opcode.ANALOG_WRITE, payload, _decode_i32)
+
+
+def _analog_write_many(values: Mapping[str, int], force: bool) -> _Request[int]:  # noqa: FBT001
+    payload = _U8.pack(force) + _pack_count(len(values))
+    payload += b"".join(
+        pack_str(pin_name) + _pack_unsigned(_U16, value, "analog value")
+        for pin_name, value in values.items()
+    )
+    return _Request(Opcode.ANALOG_WRITE_MANY, payload, _decode_i32)
+
+
+def _analog_read(pin_name: str) -> _Request[int]:
+    return _Request(Opcode.ANALOG_READ, pack_str(pin_name), _decode_i32)
+
+
+def _info() -> _Request[tuple[str, str]]:
+    def decode(reader: PayloadReader) -> tuple[str, str]:
+        return reader.string(), reader.string()
+
+    return _Request(Opcode.INFO, b"", decode)
+
+
+class RPIPLCClient:
+    """
+    Client of the librpiplc daemon, with the same read and write methods as the rpiplc instance.
+
+    The daemon (python -m librpiplc.daemon) owns the PLC, so several processes can use it at the
+    same time without initializing and deinitializing the peripherals. The client doesn't have
+    init() nor deinit(), the PLC version and model are the ones of the daemon.
+
+    The methods of the client wait for the response of each request. To send many requests at
+    once and wait for all of them, use pipeline(). The errors reported by the daemon are raised as
+    UnknownPinError, UnknownPLCConfError or PLCDaemonError. Any other error, like a timeout,
+    closes the connection, since the responses of the requests that were sent can't be matched
+    anymore. The values that the protocol can't carry (like a negative analog value) raise
+    ValueError before sending anything.
+
+    The client can be used from several threads, the requests are serialized.
+
+    """
+
+    INPUT = PinType.INPUT
+    OUTPUT = PinType.OUTPUT
+    LOW = DigitalLevel.LOW
+    HIGH = DigitalLevel.HIGH
+
+    def __init__(
+        self, socket_path: str = DEFAULT_SOCKET_PATH, *, timeout: float | None = None
+    ) -> None:
+        """
+        Connect to the daemon.
+
+        Args:
+            socket_path (str): The path of the Unix socket of the daemon.
+            timeout (float | None): The timeout in seconds of the socket operations, or None to
+                                    wait forever (default is None).
+
+        Raises:
+            OSError: If the daemon can't be reached.
+
+        """
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(socket_path)
+        self._timeout = timeout
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.version_name, self.model_name = self._request(_info())
+
+    def __enter__(self) -> RPIPLCClient:  # noqa: PYI034
+        """Use the client in a "with" block, closing it when exiting the block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the client, see close()."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection with the daemon."""
+        self._socket.close()
+
+    def pipeline(self) -> Pipeline:
+        """
+        Create a pipeline to send several requests at once.
+
+        Returns:
+            Pipeline: The pipeline, see its documentation for more details.
+
+        """
+        return Pipeline(self)
+
+    def pin_mode(self, pin_name: str, mode: PinType) -> int:
+        """Set the mode of a pin, see RPIPLCClass.pin_mode()."""
+        return self._request(_pin_mode(pin_name, mode))
+
+    def digital_write(
+        self,
+        pin_name: str,
+        level: DigitalLevel | int | bool,  # noqa: FBT001
+        *,
+        force: bool = False,
+    ) -> int:
+        """Write a digital value to a pin, see RPIPLCClass.digital_write()."""
+        return self._request(_digital_write(pin_name, level, force))
+
+    def digital_write_many(
+        self,
+        levels: Mapping[str, DigitalLevel | int | bool],
+        *,
+        force: bool = False,
+    ) -> int:
+        """Write the digital values of several pins, see RPIPLCClass.digital_write_many()."""
+        return self._request(_digital_write_many(levels, force))
+
+    def digital_read(self, pin_name: str) -> int:
+        """Read a digital value from a pin, see RPIPLCClass.digital_read()."""
+        return self._request(_digital_read(pin_name))
+
+    def digital_read_many(self, pin_names: Iterable[str]) -> dict[str, int]:
+        """Read the digital values of several pins, see RPIPLCClass.digital_read_many()."""
+        return self._request(_digital_read_many(pin_names))
+
+    def analog_write_set_frequency(self, pin_name: str, freq: int) -> int:
+        """Set the PWM frequency of a pin, see RPIPLCClass.analog_write_set_frequency()."""
+        return self._request(_analog_write_set_frequency(pin_name, freq))
+
+    def analog_write(self, pin_name: str, value: int, *, force: bool = False) -> int:
+        """Write an analog value to a pin, see RPIPLCClass.analog_write()."""
+        return self._request(_analog_write(pin_name, value, force))
+
+    def analog_write_many(self, values: Mapping[str, int], *, force: bool = False) -> int:
+        """Write the analog values of several pins, see RPIPLCClass.analog_write_many()."""
+        return self._request(_analog_write_many(values, force))
+
+    def analog_read(self, pin_name: str) -> int:
+        """Read an analog value from a pin, see RPIPLCClass.analog_read()."""
+        return self._request(_analog_read(pin_name))
+
+    def _request(self, request: _Request[_R]) -> _R:
+        result: _R | Exception = self._execute([request])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _execute(self, requests: list[_Request[Any]]) -> list[Any]:
+        """
+        Send several requests and receive all their responses.
+
+        The responses are received while the requests are being sent, so the daemon never waits
+        for the client to read them, however many requests there are.
+
+        Args:
+            requests (list[_Request[Any]]): The requests to send.
+
+        Returns:
+            list[Any]: The result of each request, or the exception to raise for it.
+
+        Raises:
+            PLCDaemonError: If the protocol is broken or the connection is closed.
+            OSError: If the socket fails or times out.
+
+        """
+        with self._lock:
+            if self._socket.fileno() == -1:
+                msg = "The connection with the daemon is closed"
+                raise PLCDaemonError(msg)
+            first_id = self._next_id
+            self._next_id = (self._next_id + len(requests)) & 0xFFFFFFFF
+            frames = b"".join(
+                pack_frame(request.opcode, (first_id + offset) & 0xFFFFFFFF, request.payload)
+                for offset, request in enumerate(requests)
+            )
+            try:
+                self._send(frames)
+                results: list[Any] = []
+                for offset, request in enumerate(requests):
+                    status, request_id, payload = self._receive_frame()
+                    if request_id != (first_id + offset) & 0xFFFFFFFF:
+                        msg = f"Unexpected response {request_id} from the daemon"
+                        raise PLCDaemonError(msg)  # noqa: TRY301
+                    results.append(_decode_response(status, payload, request.decode))
+            except BaseException:
+                # The responses still on their way would be taken for the ones of the next requests
+                self._socket.close()
+                raise
+            return results
+
+    def _send(self, data: bytes) -> None:
+        """Send data to the daemon, receiving its responses into the buffer meanwhile."""
+        view = memoryview(data)
+        self._socket.settimeout(0.0)
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self._socket, selectors.EVENT_READ | selectors.EVENT_WRITE)
+                while view:
+                    ready = selector.select(self._timeout)
+                    if not ready:
+                        msg = "Timed out sending the requests to the daemon"
+                        raise TimeoutError(msg)
+                    events = ready[0][1]
+                    if events & selectors.EVENT_READ:
+                        self._receive_chunk()
+                    if events & selectors.EVENT_WRITE:
+                        with contextlib.suppress(BlockingIOError):
+                            view = view[self._socket.send(view) :]
+        finally:
+            self._socket.settimeout(self._timeout)
+
+    def _receive_chunk(self) -> None:
+        """Receive the data available from the daemon into the buffer."""
+        try:
+            chunk = self._socket.recv(65536)
+        except BlockingIOError:
+            return
+        if not chunk:
+            msg = "The daemon closed the connection"
+            raise PLCDaemonError(msg)
+        self._buffer += chunk
+
+    def _receive_frame(self) -> tuple[int, int, bytes]:
+        """Receive a response frame, returning its status, request identifier and payload."""
+        while True:
+            if len(self._buffer) >= HEADER.size:
+                length, status, request_id = HEADER.unpack_from(self._buffer)
+                end = HEADER.size + length
+                if len(self._buffer) >= end:
+                    payload = bytes(self._buffer[HEADER.size : end])
+                    del self._buffer[:end]
+                    return status, request_id, payload
+            self._receive_chunk()
+
+
+class Pipeline:
+    """
+    Requests to the daemon that are sent at once by execute().
+
+    It has the same methods as the client, but they only queue the request and return None. Then
+    execute() sends all of them and returns their results in the same order.
+
+    """
+
+    def __init__(self, client: RPIPLCClient) -> None:
+        """
+        Initialize an empty pipeline.
+
+        Args:
+            client (RPIPLCClient): The client used to send the requests.
+
+        """
+        self._client = client
+        self._requests: list[_Request[Any]] = []
+
+    def __len__(self) -> int:
+        """Return the number of queued requests."""
+        return len(self._requests)
+
+    def pin_mode(self, pin_name: str, mode: PinType) -> None:
+        """Queue setting the mode of a pin, see RPIPLCClass.pin_mode()."""
+        self._requests.append(_pin_mode(pin_name, mode))
+
+    def digital_write(
+        self,
+        pin_name: str,
+        level: DigitalLevel | int | bool,  # noqa: FBT001
+        *,
+        force: bool = False,
+    ) -> None:
+        """Queue a digital write to a pin, see RPIPLCClass.digital_write()."""
+        self._requests.append(_digital_write(pin_name, level, force))
+
+    def digital_write_many(
+        self,
+        levels: Mapping[str, DigitalLevel | int | bool],
+        *,
+        force: bool = False,
+    ) -> None:
+        """Queue the digital writes of several pins, see RPIPLCClass.digital_write_many()."""
+        self._requests.append(_digital_write_many(levels, force))
+
+    def digital_read(self, pin_name: str) -> None:
+        """Queue a digital read from a pin, see RPIPLCClass.digital_read()."""
+        self._requests.append(_digital_read(pin_name))
+
+    def digital_read_many(self, pin_names: Iterable[str]) -> None:
+        """Queue the digital reads of several pins, see RPIPLCClass.digital_read_many()."""
+        self._requests.append(_digital_read_many(pin_names))
+
+    def analog_write_set_frequency(self, pin_name: str, freq: int) -> None:
+        """Queue setting the PWM frequency, see RPIPLCClass.analog_write_set_frequency()."""
+        self._requests.append(_analog_write_set_frequency(pin_name, freq))
+
+    def analog_write(self, pin_name: str, value: int, *, force: bool = False) -> None:
+        """Queue an analog write to a pin, see RPIPLCClass.analog_write()."""
+        self._requests.append(_analog_write(pin_name, value, force))
+
+    def analog_write_many(self, values: Mapping[str, int], *, force: bool = False) -> None:
+        """Queue the analog writes of several pins, see RPIPLCClass.analog_write_many()."""
+        self._requests.append(_analog_write_many(values, force))
+
+    def analog_read(self, pin_name: str) -> None:
+        """Queue an analog read from a pin, see RPIPLCClass.analog_read()."""
+        self._requests.append(_analog_read(pin_name))
+
+    def execute(self) -> list[Any]:
+        """
+        Send all the queued requests and wait for their results.
+
+        Returns:
+            list[Any]: The result of each request, in the same order they were queued.
+
+        Raises:
+            UnknownPinError, UnknownPLCConfError, PLCDaemonError: The error of the first request
+                                                                  that failed, once all the
+                                                                  responses are received.
+
+        """
+        requests, self._requests = self._requests, []
+        if not requests:
+            return []
+        results = self._client._execute(requests)  # noqa: SLF001
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+
+def _decode_response(status: int, payload: bytes, decode: Callable[[PayloadReader], Any]) -> Any:  # noqa: ANN401
+    """Decode the payload of a response, or build the exception of an error response."""
+    reader = PayloadReader(payload)
+    if status == Status.OK:
+        return decode(reader)
+    if status == Status.UNKNOWN_PIN:
+        return UnknownPinError(reader.text())
+    if status == Status.UNKNOWN_PLC_CONF:
+        return UnknownPLCConfError(reader.text())
+    return PLCDaemonError(reader.text())
@@ -0,0 +1,490 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import threading
+from enum import IntEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import PLCDaemonError, UnknownPinError, UnknownPLCConfError
+from .lib_types import DigitalLevel, PinType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEFAULT_SOCKET_PATH = "/run/rpiplc.sock"
+# Only the owner and the group of the daemon can connect to it
+DEFAULT_SOCKET_MODE = 0o660
+
+# Every frame starts with the length of its payload, the opcode (requests) or the status
+# (responses), and the request identifier, which the response echoes
+HEADER = struct.Struct("<HBI")
+MAX_PAYLOAD = 0xFFFF
+MAX_STR = 0xFF
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+
+
+class Opcode(IntEnum):
+    """Operations of the daemon protocol."""
+
+    INFO = 0
+    PIN_MODE = 1
+    DIGITAL_WRITE = 2
+    DIGITAL_READ = 3
+    ANALOG_WRITE = 4
+    ANALOG_READ = 5
+    ANALOG_WRITE_SET_FREQUENCY = 6
+    DIGITAL_WRITE_MANY = 7
+    DIGITAL_READ_MANY = 8
+    ANALOG_WRITE_MANY = 9
+
+
+class Status(IntEnum):
+    """Statuses of the responses of the daemon protocol."""
+
+    OK = 0
+    UNKNOWN_PIN = 1
+    UNKNOWN_PLC_CONF = 2
+    ERROR = 3
+
+
+def pack_str(value: str) -> bytes:
+    """
+    Encode a short string (like a pin name) as its length in one byte followed by its UTF-8 bytes.
+
+    Args:
+        value (str): The string to encode.
+
+    Returns:
+        bytes: The encoded string.
+
+    Raises:
+        PLCDaemonError: If the string is longer than 255 bytes.
+
+    """
+    data = value.encode()
+    if len(data) > MAX_STR:
+        msg = f"String too long for the protocol: {value!r}"
+        raise PLCDaemonError(msg)
+    return _U8.pack(len(data)) + data
+
+
+def pack_frame(code: int, request_id: int, payload: bytes) -> bytes:
+    """
+    Encode a request or response frame.
+
+    Args:
+        code (int): The opcode of a request or the status of a response.
+        request_id (int): The request identifier.
+        payload (bytes): The payload of the frame.
+
+    Returns:
+        bytes: The encoded frame.
+
+    Raises:
+        PLCDaemonError: If the payload is too long.
+
+    """
+    if len(payload) > MAX_PAYLOAD:
+        msg = f"Payload too long for the protocol: {len(payload)} bytes"
+        raise PLCDaemonError(msg)
+    return HEADER.pack(len(payload), code, request_id) + payload
+
+
+class PayloadReader:
+    """Sequential decoder of the fields of a payload."""
+
+    def __init__(self, payload: bytes) -> None:
+        """
+        Initialize the reader at the start of a payload.
+
+        Args:
+            payload (bytes): The payload to decode.
+
+        """
+        self._payload = payload
+        self._offset = 0
+
+    def _unpack(self, fmt: struct.Struct) -> int:
+        try:
+            (value,) = fmt.unpack_from(self._payload, self._offset)
+        except struct.error as exc:
+            msg = "Truncated payload"
+            raise PLCDaemonError(msg) from exc
+        self._offset += fmt.size
+        return int(value)
+
+    def u8(self) -> int:
+        """Decode an unsigned 8-bit integer."""
+        return self._unpack(_U8)
+
+    def u16(self) -> int:
+        """Decode an unsigned 16-bit integer."""
+        return self._unpack(_U16)
+
+    def u32(self) -> int:
+        """Decode an unsigned 32-bit integer."""
+        return self._unpack(_U32)
+
+    def i32(self) -> int:
+        """Decode a signed 32-bit integer."""
+        return self._unpack(_I32)
+
+    def string(self) -> str:
+        """Decode a string encoded with pack_str()."""
+        length = self.u8()
+        data = self._payload[self._offset : self._offset + length]
+        if len(data) != length:
+            msg = "Truncated payload"
+            raise PLCDaemonError(msg)
+        self._offset += length
+        return data.decode()
+
+    def text(self) -> str:
+        """Decode the rest of the payload as UTF-8 text."""
+        data = self._payload[self._offset :]
+        self._offset = len(self._payload)
+        return data.decode()
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """
+    Remove the socket file left by a daemon that is no longer running.
+
+    Args:
+        socket_path (Path): The path of the Unix socket.
+
+    Raises:
+        PLCDaemonError: If a daemon is serving the socket, or if the path isn't a socket.
+
+    """
+    try:
+        mode = socket_path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        msg = f"{socket_path} exists and isn't a socket"
+        raise PLCDaemonError(msg)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(1.0)
+        try:
+            probe.connect(str(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            socket_path.unlink(missing_ok=True)
+            return
+        except OSError:
+            pass
+    msg = f"Another daemon is serving {socket_path}"
+    raise PLCDaemonError(msg)
+
+
+class PLCDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server that owns a PLC and serves its pins to other processes.
+
+    Each client connection is served by its own thread, and the requests of a connection are
+    answered in order. All the requests that arrive together (pipelined) are answered with a single
+    write. The backend can be the rpiplc instance or a SimulatedPLC, it must be initialized before
+    serving.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str,
+        backend: Any,  # noqa: ANN401
+        version_name: str,
+        model_name: str,
+        *,
+        socket_mode: int = DEFAULT_SOCKET_MODE,
+    ) -> None:
+        """
+        Create the server socket.
+
+        Args:
+            socket_path (str): The path of the Unix socket, replaced if it's left by a daemon
+                               that is no longer running.
+            backend (Any): The initialized rpiplc instance or SimulatedPLC that owns the pins.
+            version_name (str): The version name of the PLC, reported to the clients.
+            model_name (str): The model name of the PLC, reported to the clients.
+            socket_mode (int): The permissions of the socket file, set before accepting any
+                               connection (default is 0o660, only the owner and the group).
+
+        Raises:
+            PLCDaemonError: If another daemon is serving the socket, or if the path exists and
+                            isn't a socket.
+
+        """
+        self.backend = backend
+        self.version_name = version_name
+        self.model_name = model_name
+        self._handlers: dict[int, Callable[[PayloadReader], bytes]] = {
+            Opcode.INFO: self._info,
+            Opcode.PIN_MODE: self._pin_mode,
+            Opcode.DIGITAL_WRITE: self._digital_write,
+            Opcode.DIGITAL_READ: self._digital_read,
+            Opcode.ANALOG_WRITE: self._analog_write,
+            Opcode.ANALOG_READ: self._analog_read,
+            Opcode.ANALOG_WRITE_SET_FREQUENCY: self._analog_write_set_frequency,
+            Opcode.DIGITAL_WRITE_MANY: self._digital_write_many,
+            Opcode.DIGITAL_READ_MANY: self._digital_read_many,
+            Opcode.ANALOG_WRITE_MANY: self._analog_write_many,
+        }
+        self._socket_path = Path(socket_path)
+        self._socket_mode = socket_mode
+        _remove_stale_socket(self._socket_path)
+        super().__init__(socket_path, _ConnectionHandler)
+        socket_stat = self._socket_path.lstat()
+        self._socket_file = (socket_stat.st_dev, socket_stat.st_ino)
+
+    def server_bind(self) -> None:
+        """Bind the server socket and restrict the permissions of its file."""
+        super().server_bind()
+        self._socket_path.chmod(self._socket_mode)
+
+    def server_close(self) -> None:
+        """Close the server socket and remove its file, unless it was replaced by another one."""
+        super().server_close()
+        try:
+            socket_stat = self._socket_path.lstat()
+        except FileNotFoundError:
+            return
+        if (socket_stat.st_dev, socket_stat.st_ino) == self._socket_file:
+            self._socket_path.unlink(missing_ok=True)
+
+    def dispatch(self, opcode: int, request_id: int, payload: bytes) -> bytes:
+        """
+        Run a request and encode its response frame.
+
+        Args:
+            opcode (int): The opcode of the request.
+            request_id (int): The request identifier.
+            payload (bytes): The payload of the request.
+
+        Returns:
+            bytes: The response frame.
+
+        """
+        try:
+            handler = self._handlers.get(opcode)
+            if handler is None:
+                msg = f"Unknown opcode {opcode}"
+                raise PLCDaemonError(msg)  # noqa: TRY301
+            return pack_frame(Status.OK, request_id, handler(PayloadReader(payload)))
+        except UnknownPinError as exc:
+            return pack_frame(Status.UNKNOWN_PIN, request_id, str(exc.key).encode())
+        except UnknownPLCConfError as exc:
+            return pack_frame(Status.UNKNOWN_PLC_CONF, request_id, str(exc).encode())
+        except Exception as exc:  # noqa: BLE001
+            return pack_frame(Status.ERROR, request_id, f"{type(exc).__name__}: {exc}".encode())
+
+    def _info(self, _: PayloadReader) -> bytes:
+        return pack_str(self.version_name) + pack_str(self.model_name)
+
+    def _pin_mode(self, reader: PayloadReader) -> bytes:
+        pin_name = reader.string()
+        return _I32.pack(self.backend.pin_mode(pin_name, PinType(reader.u8())))
+
+    def _digital_write(self, reader: PayloadReader) -> bytes:
+        pin_name = reader.string()
+        level = DigitalLevel(reader.u8())
+        rc = self.backend.digital_write(pin_name, level, force=bool(reader.u8()))
+        return _I32.pack(rc)
+
+    def _digital_read(self, reader: PayloadReader) -> bytes:
+        return _I32.pack(self.backend.digital_read(reader.string()))
+
+    def _analog_write(self, reader: PayloadReader) -> bytes:
+        pin_name = reader.string()
+        value = reader.u16()
+        return _I32.pack(self.backend.analog_write(pin_name, value, force=bool(reader.u8())))
+
+    def _analog_read(self, reader: PayloadReader) -> bytes:
+        return _I32.pack(self.backend.analog_read(reader.string()))
+
+    def _analog_write_set_frequency(self, reader: PayloadReader) -> bytes:
+        pin_name = reader.string()
+        return _I32.pack(self.backend.analog_write_set_frequency(pin_name, reader.u32()))
+
+    def _digital_write_many(self, reader: PayloadReader) -> bytes:
+        force = bool(reader.u8())
+        levels = {reader.string(): DigitalLevel(reader.u8()) for _ in range(reader.u16())}
+        return _I32.pack(self.backend.digital_write_many(levels, force=force))
+
+    def _digital_read_many(self, reader: PayloadReader) -> bytes:
+        pin_names = [reader.string() for _ in range(reader.u16())]
+        levels = self.backend.digital_read_many(pin_names)
+        return b"".join(_I32.pack(levels[pin_name]) for pin_name in pin_names)
+
+    def _analog_write_many(self, reader: PayloadReader) -> bytes:
+        force = bool(reader.u8())
+        values = {reader.string(): reader.u16() for _ in range(reader.u16())}
+        return _I32.pack(self.backend.analog_write_many(values, force=force))
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    """Serve the requests of a client connection until it's closed."""
+
+    server: PLCDaemon
+
+    def handle(self) -> None:
+        buffer = bytearray()
+        while True:
+            try:
+                chunk = self.request.recv(65536)
+            except OSError:
+                return
+            if not chunk:
+                return
+            buffer += chunk
+
+            # Answer all the complete frames received so far with a single write
+            responses = bytearray()
+            offset = 0
+            while len(buffer) - offset >= HEADER.size:
+                length, opcode, request_id = HEADER.unpack_from(buffer, offset)
+                end = offset + HEADER.size + length
+                if len(buffer) < end:
+                    break
+                payload = bytes(buffer[offset + HEADER.size : end])
+                responses += self.server.dispatch(opcode, request_id, payload)
+                offset = end
+            del buffer[:offset]
+
+            if responses:
+                try:
+                    self.request.sendall(responses)
+                except OSError:
+                    return
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the daemon until it receives SIGINT or SIGTERM.
+
+    Args:
+        argv (list[str] | None): The command line arguments, or None to use sys.argv.
+
+    Returns:
+        int: The exit code of the program.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m librpiplc.daemon",
+        description="Own the PLC and serve its pins to other processes through a Unix socket.",
+    )
+    parser.add_argument("version_name", help="version name of the PLC, like RPIPLC_V6")
+    parser.add_argument("model_name", help="model name of the PLC, like RPIPLC_21")
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"path of the Unix socket (default is {DEFAULT_SOCKET_PATH})",
+    )
+    parser.add_argument(
+        "--socket-mode",
+        type=lambda mode: int(mode, 8),
+        default=DEFAULT_SOCKET_MODE,
+        help=f"permissions of the Unix socket, in octal (default is {DEFAULT_SOCKET_MODE:o})",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="restart the peripherals when initializing"
+    )
+    parser.add_argument(
+        "--no-restart-on-exit",
+        action="store_true",
+        help="don't restart the peripherals when exiting (not supported by old libraries)",
+    )
+    parser.add_argument(
+        "--simulate", action="store_true", help="serve a simulated PLC instead of the hardware"
+    )
+    args = parser.parse_args(argv)
+
+    backend: Any
+    if args.simulate:
+        from .simulator import SimulatedPLC  # noqa: PLC0415
+
+        backend = SimulatedPLC()
+    else:
+        from . import rpiplc  # noqa: PLC0415
+
+        backend = rpiplc
+
+    try:
+        server = PLCDaemon(
+            args.socket,
+            backend,
+            args.version_name,
+            args.model_name,
+            socket_mode=args.socket_mode,
+        )
+    except PLCDaemonError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    try:
+        rc = backend.init(args.version_name, args.model_name, restart=args.restart)
+    except (UnknownPLCConfError, OSError) as exc:
+        server.server_close()
+        print(exc, file=sys.stderr)
+        return 1
+    if rc not in (0, 1):
+        server.server_close()
+        print(f"librpiplc could not be initialized ({rc})", file=sys.stderr)
+        return 1
+
+    def stop(*_: object) -> None:
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        exit_code = _deinit(backend, restart=not args.no_restart_on_exit)
+    return exit_code
+
+
+def _deinit(backend: Any, *, restart: bool) -> int:  # noqa: ANN401
+    """Deinitialize the backend when exiting, getting the exit code of the program."""
+    try:
+        backend.deinit(restart=restart)
+    except UnknownPLCConfError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from . import RPIPLCClass
+    from .lib_types import DigitalLevel
+
+
+class CommandKind(Enum):
+    """Kinds of commands that can be submitted to the I/O engine."""
+
+    DIGITAL_READ = 0
+    ANALOG_READ = 1
+    DIGITAL_WRITE = 2
+    ANALOG_WRITE = 3
+    CALL = 4
+
+
+_WRITES = (CommandKind.DIGITAL_WRITE, CommandKind.ANALOG_WRITE)
+_READS = (CommandKind.DIGITAL_READ, CommandKind.ANALOG_READ)
+
+
+class _Command(NamedTuple):
+    kind: CommandKind
+    pin_name: str
+    pin: int
+    value: Any
+    future: Future[Any]
+
+
+class IOEngine:
+    """
+    I/O worker thread that owns the calls into the C library, fed by a command queue.
+
+    Any thread can submit read and write commands, which return a Future right away. The worker
+    thread drains all the commands queued since its last pass (waiting an optional tick to let
+    more of them accumulate) and runs them in order, merging the consecutive ones:
+    - The consecutive writes are merged by pin identifier, so the last write to a pin wins (even
+      through an alias like Q0.5 and A0.5), and then they are written with digital_write_many and
+      analog_write_many, which group the pins of each expander into a single digitalWriteAll or
+      analogWriteAll call. Every write future gets the return code of its group.
+    - The consecutive reads are merged by pin name, the digital ones are read with
+      digital_read_many and the analog ones with one analogRead per pin.
+    - Any other function submitted with submit() is called on its own.
+
+    Bursts of small calls from many threads become a few bulk I2C transactions, without the
+    producers waiting on each other. The pin names are checked when submitting the command, so an
+    unknown pin raises UnknownPinError in the producer. The cancelled futures are skipped. The
+    commands can only be submitted while the engine is running, otherwise they raise RuntimeError.
+
+    Attributes:
+        batches (int): Number of times that the worker drained the queue and ran its commands.
+
+    """
+
+    def __init__(self, plc: RPIPLCClass | None = None, *, tick: float = 0.0) -> None:
+        """
+        Initialize the engine, without starting its worker thread.
+
+        Args:
+            plc (RPIPLCClass | None): The rpiplc instance to use, or None to use the rpiplc
+                                      singleton (default is None).
+            tick (float): Seconds that the worker waits after waking up before draining the queue,
+                          to coalesce more commands (default is 0, drain as soon as possible).
+
+        """
+        if plc is None:
+            from . import rpiplc  # noqa: PLC0415
+
+            plc = rpiplc
+        self._plc = plc
+        self._tick = tick
+        self._queue: deque[_Command | None] = deque()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Held to check that the engine is running and queue a command, so stop() can't miss it
+        self._state_lock = threading.Lock()
+        self._accepting = False
+        self.batches = 0
+
+    def __enter__(self) -> IOEngine:  # noqa: PYI034
+        """Start the engine when entering a "with" block, and stop it when exiting it."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the engine, see stop()."""
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is running or not."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread, if it isn't already running."""
+        with self._state_lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="rpiplc-io", daemon=True)
+            self._thread.start()
+            self._accepting = True
+
+    def stop(self) -> None:
+        """
+        Run the commands already submitted and stop the worker thread.
+
+        The commands submitted after calling it raise RuntimeError, and the futures of the
+        commands that the worker couldn't run get a RuntimeError.
+
+        """
+        with self._state_lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._accepting = False
+            self._queue.append(None)
+            self._wakeup.set()
+        thread.join()
+        self._fail_pending()
+
+    def _enqueue(self, command: _Command) -> None:
+        """Queue a command and wake up the worker."""
+        with self._state_lock:
+            if not self._accepting:
+                msg = "The I/O engine isn't running"
+                raise RuntimeError(msg)
+            self._queue.append(command)
+        self._wakeup.set()
+
+    def _fail_pending(self) -> None:
+        """Give a RuntimeError to the futures of the queued commands, which won't be run."""
+        while self._queue:
+            command = self._queue.popleft()
+            if command is not None and command.future.set_running_or_notify_cancel():
+                command.future.set_exception(RuntimeError("The I/O engine was stopped"))
+
+    def _submit(self, kind: CommandKind, pin_name: str, value: Any) -> Future[Any]:  # noqa: ANN401
+        """Queue a command for a pin and wake up the worker."""
+        pin = self._plc.mapping_index.resolve(pin_name)[0]
+        future: Future[Any] = Future()
+        self._enqueue(_Command(kind, pin_name, pin, value, future))
+        return future
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future[Any]:  # noqa: ANN401
+        """
+        Queue a call to any function, run by the worker in order with the other commands.
+
+        Args:
+            func (Callable[..., Any]): The function to call, like rpiplc.pin_mode.
+            *args (Any): The positional arguments of the function.
+            **kwargs (Any): The keyword arguments of the function.
+
+        Returns:
+            Future[Any]: The future of the value returned by the function.
+
+        Raises:
+            RuntimeError: If the engine isn't running.
+
+        """
+        future: Future[Any] = Future()
+        self._enqueue(_Command(CommandKind.CALL, "", 0, lambda: func(*args, **kwargs), future))
+        return future
+
+    def submit_digital_read(self, pin_name: str) -> Future[int]:
+        """
+        Queue a digital read of a pin.
+
+        Args:
+            pin_name (str): The name of the pin to read from.
+
+        Returns:
+            Future[int]: The future of the digital value read from the pin (0 or 1).
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+            RuntimeError: If the engine isn't running.
+
+        """
+        return self._submit(CommandKind.DIGITAL_READ, pin_name, None)
+
+    def submit_analog_read(self, pin_name: str) -> Future[int]:
+        """
+        Queue an analog read of a pin.
+
+        Args:
+            pin_name (str): The name of the pin to read from.
+
+        Returns:
+            Future[int]: The future of the analog value read from the pin.
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+            RuntimeError: If the engine isn't running.
+
+        """
+        return self._submit(CommandKind.ANALOG_READ, pin_name, None)
+
+    def submit_digital_write(
+        self,
+        pin_name: str,
+        level: DigitalLevel | int | bool,  # noqa: FBT001
+    ) -> Future[int]:
+        """
+        Queue a digital write to a pin.
+
+        Args:
+            pin_name (str): The name of the pin to write to.
+            level (DigitalLevel | int | bool): The digital level to write (LOW or HIGH).
+
+        Returns:
+            Future[int]: The future of the return code of the digital writes merged with it (0 for
+                         success).
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+            RuntimeError: If the engine isn't running.
+
+        """
+        return self._submit(CommandKind.DIGITAL_WRITE, pin_name, level)
+
+    def submit_analog_write(self, pin_name: str, value: int) -> Future[int]:
+        """
+        Queue an analog write to a pin.
+
+        Args:
+            pin_name (str): The name of the pin to write to.
+            value (int): The analog value to write (it's normally a number between 0 and 4095).
+
+        Returns:
+            Future[int]: The future of the return code of the analog writes merged with it (0 for
+                         success).
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+            RuntimeError: If the engine isn't running.
+
+        """
+        return self._submit(CommandKind.ANALOG_WRITE, pin_name, value)
+
+    def digital_read(self, pin_name: str) -> int:
+        """Read a digital value through the engine, waiting for the result."""
+        return self.submit_digital_read(pin_name).result()
+
+    def analog_read(self, pin_name: str) -> int:
+        """Read an analog value through the engine, waiting for the result."""
+        return self.submit_analog_read(pin_name).result()
+
+    def digital_write(self, pin_name: str, level: DigitalLevel | int | bool) -> int:  # noqa: FBT001
+        """Write a digital value through the engine, waiting for the result."""
+        return self.submit_digital_write(pin_name, level).result()
+
+    def analog_write(self, pin_name: str, value: int) -> int:
+        """Write an analog value through the engine, waiting for the result."""
+        return self.submit_analog_write(pin_name, value).result()
+
+    def _run(self) -> None:
+        """Worker thread: drain the queue and run the commands until stopped."""
+        try:
+            self._drain()
+        finally:
+            with self._state_lock:
+                self._accepting = False
+            self._fail_pending()
+
+    def _drain(self) -> None:
+        """Drain the queue and run the commands until the stop marker is found."""
+        while True:
+            self._wakeup.wait()
+            if self._tick > 0:
+                time.sleep(self._tick)
+            self._wakeup.clear()
+
+            commands: list[_Command] = []
+            stop = False
+            while self._queue:
+                command = self._queue.popleft()
+                if command is None:
+                    stop = True
+                    break
+                commands.append(command)
+            if commands:
+                self.batches += 1
+                self._run_commands(commands)
+            if stop:
+                return
+
+    def _run_commands(self, commands: list[_Command]) -> None:
+        """Run the drained commands, merging the consecutive writes and the consecutive reads."""
+        run: list[_Command] = []
+        for command in commands:
+            if run and not _same_run(run[-1].kind, command.kind):
+                self._run_group(run)
+                run = []
+            run.append(command)
+        if run:
+            self._run_group(run)
+
+    def _run_group(self, commands: list[_Command]) -> None:
+        """Run a group of commands of the same run, completing their futures."""
+        commands = [
+            command for command in commands if command.future.set_running_or_notify_cancel()
+        ]
+        if not commands:
+            return
+        try:
+            if commands[0].kind in _WRITES:
+                results = self._run_writes(commands)
+            elif commands[0].kind in _READS:
+                results = self._run_reads(commands)
+            else:
+                results = [commands[0].value()]
+        except Exception as exc:  # noqa: BLE001
+            for command in commands:
+                command.future.set_exception(exc)
+            return
+        for command, result in zip(commands, results):
+            command.future.set_result(result)
+
+    def _run_writes(self, commands: list[_Command]) -> list[int]:
+        """Merge writes by pin identifier (the last one wins) and run them grouped."""
+        last: dict[int, _Command] = {}
+        for command in commands:
+            last.pop(command.pin, None)
+            last[command.pin] = command
+        digital_levels = {
+            command.pin_name: command.value
+            for command in last.values()
+            if command.kind is CommandKind.DIGITAL_WRITE
+        }
+        analog_values = {
+            command.pin_name: command.value
+            for command in last.values()
+            if command.kind is CommandKind.ANALOG_WRITE
+        }
+        digital_rc = self._plc.digital_write_many(digital_levels) if digital_levels else 0
+        analog_rc = self._plc.analog_write_many(analog_values) if analog_values else 0
+        return [
+            digital_rc if command.kind is CommandKind.DIGITAL_WRITE else analog_rc
+            for command in commands
+        ]
+
+    def _run_reads(self, commands: list[_Command]) -> list[int]:
+        """Merge reads by pin name and run them grouped."""
+        digital_names = [
+            command.pin_name for command in commands if command.kind is CommandKind.DIGITAL_READ
+        ]
+        digital_values = self._plc.digital_read_many(dict.fromkeys(digital_names))
+        analog_values: dict[str, int] = {}
+        for command in commands:
+            if command.kind is CommandKind.ANALOG_READ and command.pin_name not in analog_values:
+                analog_values[command.pin_name] = self._plc.analog_read(command.pin_name)
+        return [
+            digital_values[command.pin_name]
+            if command.kind is CommandKind.DIGITAL_READ
+            else analog_values[command.pin_name]
+            for command in commands
+        ]
+
+
+def _same_run(previous: CommandKind, kind: CommandKind) -> bool:
+    """Check if a command can be merged with the run of the previous command."""
+    if kind is CommandKind.CALL or previous is CommandKind.CALL:
+        return False
+    return (kind in _WRITES) == (previous in _WRITES)
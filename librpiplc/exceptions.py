@@ -35,3 +35,12 @@ class UnknownPinError(KeyError):
     def __init__(self, key: str) -> None:
         """Init method."""
         super().__init__(f"Unknown pin: '{key}'")
+        self.key = key
+
+
+class PLCDaemonError(Exception):
+    """Exception raised for errors reported by the librpiplc daemon, or in its protocol."""
+
+    def __init__(self, message: str) -> None:
+        """Init method."""
+        super().__init__(message)
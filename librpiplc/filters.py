@@ -0,0 +1,341 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import threading
+    from collections.abc import Callable
+    from contextlib import AbstractContextManager
+
+
+class AnalogFilter(ABC):
+    """
+    Base class of the filters of the analog samples of a pin.
+
+    The subclasses must implement update() and reset().
+
+    Attributes:
+        decimation (int): Number of samples that the filter needs to produce a new value.
+
+    """
+
+    decimation = 1
+
+    @abstractmethod
+    def update(self, sample: int) -> int | None:
+        """
+        Add a sample to the filter.
+
+        Args:
+            sample (int): The sample, between 0 and 65535.
+
+        Returns:
+            int | None: The new value of the filter, or None if it needs more samples.
+
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget all the samples."""
+
+
+class MovingAverage(AnalogFilter):
+    """Average of the last samples, updated with a running sum."""
+
+    def __init__(self, size: int) -> None:
+        """
+        Initialize the filter with an empty ring buffer.
+
+        Args:
+            size (int): The number of samples to average.
+
+        Raises:
+            ValueError: If the size is smaller than 1.
+
+        """
+        if size < 1:
+            msg = "The size must be at least 1"
+            raise ValueError(msg)
+        self._ring = array("H", bytes(2 * size))
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all the samples."""
+        self._next = 0
+        self._count = 0
+        self._total = 0
+
+    def update(self, sample: int) -> int:
+        """
+        Add a sample to the filter.
+
+        Args:
+            sample (int): The sample, between 0 and 65535.
+
+        Returns:
+            int: The rounded average of the last samples.
+
+        """
+        ring = self._ring
+        if self._count == len(ring):
+            self._total -= ring[self._next]
+        else:
+            self._count += 1
+        ring[self._next] = sample
+        self._total += sample
+        self._next = (self._next + 1) % len(ring)
+        return (2 * self._total + self._count) // (2 * self._count)
+
+
+class ExponentialAverage(AnalogFilter):
+    """Exponential moving average, which doesn't need any history."""
+
+    def __init__(self, alpha: float) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            alpha (float): The weight of each new sample, between 0 (excluded) and 1.
+
+        Raises:
+            ValueError: If alpha isn't in the range.
+
+        """
+        if not 0 < alpha <= 1:
+            msg = "alpha must be between 0 (excluded) and 1"
+            raise ValueError(msg)
+        self._alpha = alpha
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all the samples."""
+        self._value: float | None = None
+
+    def update(self, sample: int) -> int:
+        """
+        Add a sample to the filter, the first one is its initial value.
+
+        Args:
+            sample (int): The sample, between 0 and 65535.
+
+        Returns:
+            int: The rounded average.
+
+        """
+        if self._value is None:
+            self._value = float(sample)
+        else:
+            self._value += self._alpha * (sample - self._value)
+        return round(self._value)
+
+
+class MedianFilter(AnalogFilter):
+    """
+    Median of the last samples, which discards the spikes.
+
+    The samples are kept both in arrival order (to know which one to drop) and sorted, so every
+    sample costs a binary search and a move of the sorted buffer in memory.
+
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Initialize the filter with empty buffers.
+
+        Args:
+            size (int): The number of samples to get the median of.
+
+        Raises:
+            ValueError: If the size is smaller than 1.
+
+        """
+        if size < 1:
+            msg = "The size must be at least 1"
+            raise ValueError(msg)
+        self._ring = array("H", bytes(2 * size))
+        self._sorted = array("H")
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all the samples."""
+        self._next = 0
+        del self._sorted[:]
+
+    def update(self, sample: int) -> int:
+        """
+        Add a sample to the filter.
+
+        Args:
+            sample (int): The sample, between 0 and 65535.
+
+        Returns:
+            int: The median of the last samples (the average of the middle ones, rounded down, if
+                 there is an even number of them).
+
+        """
+        ring = self._ring
+        window = self._sorted
+        if len(window) == len(ring):
+            del window[bisect_left(window, ring[self._next])]
+        ring[self._next] = sample
+        insort(window, sample)
+        self._next = (self._next + 1) % len(ring)
+        middle = len(window) // 2
+        if len(window) % 2:
+            return window[middle]
+        return (window[middle - 1] + window[middle]) // 2
+
+
+class Oversample(AnalogFilter):
+    """Oversampling and decimation: the rounded average of every group of samples."""
+
+    def __init__(self, factor: int) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            factor (int): The number of samples of each group.
+
+        Raises:
+            ValueError: If the factor is smaller than 1.
+
+        """
+        if factor < 1:
+            msg = "The factor must be at least 1"
+            raise ValueError(msg)
+        self.decimation = factor
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the samples of the current group."""
+        self._count = 0
+        self._total = 0
+
+    def update(self, sample: int) -> int | None:
+        """
+        Add a sample to the current group.
+
+        Args:
+            sample (int): The sample, between 0 and 65535.
+
+        Returns:
+            int | None: The rounded average of the group if the sample completed it, or None.
+
+        """
+        self._total += sample
+        self._count += 1
+        if self._count < self.decimation:
+            return None
+        value = (2 * self._total + self.decimation) // (2 * self.decimation)
+        self.reset()
+        return value
+
+
+class FilterPipeline(AnalogFilter):
+    """
+    Chain of filters, where the values of each filter are the samples of the next one.
+
+    Its decimation is the product of the decimations of its filters, so the library reads that
+    number of samples for every analog read of a filtered pin.
+
+    """
+
+    def __init__(self, *filters: AnalogFilter) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            *filters (AnalogFilter): The filters, in the order that the samples go through them.
+
+        """
+        self._filters = filters
+        self.decimation = 1
+        for analog_filter in filters:
+            self.decimation *= analog_filter.decimation
+        self._value: int | None = None
+
+    @property
+    def filters(self) -> tuple[AnalogFilter, ...]:
+        """The filters of the pipeline."""
+        return self._filters
+
+    @property
+    def value(self) -> int | None:
+        """The last value of the pipeline, or None if it didn't produce any yet."""
+        return self._value
+
+    def reset(self) -> None:
+        """Forget the samples of all the filters."""
+        for analog_filter in self._filters:
+            analog_filter.reset()
+        self._value = None
+
+    def update(self, sample: int) -> int | None:
+        """
+        Pass a sample through the filters.
+
+        Args:
+            sample (int): The sample, between 0 and 65535.
+
+        Returns:
+            int | None: The new value of the last filter, or None if any filter needs more
+                        samples.
+
+        """
+        for analog_filter in self._filters:
+            value = analog_filter.update(sample)
+            if value is None:
+                return None
+            sample = value
+        self._value = sample
+        return sample
+
+
+def filtered_read(
+    analog_filter: AnalogFilter,
+    read: Callable[[int], int],
+    pin: int,
+    bus_lock: AbstractContextManager[None] | threading.Lock,
+) -> int:
+    """
+    Read samples of a pin until a filter produces a new value.
+
+    Args:
+        analog_filter (AnalogFilter): The filter of the pin.
+        read (Callable[[int], int]): The analogRead function of the C library.
+        pin (int): The pin identifier.
+        bus_lock (AbstractContextManager[None] | threading.Lock): The lock held while reading each
+                                                                  sample.
+
+    Returns:
+        int: The new value of the filter.
+
+    """
+    value = None
+    while value is None:
+        with bus_lock:
+            sample = read(pin)
+        value = analog_filter.update(sample)
+    return value
@@ -17,7 +17,7 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .mapping import PLCMappingDict, make_pin_direct
+from .mapping import PLCPinTable, make_pin_direct
 
 extras = {
     "DE_RE": make_pin_direct(27),
@@ -29,6 +29,8 @@ extras = {
     "RS485_TERMINATION": make_pin_direct(17),
 }
 
+_table = PLCPinTable(extras=extras)
+
 hw = {
-    "GATEBERRY": PLCMappingDict({**extras}),
+    "GATEBERRY": _table.model("extras"),
 }
@@ -0,0 +1,534 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_right, insort
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import UnknownPinError
+
+if TYPE_CHECKING:
+    from . import RPIPLCClass
+    from .streaming import SampleBlock
+
+DEFAULT_SEGMENT_RECORDS = 16384
+
+_MAGIC = b"RPIH"
+_FORMAT_VERSION = 1
+# Magic, format version, timestamps of the first and the last records (in ns), number of records
+# and capacity of the segment
+_HEADER = struct.Struct("<4sHxxqqII")
+# Time since the previous record (in us, 0 for the first one) and value
+_RECORD = struct.Struct("<IH")
+_MAX_DELTA_US = 0xFFFFFFFF
+_MAX_VALUE = 0xFFFF
+_SEGMENT_SUFFIX = ".seg"
+
+# A point of a series: its timestamp (in ns) and its value
+_Point = tuple[int, int]
+
+
+class _Compressor:
+    """
+    Compression of a series: decides which of its points are stored.
+
+    With a deviation, it's the swinging door algorithm: a point is stored when the points received
+    since the last stored one can't be all within the deviation of a line from it, and its value
+    is the one of the line (so it can differ from the received one by up to the deviation).
+    Otherwise it's a deadband: a point is stored when its value differs from the last stored one
+    by more than the deadband.
+
+    With the swinging door, a point received at the same time as the last stored one has no line
+    from it: it's stored too if its value isn't within the deviation of the stored one.
+
+    """
+
+    __slots__ = ("_deadband", "_deviation", "_lower", "_snapshot", "_stored", "_upper")
+
+    def __init__(self, deadband: int, deviation: float | None) -> None:
+        self._deadband = deadband
+        self._deviation = deviation
+        self._stored: _Point | None = None
+        self._snapshot: _Point | None = None
+        self._upper = 0.0
+        self._lower = 0.0
+
+    def update(self, point: _Point) -> tuple[_Point, ...]:
+        """Add a point to the series, and get the points to store, in time order."""
+        stored = self._stored
+        if stored is None:
+            self._stored = point
+            return (point,)
+        if self._deviation is None:
+            return self._deadband_update(point, stored)
+        return self._swinging_door_update(point, stored, self._deviation)
+
+    def _deadband_update(self, point: _Point, stored: _Point) -> tuple[_Point, ...]:
+        if abs(point[1] - stored[1]) > self._deadband:
+            self._stored = point
+            self._snapshot = None
+            return (point,)
+        self._snapshot = point
+        return ()
+
+    def _swinging_door_update(
+        self, point: _Point, stored: _Point, deviation: float
+    ) -> tuple[_Point, ...]:
+        elapsed = point[0] - stored[0]
+        if elapsed <= 0:
+            # The points are received in time order, so there is no snapshot since the stored
+            # point: the new one is either represented by it or stored as a step
+            if abs(point[1] - stored[1]) <= deviation:
+                return ()
+            self._stored = point
+            return (point,)
+        upper = (point[1] + deviation - stored[1]) / elapsed
+        lower = (point[1] - deviation - stored[1]) / elapsed
+        snapshot = self._snapshot
+        if snapshot is None:
+            self._upper, self._lower = upper, lower
+            self._snapshot = point
+            return ()
+        if max(self._lower, lower) <= min(self._upper, upper):
+            self._upper = min(self._upper, upper)
+            self._lower = max(self._lower, lower)
+            self._snapshot = point
+            return ()
+
+        # The doors opened: store the last point that fitted, and start again from it
+        archived = self._door_point(stored, snapshot)
+        self._stored = archived
+        self._snapshot = None
+        return (archived, *self._swinging_door_update(point, archived, deviation))
+
+    def _door_point(self, stored: _Point, snapshot: _Point) -> _Point:
+        """
+        Get the point to store at the time of the snapshot with the swinging door compression.
+
+        Its value is the one closest to the snapshot among the ones of the lines from the stored
+        point that are within the deviation of all the points since it, so the points between
+        both are within the deviation of the stored series. If none of these lines ends within
+        the range of the values, it's the value of the snapshot.
+
+        """
+        elapsed = snapshot[0] - stored[0]
+        low = max(stored[1] + self._lower * elapsed, 0)
+        high = min(stored[1] + self._upper * elapsed, _MAX_VALUE)
+        if low > high:
+            return snapshot
+        return snapshot[0], round(min(max(snapshot[1], low), high))
+
+    def flush(self) -> _Point | None:
+        """Get the last point received if it wasn't stored, so the series reaches it."""
+        snapshot = self._snapshot
+        stored = self._stored
+        if snapshot is None or stored is None:
+            return None
+        if self._deviation is not None:
+            snapshot = self._door_point(stored, snapshot)
+        self._stored = snapshot
+        self._snapshot = None
+        return snapshot
+
+
+class _SegmentWriter:
+    """Append-only segment file of a series, mapped in memory."""
+
+    def __init__(self, path: Path, first_ns: int, capacity: int) -> None:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            os.ftruncate(fd, _HEADER.size + capacity * _RECORD.size)
+            self._mmap = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+        self.path = path
+        self.first_ns = first_ns
+        self._last_ns = first_ns
+        self._count = 0
+        self._capacity = capacity
+        self._write_header()
+
+    def _write_header(self) -> None:
+        _HEADER.pack_into(
+            self._mmap,
+            0,
+            _MAGIC,
+            _FORMAT_VERSION,
+            self.first_ns,
+            self._last_ns,
+            self._count,
+            self._capacity,
+        )
+
+    def append(self, point: _Point) -> bool:
+        """Append a point, returning False if it doesn't fit in the segment."""
+        if self._count and point[0] < self._last_ns:
+            msg = "The points of a segment must be appended in time order"
+            raise ValueError(msg)
+        if self._count == self._capacity:
+            return False
+        delta = (point[0] - self._last_ns) // 1000 if self._count else 0
+        if delta > _MAX_DELTA_US:
+            return False
+        _RECORD.pack_into(self._mmap, _HEADER.size + self._count * _RECORD.size, delta, point[1])
+        self._last_ns += delta * 1000
+        self._count += 1
+        self._write_header()
+        return True
+
+    def flush(self) -> None:
+        """Write the changes of the mapping to the file."""
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """Unmap the segment."""
+        self._mmap.close()
+
+
+class _Series:
+    """Stored points of a pin, split in segment files indexed by their first timestamp."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.compressor: _Compressor | None = None
+        self.writer: _SegmentWriter | None = None
+        self.starts: list[int] = []
+        # Timestamp of the last point received, the next ones can't be older
+        self.last_ns = -(2**63)
+        if directory.is_dir():
+            self.starts = sorted(
+                int(path.stem)
+                for path in directory.glob(f"*{_SEGMENT_SUFFIX}")
+                if path.stem.isdigit()
+            )
+        if self.starts:
+            self.last_ns = _segment_last_ns(self.segment_path(self.starts[-1]))
+
+    def segment_path(self, first_ns: int) -> Path:
+        return self.directory / f"{first_ns:020d}{_SEGMENT_SUFFIX}"
+
+    def check_order(self, timestamp_ns: int) -> None:
+        """Check that a point isn't older than the last one received."""
+        if timestamp_ns < self.last_ns:
+            msg = (
+                f"The timestamp {timestamp_ns} is older than the last one of the series of "
+                f"{self.directory.name} ({self.last_ns})"
+            )
+            raise ValueError(msg)
+
+
+def _segment_last_ns(path: Path) -> int:
+    """Get the timestamp of the last record of a segment file."""
+    with path.open("rb") as file:
+        magic, format_version, _, last_ns, _, _ = _HEADER.unpack(file.read(_HEADER.size))
+    if magic != _MAGIC or format_version != _FORMAT_VERSION:
+        msg = f"{path} isn't a historian segment"
+        raise ValueError(msg)
+    return int(last_ns)
+
+
+def _read_segment(
+    path: Path, start_ns: int, end_ns: int, timestamps: array[int], values: array[int]
+) -> None:
+    """Append the points of a segment file within a time range to two arrays."""
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, format_version, first_ns, last_ns, count, _ = _HEADER.unpack_from(data)
+        if magic != _MAGIC or format_version != _FORMAT_VERSION:
+            msg = f"{path} isn't a historian segment"
+            raise ValueError(msg)
+        if last_ns < start_ns or first_ns > end_ns:
+            return
+        timestamp = first_ns
+        for delta, value in _RECORD.iter_unpack(
+            data[_HEADER.size : _HEADER.size + count * _RECORD.size]
+        ):
+            timestamp += delta * 1000
+            if timestamp > end_ns:
+                return
+            if timestamp >= start_ns:
+                timestamps.append(timestamp)
+                values.append(value)
+
+
+class Historian:
+    """
+    Local historian of the values of the pins, stored in memory-mapped files.
+
+    Each pin of the initialized model can have a series, with its own compression: a deadband (a
+    value is stored when it differs from the last stored one by more than the deadband) or the
+    swinging door algorithm (a value is stored when the values since the last stored one can't be
+    all approximated by a line from it within a deviation). The samples can be recorded one by one
+    or in blocks from rpiplc.stream().
+
+    The timestamps are stored as wall-clock time (time.time_ns()), so the series keep their order
+    across reboots. The monotonic timestamps of the blocks of rpiplc.stream() are converted with
+    the offset between both clocks measured when the historian is opened. The values of a series
+    must be recorded in time order: a value older than the last one of its series (stored or
+    received, for example after the wall clock steps back) is rejected with ValueError.
+
+    The series of each pin are stored in a directory named after the pin, in append-only segment
+    files of a fixed number of records. Each record has the time since the previous one (in
+    microseconds) and the value, and the segment header has the timestamps of its first and last
+    records. The segments are named after their first timestamp, which is the index used to find
+    the segments of a time range without reading the rest of them.
+
+    The stored points are written to the files by the kernel, or right away with flush(). The
+    last value received of each series is only stored when it's needed by the compression, or by
+    flush() and close().
+
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        plc: RPIPLCClass | None = None,
+        segment_records: int = DEFAULT_SEGMENT_RECORDS,
+    ) -> None:
+        """
+        Open the historian in a directory, creating it if needed.
+
+        Args:
+            directory (str | os.PathLike[str]): The directory of the historian.
+            plc (RPIPLCClass | None): The rpiplc instance whose mapping has the pin names, or None
+                                      to use the rpiplc singleton (default is None).
+            segment_records (int): The number of records of each segment file (default is
+                                   DEFAULT_SEGMENT_RECORDS).
+
+        Raises:
+            ValueError: If segment_records is smaller than 1.
+
+        """
+        if plc is None:
+            from . import rpiplc  # noqa: PLC0415
+
+            plc = rpiplc
+        if segment_records < 1:
+            msg = "segment_records must be at least 1"
+            raise ValueError(msg)
+        self._plc = plc
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._segment_records = segment_records
+        self._clock_offset = time.time_ns() - time.monotonic_ns()
+        self._series: dict[str, _Series] = {
+            path.name: _Series(path) for path in self._directory.iterdir() if path.is_dir()
+        }
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Historian:  # noqa: PYI034
+        """Use the historian in a "with" block, closing it when exiting the block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the historian, see close()."""
+        self.close()
+
+    @property
+    def series_names(self) -> tuple[str, ...]:
+        """The names of the pins with a series, recording or stored in the directory."""
+        return tuple(sorted(self._series))
+
+    def add_series(
+        self, pin_name: str, *, deadband: int = 0, deviation: float | None = None
+    ) -> None:
+        """
+        Start recording a pin, or change its compression.
+
+        Args:
+            pin_name (str): The name of the pin in the mapping of the initialized model.
+            deadband (int): The change of value needed to store a new value, when there is no
+                            deviation (default is 0, store every change).
+            deviation (float | None): The deviation of the swinging door compression, or None to
+                                      use the deadband (default is None).
+
+        Raises:
+            UnknownPinError: If the pin doesn't exist in the initialized model.
+
+        """
+        self._plc.mapping_index.resolve(pin_name)
+        with self._lock:
+            series = self._series.get(pin_name)
+            if series is None:
+                series = _Series(self._directory / pin_name)
+                self._series[pin_name] = series
+            elif series.compressor is not None:
+                self._store(series, series.compressor.flush())
+            series.directory.mkdir(exist_ok=True)
+            series.compressor = _Compressor(deadband, deviation)
+
+    def record(self, pin_name: str, value: int, timestamp_ns: int | None = None) -> None:
+        """
+        Record a value of a pin.
+
+        Args:
+            pin_name (str): The name of the pin, which must have a series.
+            value (int): The value, between 0 and 65535.
+            timestamp_ns (int | None): The wall-clock time of the value, as returned by
+                                       time.time_ns(), or None to use the current one (default
+                                       is None).
+
+        Raises:
+            UnknownPinError: If the pin isn't being recorded.
+            ValueError: If the value is out of range or the timestamp is older than the last one
+                        of the series.
+
+        """
+        value = int(value)
+        if not 0 <= value <= _MAX_VALUE:
+            msg = f"The value of {pin_name} must be between 0 and {_MAX_VALUE}"
+            raise ValueError(msg)
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        with self._lock:
+            series = self._series.get(pin_name)
+            if series is None or series.compressor is None:
+                raise UnknownPinError(pin_name)
+            series.check_order(timestamp_ns)
+            series.last_ns = timestamp_ns
+            for point in series.compressor.update((timestamp_ns, value)):
+                self._store(series, point)
+
+    def record_block(self, block: SampleBlock) -> None:
+        """
+        Record the samples of a block of rpiplc.stream() of the pins with a series.
+
+        The time.monotonic_ns() timestamps of the block are converted to wall-clock time.
+
+        Args:
+            block (SampleBlock): The block of samples.
+
+        Raises:
+            ValueError: If the block starts before the last value of any of its series, in which
+                        case nothing of it is recorded.
+
+        """
+        samples: Any = block.samples
+        if hasattr(samples, "reshape"):
+            samples = samples.reshape(-1)
+        columns = len(block.pin_names)
+        clock_offset = self._clock_offset
+        with self._lock:
+            recorded = [
+                (column, self._series[pin_name])
+                for column, pin_name in enumerate(block.pin_names)
+                if pin_name in self._series and self._series[pin_name].compressor is not None
+            ]
+            if not recorded or not len(block.timestamps):
+                return
+            # The timestamps of a block are monotonic, so only its first one needs to be checked
+            first_ns = int(block.timestamps[0]) + clock_offset
+            for _, series in recorded:
+                series.check_order(first_ns)
+            last_ns = int(block.timestamps[-1]) + clock_offset
+            for _, series in recorded:
+                series.last_ns = last_ns
+            for row, timestamp_ns in enumerate(block.timestamps):
+                base = row * columns
+                for column, series in recorded:
+                    compressor = series.compressor
+                    if compressor is not None:
+                        point = (int(timestamp_ns) + clock_offset, int(samples[base + column]))
+                        for stored in compressor.update(point):
+                            self._store(series, stored)
+
+    def _store(self, series: _Series, point: _Point | None) -> None:
+        """Append a point to the segment being written of a series, starting a new one if full."""
+        if point is None:
+            return
+        if series.writer is not None and series.writer.append(point):
+            return
+        if series.writer is not None:
+            series.writer.close()
+        first_ns = point[0]
+        while series.segment_path(first_ns).exists():
+            first_ns += 1
+        series.writer = _SegmentWriter(
+            series.segment_path(first_ns), first_ns, self._segment_records
+        )
+        insort(series.starts, first_ns)
+        series.writer.append((first_ns, point[1]))
+
+    def flush(self) -> None:
+        """Store the last value received of every series and write the segments to the files."""
+        with self._lock:
+            for series in self._series.values():
+                if series.compressor is not None:
+                    self._store(series, series.compressor.flush())
+                if series.writer is not None:
+                    series.writer.flush()
+
+    def close(self) -> None:
+        """Flush the historian and close its segment files."""
+        self.flush()
+        with self._lock:
+            for series in self._series.values():
+                if series.writer is not None:
+                    series.writer.close()
+                    series.writer = None
+                series.compressor = None
+
+    def query(
+        self, pin_name: str, start_ns: int = 0, end_ns: int = 2**63 - 1
+    ) -> tuple[array[int], array[int]]:
+        """
+        Get the stored values of a pin within a time range.
+
+        Only the stored values are returned: with a deadband each value holds until the next one,
+        and with the swinging door compression the values between two stored ones are on the line
+        that joins them.
+
+        Args:
+            pin_name (str): The name of the pin.
+            start_ns (int): The start of the range as a time.time_ns() value, included (default
+                            is the beginning).
+            end_ns (int): The end of the range as a time.time_ns() value, included (default is
+                          the end).
+
+        Returns:
+            tuple[array[int], array[int]]: The timestamps of the values (in an array("q")) and the
+                                           values (in an array("H")).
+
+        Raises:
+            UnknownPinError: If the pin doesn't have a series.
+
+        """
+        timestamps = array("q")
+        values = array("H")
+        with self._lock:
+            series = self._series.get(pin_name)
+            if series is None:
+                raise UnknownPinError(pin_name)
+            starts = series.starts
+            first = max(bisect_right(starts, start_ns) - 1, 0)
+            for segment_start in starts[first:]:
+                if segment_start > end_ns:
+                    break
+                _read_segment(
+                    series.segment_path(segment_start), start_ns, end_ns, timestamps, values
+                )
+        return timestamps, values
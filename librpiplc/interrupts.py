@@ -0,0 +1,512 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import fcntl
+import logging
+import os
+import select
+import struct
+import threading
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple
+
+from .exceptions import UnknownPinError, UnknownPLCConfError
+from .lib_types import PeripheralType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from . import RPIPLCClass
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_GPIO_CHIP = "/dev/gpiochip0"
+DEFAULT_I2C_BUS = "/dev/i2c-1"
+
+# Names of the interrupt lines of the I/O expanders in the mappings, in order of preference
+INTERRUPT_PINS = ("INT31", "EXP_INT", "EXP1_INT")
+
+# GPIO character device ABI v1 (linux/gpio.h): struct gpioevent_request and struct gpioevent_data
+_EVENT_REQUEST = struct.Struct("<III32si")
+_EVENT_DATA = struct.Struct("<QI4x")
+_GPIO_GET_LINEEVENT_IOCTL = 0xC0000000 | (_EVENT_REQUEST.size << 16) | (0xB4 << 8) | 0x04
+_GPIOHANDLE_REQUEST_INPUT = 1 << 0
+_GPIOEVENT_REQUEST_RISING_EDGE = 1 << 0
+_GPIOEVENT_REQUEST_FALLING_EDGE = 1 << 1
+_MAX_EVENTS = 16
+
+# I2C character device (linux/i2c-dev.h): combined transfers of several messages
+_I2C_RDWR = 0x0707
+_I2C_M_RD = 0x0001
+
+
+class _ExpanderRegisters(NamedTuple):
+    """Addresses of the interrupt registers of an I/O expander (with IOCON.BANK = 0)."""
+
+    gpinten: int
+    intcon: int
+    iocon: int
+    # INTF is followed by INTCAP and GPIO, so the three of them are read in a single transfer
+    intf: int
+    width: int
+    iocon_bits: int
+
+
+_EXPANDER_REGISTERS = {
+    PeripheralType.PLC_MCP23008: _ExpanderRegisters(0x02, 0x04, 0x05, 0x07, 1, 0x00),
+    # IOCON.MIRROR connects the interrupts of both ports to both INT outputs
+    PeripheralType.PLC_MCP23017: _ExpanderRegisters(0x04, 0x08, 0x0A, 0x0E, 2, 0x40),
+}
+
+
+class _I2CMessage(ctypes.Structure):
+    _fields_: ClassVar[list[tuple[str, Any]]] = [
+        ("addr", ctypes.c_uint16),
+        ("flags", ctypes.c_uint16),
+        ("len", ctypes.c_uint16),
+        ("buf", ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+
+class _I2CTransfer(ctypes.Structure):
+    _fields_: ClassVar[list[tuple[str, Any]]] = [
+        ("msgs", ctypes.POINTER(_I2CMessage)),
+        ("nmsgs", ctypes.c_uint32),
+    ]
+
+
+class _I2CBus:
+    """Access to the registers of the I/O expanders through the I2C character device."""
+
+    def __init__(self, path: str) -> None:
+        self._fd = os.open(path, os.O_RDWR | os.O_CLOEXEC)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def _transfer(self, *messages: tuple[int, int, ctypes.Array[ctypes.c_uint8]]) -> None:
+        msgs = (_I2CMessage * len(messages))()
+        for msg, (addr, flags, buffer) in zip(msgs, messages):
+            msg.addr = addr
+            msg.flags = flags
+            msg.len = len(buffer)
+            msg.buf = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_uint8))
+        fcntl.ioctl(self._fd, _I2C_RDWR, _I2CTransfer(msgs, len(messages)))
+
+    def read(self, addr: int, register: int, size: int) -> bytes:
+        """Read consecutive registers, with a repeated start after writing the first address."""
+        pointer = (ctypes.c_uint8 * 1)(register)
+        data = (ctypes.c_uint8 * size)()
+        self._transfer((addr, 0, pointer), (addr, _I2C_M_RD, data))
+        return bytes(data)
+
+    def write(self, addr: int, register: int, data: bytes) -> None:
+        """Write consecutive registers."""
+        self._transfer((addr, 0, (ctypes.c_uint8 * (len(data) + 1))(register, *data)))
+
+
+class _Expander:
+    """Subscribed pins of an I/O expander, by their bit in its registers."""
+
+    def __init__(self, addr: int, registers: _ExpanderRegisters) -> None:
+        self.addr = addr
+        self.registers = registers
+        self.pins: dict[int, str] = {}
+
+    @property
+    def mask(self) -> int:
+        mask = 0
+        for bit in self.pins:
+            mask |= 1 << bit
+        return mask
+
+
+def request_edge_events(chip: str, line: int, *, active_low: bool = True) -> int:
+    """
+    Request the edge events of a GPIO line through the GPIO character device.
+
+    Args:
+        chip (str): The path of the GPIO chip, like /dev/gpiochip0.
+        line (int): The offset of the line in the chip.
+        active_low (bool): Whether to request the falling edges (True) or the rising edges (False)
+                           of the line (default is True).
+
+    Returns:
+        int: The file descriptor to read the events from, which must be closed by the caller.
+
+    Raises:
+        OSError: If the chip can't be opened or the line can't be requested (for example, because
+                 another process is using it).
+
+    """
+    edge = _GPIOEVENT_REQUEST_FALLING_EDGE if active_low else _GPIOEVENT_REQUEST_RISING_EDGE
+    request = bytearray(
+        _EVENT_REQUEST.pack(line, _GPIOHANDLE_REQUEST_INPUT, edge, b"python3-librpiplc", 0)
+    )
+    chip_fd = os.open(chip, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        fcntl.ioctl(chip_fd, _GPIO_GET_LINEEVENT_IOCTL, request)
+    finally:
+        os.close(chip_fd)
+    return int(_EVENT_REQUEST.unpack(request)[4])
+
+
+class InputNotifier:
+    """
+    Notifier of the changes of input pins, driven by the interrupt line of the I/O expanders.
+
+    Only the pins of the MCP23008 and MCP23017 expanders can be subscribed, since the other ones
+    never assert the interrupt line (use an EdgePoller for them). While it's running, the notifier
+    enables the interrupt-on-change of the subscribed pins in their expanders (the GPINTEN and
+    INTCON registers, and IOCON.MIRROR on the MCP23017) through the I2C character device, and it
+    disables it when stopped.
+
+    A worker thread waits for the edges of the interrupt line (INT31 on RPIPLC, EXP_INT on
+    GateBerry) through the GPIO character device of the kernel, so it doesn't use any CPU or I2C
+    traffic while the inputs don't change. On every interrupt it reads the INTF, INTCAP and GPIO
+    registers of each expander with subscribed pins in a single transfer, which also clears the
+    interrupt, skips the expanders that didn't interrupt and calls the callbacks of the pins whose
+    value changed. The value captured at the interrupt is reported too, so a pulse that already
+    ended isn't missed. An optional timeout reads the pins even without interrupts, to recover from
+    any missed edge. The exceptions raised by a callback are logged and don't stop the notifier
+    nor the other callbacks.
+
+    It needs librpiplc >= 4.X.X, which tells the expander of each pin.
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        plc: RPIPLCClass | None = None,
+        *,
+        interrupt_pin: str | None = None,
+        chip: str = DEFAULT_GPIO_CHIP,
+        i2c_bus: str = DEFAULT_I2C_BUS,
+        active_low: bool = True,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Initialize the notifier, without starting its worker thread.
+
+        Args:
+            plc (RPIPLCClass | None): The rpiplc instance to use, or None to use the rpiplc
+                                      singleton (default is None).
+            interrupt_pin (str | None): The name of the interrupt line in the mapping, or None to
+                                        use the first one of INTERRUPT_PINS in the initialized
+                                        model (default is None).
+            chip (str): The path of the GPIO chip of the direct GPIOs (default is
+                        /dev/gpiochip0).
+            i2c_bus (str): The path of the I2C bus of the expanders (default is /dev/i2c-1).
+            active_low (bool): Whether the interrupt line is active low, so the falling edges are
+                               the interrupts (default is True, like the INT output of the
+                               expanders after a reset).
+            timeout (float | None): Seconds without interrupts after which the pins are read
+                                    anyway, or None to only read them on interrupts (default is
+                                    None).
+
+        Raises:
+            UnknownPLCConfError: If the initialized model doesn't have a direct GPIO interrupt
+                                 line.
+
+        """
+        if plc is None:
+            from . import rpiplc  # noqa: PLC0415
+
+            plc = rpiplc
+        self._plc = plc
+        self._bus_lock = plc._locks.bus  # noqa: SLF001
+        self._line = self._interrupt_line(interrupt_pin)
+        self._chip = chip
+        self._i2c_bus = i2c_bus
+        self._active_low = active_low
+        self._timeout = timeout
+        self._subscriptions: dict[Callable[[str, int], object], frozenset[str]] = {}
+        self._values: dict[str, int] = {}
+        self._expanders: dict[int, _Expander] = {}
+        self._i2c: _I2CBus | None = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop_fds: tuple[int, int] | None = None
+        self.interrupts = 0
+
+    def _interrupt_line(self, interrupt_pin: str | None) -> int:
+        """Get the GPIO number of the interrupt line."""
+        index = self._plc.mapping_index
+        for pin_name in (interrupt_pin,) if interrupt_pin is not None else INTERRUPT_PINS:
+            try:
+                _, peripheral_type, _, line = index.resolve(pin_name)
+            except UnknownPinError:
+                continue
+            if peripheral_type is PeripheralType.PLC_DIRECT:
+                return line
+        error_str = "The initialized model doesn't have an interrupt line on a direct GPIO"
+        raise UnknownPLCConfError(error_str)
+
+    def __enter__(self) -> InputNotifier:  # noqa: PYI034
+        """Start the notifier when entering a "with" block, and stop it when exiting it."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the notifier, see stop()."""
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is running or not."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(
+        self, pin_names: Iterable[str], callback: Callable[[str, int], object]
+    ) -> Callable[[str, int], object]:
+        """
+        Call a function every time any of some pins changes.
+
+        The current values of the pins are read right away, without calling the function. It
+        returns the function, so it can be used to unsubscribe it.
+
+        Args:
+            pin_names (Iterable[str]): The names of the pins to watch, on I/O expanders.
+            callback (Callable[[str, int], object]): Function called from the worker thread with
+                                                     the name and the new value of a pin every
+                                                     time it changes.
+
+        Returns:
+            Callable[[str, int], object]: The same function.
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model.
+            ValueError: If any pin isn't on an MCP23008 or MCP23017 expander.
+
+        """
+        pin_names = frozenset(pin_names)
+        located = {pin_name: self._locate(pin_name) for pin_name in pin_names}
+        with self._lock:
+            new_pins = pin_names.difference(self._values)
+            if new_pins:
+                self._values.update(self._read(new_pins))
+            for pin_name, (addr, bit, registers) in located.items():
+                expander = self._expanders.setdefault(addr, _Expander(addr, registers))
+                expander.pins[bit] = pin_name
+            self._subscriptions[callback] = self._subscriptions.get(callback, frozenset()).union(
+                pin_names
+            )
+            if self._i2c is not None:
+                self._configure(self._i2c)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[str, int], object]) -> None:
+        """
+        Stop calling a subscribed function.
+
+        Args:
+            callback (Callable[[str, int], object]): The function to unsubscribe.
+
+        Raises:
+            KeyError: If the function isn't subscribed.
+
+        """
+        with self._lock:
+            del self._subscriptions[callback]
+            watched = frozenset().union(*self._subscriptions.values())
+            for pin_name in set(self._values).difference(watched):
+                del self._values[pin_name]
+            for expander in self._expanders.values():
+                expander.pins = {
+                    bit: pin_name for bit, pin_name in expander.pins.items() if pin_name in watched
+                }
+            if self._i2c is not None:
+                self._configure(self._i2c)
+            self._expanders = {
+                addr: expander for addr, expander in self._expanders.items() if expander.pins
+            }
+
+    def _locate(self, pin_name: str) -> tuple[int, int, _ExpanderRegisters]:
+        """Get the address of the expander of a pin, its bit and the registers of the expander."""
+        _, peripheral_type, addr, index = self._plc.mapping_index.resolve(pin_name)
+        registers = _EXPANDER_REGISTERS.get(peripheral_type) if peripheral_type else None
+        if registers is None:
+            msg = f"{pin_name} isn't on an I/O expander, watch it with an EdgePoller instead"
+            raise ValueError(msg)
+        return addr, index, registers
+
+    def _configure(self, i2c: _I2CBus) -> None:
+        """Enable the interrupt-on-change of the subscribed pins of each expander, and only them."""
+        with self._bus_lock:
+            for expander in self._expanders.values():
+                registers = expander.registers
+                if registers.iocon_bits:
+                    iocon = i2c.read(expander.addr, registers.iocon, 1)[0]
+                    if iocon & registers.iocon_bits != registers.iocon_bits:
+                        i2c.write(
+                            expander.addr, registers.iocon, bytes((iocon | registers.iocon_bits,))
+                        )
+                # INTCON = 0 compares every pin with its previous value, so any change interrupts
+                i2c.write(expander.addr, registers.intcon, bytes(registers.width))
+                i2c.write(
+                    expander.addr,
+                    registers.gpinten,
+                    expander.mask.to_bytes(registers.width, "little"),
+                )
+
+    def start(self) -> None:
+        """
+        Enable the interrupts, request the interrupt line and start the worker thread.
+
+        It does nothing if the worker thread is already running. The subscribed pins are read
+        after enabling the interrupts, which clears any interrupt that was already pending.
+
+        Raises:
+            OSError: If the I2C bus can't be opened or the interrupt line can't be requested.
+
+        """
+        if self.running:
+            return
+        i2c = _I2CBus(self._i2c_bus)
+        try:
+            event_fd = request_edge_events(self._chip, self._line, active_low=self._active_low)
+            try:
+                with self._lock:
+                    self._configure(i2c)
+                    self._i2c = i2c
+            except BaseException:
+                os.close(event_fd)
+                raise
+        except BaseException:
+            i2c.close()
+            raise
+        self.poll()
+        self._stop_fds = os.pipe()
+        self._thread = threading.Thread(
+            target=self._run, args=(event_fd, self._stop_fds[0]), name="rpiplc-int", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker thread, release the interrupt line and disable the interrupts."""
+        if self._thread is None or self._stop_fds is None:
+            return
+        os.write(self._stop_fds[1], b"\0")
+        self._thread.join()
+        for fd in self._stop_fds:
+            os.close(fd)
+        self._thread = None
+        self._stop_fds = None
+        with self._lock:
+            i2c, self._i2c = self._i2c, None
+            if i2c is not None:
+                try:
+                    with self._bus_lock:
+                        for expander in self._expanders.values():
+                            registers = expander.registers
+                            i2c.write(expander.addr, registers.gpinten, bytes(registers.width))
+                finally:
+                    i2c.close()
+
+    def poll(self) -> None:
+        """Read all the subscribed pins and call the callbacks of the ones that changed."""
+        with self._lock:
+            values = self._read(self._values)
+            changed = [
+                (pin_name, value)
+                for pin_name, value in values.items()
+                if self._values[pin_name] != value
+            ]
+            self._values.update(changed)
+            subscriptions = list(self._subscriptions.items())
+        _notify(changed, subscriptions)
+
+    def _service(self) -> None:
+        """Read the expanders that interrupted and call the callbacks of the pins that changed."""
+        changed: list[tuple[str, int]] = []
+        with self._lock:
+            i2c = self._i2c
+            if i2c is None:
+                return
+            for expander in self._expanders.values():
+                registers = expander.registers
+                with self._bus_lock:
+                    block = i2c.read(expander.addr, registers.intf, 3 * registers.width)
+                changed += self._changes(expander, block)
+            subscriptions = list(self._subscriptions.items())
+        if changed:
+            self._plc.invalidate_read_cache({pin_name for pin_name, _ in changed})
+        _notify(changed, subscriptions)
+
+    def _changes(self, expander: _Expander, block: bytes) -> list[tuple[str, int]]:
+        """Get the changes of the pins of an expander from its INTF, INTCAP and GPIO registers."""
+        width = expander.registers.width
+        flags = int.from_bytes(block[:width], "little")
+        if not flags & expander.mask:
+            return []
+        captured = int.from_bytes(block[width : 2 * width], "little")
+        current = int.from_bytes(block[2 * width :], "little")
+        changed: list[tuple[str, int]] = []
+        for bit, pin_name in expander.pins.items():
+            values = [(current >> bit) & 1]
+            if (flags >> bit) & 1:
+                values.insert(0, (captured >> bit) & 1)
+            for value in values:
+                if self._values[pin_name] != value:
+                    self._values[pin_name] = value
+                    changed.append((pin_name, value))
+        return changed
+
+    def _read(self, pin_names: Iterable[str]) -> dict[str, int]:
+        """Read some pins in bulk, bypassing the read cache."""
+        pin_names = list(pin_names)
+        self._plc.invalidate_read_cache(pin_names)
+        return {
+            pin_name: 1 if value > 0 else 0
+            for pin_name, value in self._plc.digital_read_many(pin_names).items()
+        }
+
+    def _run(self, event_fd: int, stop_fd: int) -> None:
+        """Wait for interrupts and read the pins until stop() is called."""
+        try:
+            while True:
+                ready = select.select([event_fd, stop_fd], [], [], self._timeout)[0]
+                if stop_fd in ready:
+                    return
+                if event_fd in ready:
+                    os.read(event_fd, _EVENT_DATA.size * _MAX_EVENTS)
+                    self.interrupts += 1
+                    self._service()
+                else:
+                    self.poll()
+        finally:
+            os.close(event_fd)
+
+
+def _notify(
+    changed: list[tuple[str, int]],
+    subscriptions: list[tuple[Callable[[str, int], object], frozenset[str]]],
+) -> None:
+    """Call the callbacks subscribed to the pins that changed."""
+    for pin_name, value in changed:
+        for callback, pin_names in subscriptions:
+            if pin_name in pin_names:
+                try:
+                    callback(pin_name, value)
+                except Exception:
+                    _LOGGER.exception(
+                        "Input change callback %r failed with %s = %d", callback, pin_name, value
+                    )
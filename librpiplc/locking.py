@@ -0,0 +1,96 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import AbstractContextManager, nullcontext
+
+from .lib_types import PeripheralType
+
+_DIRECT = PeripheralType.PLC_DIRECT.value
+
+NO_LOCK: AbstractContextManager[None] = nullcontext()
+
+
+class DeviceLocks:
+    """
+    Locks of the physical devices behind the pin identifiers.
+
+    Every device has its own reentrant lock, which must be held while calling the C library for
+    any of its pins and while updating what is remembered about it (like the values written to the
+    PCA9685 channels). A read-modify-write of an I/O expander holds it during the whole sequence.
+    Each direct GPIO is a device on its own, and each I2C peripheral is identified by its type and
+    address.
+
+    The C library selects the slave address of the shared I2C bus before every transfer, so the
+    calls to any I2C peripheral must also hold the bus lock (always after the device lock). The
+    direct GPIOs don't use it, so they never wait on I2C traffic.
+
+    The pin identifiers of older versions of librpiplc (<4.X.X) can't be split into devices, so
+    all their pins share a single device that uses the bus lock.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the locks, without any device lock until it's needed."""
+        self.bus = threading.Lock()
+        self.old_library = False
+        self._devices: dict[int, threading.RLock] = {}
+        self._devices_lock = threading.Lock()
+
+    def device(self, pin: int) -> threading.RLock:
+        """
+        Get the lock of the device of a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+
+        Returns:
+            threading.RLock: The reentrant lock of the device.
+
+        """
+        if self.old_library:
+            key = -1
+        elif (pin >> 24) & 0xFF == _DIRECT:
+            key = pin
+        else:
+            key = pin & 0xFFFF0000
+        lock = self._devices.get(key)
+        if lock is None:
+            with self._devices_lock:
+                lock = self._devices.setdefault(key, threading.RLock())
+        return lock
+
+    def bus_for(self, pin: int) -> AbstractContextManager[None] | threading.Lock:
+        """
+        Get the bus lock if the calls for a pin identifier need it.
+
+        Args:
+            pin (int): The pin identifier.
+
+        Returns:
+            AbstractContextManager[None] | threading.Lock: The bus lock for I2C peripherals, or a
+                                                           context manager that does nothing for
+                                                           direct GPIOs.
+
+        """
+        if not self.old_library and (pin >> 24) & 0xFF == _DIRECT:
+            return NO_LOCK
+        return self.bus
@@ -17,9 +17,25 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
+from __future__ import annotations
+
+import re
+from array import array
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
 from .exceptions import UnknownPinError
 from .lib_types import PeripheralType
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Slot of the pin names that don't belong to a model
+_NO_SLOT = 0xFFFF
+
+# I/O pin names (I0.0, Q0.0, A0.0, R0.1, I0...), where the first letter is their direction
+_IO_PIN_NAME = re.compile(r"^([IQAR])\d")
+
 
 class PLCMappingDict(dict[str, int]):
     """
@@ -50,6 +66,278 @@ class PLCMappingDict(dict[str, int]):
         raise UnknownPinError(key)
 
 
+class PLCPinTable:
+    """
+    Compact storage of the pins of all the models of a PLC version.
+
+    The pins are grouped in families (the pins of each board, the extra pins...) that are combined
+    to build the mapping of each model. Every pin name is stored only once, the pin identifiers of
+    all the families are kept in a single array, and each model only stores a vector with the
+    position of its pins in that array.
+    """
+
+    def __init__(self, **families: dict[str, int]) -> None:
+        """
+        Initialize the table with the pins of each family.
+
+        Args:
+            families (dict[str, int]): The pins of each family, with the family name as keyword.
+
+        """
+        self._names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+        self._pins = array("I")
+        self._families: dict[str, tuple[int, array[int]]] = {}
+        for family_name, family in families.items():
+            start = len(self._pins)
+            name_ids = array("H")
+            for pin_name, pin in family.items():
+                name_id = self._name_ids.get(pin_name)
+                if name_id is None:
+                    name_id = self._name_ids[pin_name] = len(self._names)
+                    self._names.append(pin_name)
+                name_ids.append(name_id)
+                self._pins.append(pin)
+            self._families[family_name] = (start, name_ids)
+
+    def model(self, *family_names: str) -> CompactPLCMapping:
+        """
+        Build the mapping of a model combining several families.
+
+        The families are combined as if their dictionaries were merged in order, so if a pin
+        name appears in more than one family, the last one wins.
+
+        Args:
+            family_names (str): The names of the families of the model.
+
+        Returns:
+            CompactPLCMapping: The mapping of the model.
+
+        """
+        slots = array("H", [_NO_SLOT]) * len(self._names)
+        order = array("H")
+        for family_name in family_names:
+            start, name_ids = self._families[family_name]
+            for offset, name_id in enumerate(name_ids):
+                if slots[name_id] == _NO_SLOT:
+                    order.append(name_id)
+                slots[name_id] = start + offset
+        return CompactPLCMapping(self._names, self._name_ids, self._pins, slots, order)
+
+
+class CompactPLCMapping(Mapping[str, int]):
+    """
+    A read-only mapping of pin names to their corresponding integer values.
+
+    It behaves like a PLCMappingDict that can't be modified, but it's built by a PLCPinTable and
+    shares its storage with the rest of the models of the same table.
+    """
+
+    __slots__ = ("_name_ids", "_names", "_order", "_pins", "_slots")
+
+    def __init__(
+        self,
+        names: list[str],
+        name_ids: dict[str, int],
+        pins: array[int],
+        slots: array[int],
+        order: array[int],
+    ) -> None:
+        """
+        Initialize the mapping, it shouldn't be called directly but through PLCPinTable.model().
+
+        Args:
+            names (list[str]): The pin names of the table.
+            name_ids (dict[str, int]): The position of each pin name of the table.
+            pins (array[int]): The pin identifiers of the table.
+            slots (array[int]): The position in pins of each pin name of the model.
+            order (array[int]): The position of the pin names of the model, in order.
+
+        """
+        self._names = names
+        self._name_ids = name_ids
+        self._pins = pins
+        self._slots = slots
+        self._order = order
+
+    def __getitem__(self, key: str) -> int:
+        """
+        Retrieve the integer value associated with the given pin name.
+
+        Args:
+            key (str): The name of the pin to retrieve.
+
+        Returns:
+            int: The integer value associated with the pin name.
+
+        Raises:
+            UnknownPinError: If the pin name does not exist in the mapping.
+
+        """
+        name_id = self._name_ids.get(key)
+        if name_id is not None:
+            slot = self._slots[name_id]
+            if slot != _NO_SLOT:
+                return self._pins[slot]
+        raise UnknownPinError(key)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if the pin name exists in the mapping."""
+        name_id = self._name_ids.get(key) if isinstance(key, str) else None
+        return name_id is not None and self._slots[name_id] != _NO_SLOT
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the pin names of the mapping."""
+        names = self._names
+        return (names[name_id] for name_id in self._order)
+
+    def __len__(self) -> int:
+        """Return the number of pins of the mapping."""
+        return len(self._order)
+
+    def __repr__(self) -> str:
+        """Return the representation of the mapping."""
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class PLCMappingIndex:
+    """
+    Reverse index of the pins of a mapping.
+
+    It groups the pins of a mapping by pin identifier (a pin can have several names, like A0.5 and
+    Q0.5, that share the same PCA9685 channel), by peripheral (its type and address) and by
+    direction (the first letter of the I/O pins: I, Q, A or R), so all of them can be looked up
+    without decoding the pin identifiers again.
+    """
+
+    def __init__(self, mapping: Mapping[str, int], *, old_library: bool = False) -> None:
+        """
+        Initialize the index with all the pins of a mapping.
+
+        Args:
+            mapping (Mapping[str, int]): The mapping to index.
+            old_library (bool): Whether the mapping is for older versions of librpiplc (<4.X.X),
+                                whose pin identifiers can't be decoded, so they don't belong to
+                                any peripheral (default is False).
+
+        """
+        self._mapping = mapping
+        self._decoded: dict[str, tuple[int, PeripheralType | None, int, int]] = {}
+        names_by_pin: dict[int, list[str]] = {}
+        names_by_peripheral: dict[tuple[PeripheralType, int], list[str]] = {}
+        names_by_direction: dict[str, list[str]] = {}
+        self._index_masks: dict[tuple[PeripheralType, int], int] = {}
+        for pin_name, pin in mapping.items():
+            peripheral_type, addr, index = (None, 0, pin) if old_library else split_pin(pin)
+            self._decoded[pin_name] = (pin, peripheral_type, addr, index)
+            names_by_pin.setdefault(pin, []).append(pin_name)
+            if peripheral_type is not None and peripheral_type is not PeripheralType.PLC_DIRECT:
+                key = (peripheral_type, addr)
+                names_by_peripheral.setdefault(key, []).append(pin_name)
+                self._index_masks[key] = self._index_masks.get(key, 0) | (1 << index)
+            match = _IO_PIN_NAME.match(pin_name)
+            if match is not None:
+                names_by_direction.setdefault(match.group(1), []).append(pin_name)
+
+        self._names_by_pin = {pin: tuple(names) for pin, names in names_by_pin.items()}
+        self._names_by_peripheral = {
+            key: tuple(names) for key, names in names_by_peripheral.items()
+        }
+        self._names_by_direction = {
+            direction: tuple(names) for direction, names in names_by_direction.items()
+        }
+
+    @property
+    def mapping(self) -> Mapping[str, int]:
+        """The indexed mapping."""
+        return self._mapping
+
+    def resolve(self, pin_name: str) -> tuple[int, PeripheralType | None, int, int]:
+        """
+        Get the pin identifier of a pin name, decoded like split_pin() does.
+
+        Args:
+            pin_name (str): The name of the pin.
+
+        Returns:
+            tuple[int, PeripheralType | None, int, int]: The pin identifier, its peripheral type,
+                                                         its address and its index.
+
+        Raises:
+            UnknownPinError: If the pin name does not exist in the mapping.
+
+        """
+        decoded = self._decoded.get(pin_name)
+        if decoded is None:
+            raise UnknownPinError(pin_name)
+        return decoded
+
+    def names(self, pin: int) -> tuple[str, ...]:
+        """
+        Get all the names of a pin identifier.
+
+        Args:
+            pin (int): The pin identifier.
+
+        Returns:
+            tuple[str, ...]: The names of the pin, empty if it doesn't belong to the mapping.
+
+        """
+        return self._names_by_pin.get(pin, ())
+
+    def peripherals(self) -> tuple[tuple[PeripheralType, int], ...]:
+        """
+        Get the peripherals used by the pins of the mapping, except the direct GPIOs.
+
+        Returns:
+            tuple[tuple[PeripheralType, int], ...]: The type and the address of each peripheral.
+
+        """
+        return tuple(self._names_by_peripheral)
+
+    def peripheral_pins(self, peripheral_type: PeripheralType, addr: int) -> tuple[str, ...]:
+        """
+        Get the names of the pins that belong to a peripheral.
+
+        Args:
+            peripheral_type (PeripheralType): The type of the peripheral.
+            addr (int): The address of the peripheral.
+
+        Returns:
+            tuple[str, ...]: The names of the pins of the peripheral.
+
+        """
+        return self._names_by_peripheral.get((peripheral_type, addr), ())
+
+    def peripheral_mask(self, peripheral_type: PeripheralType, addr: int) -> int:
+        """
+        Get the bitmask of the indexes of a peripheral used by the pins of the mapping.
+
+        Args:
+            peripheral_type (PeripheralType): The type of the peripheral.
+            addr (int): The address of the peripheral.
+
+        Returns:
+            int: The bitmask of the used indexes.
+
+        """
+        return self._index_masks.get((peripheral_type, addr), 0)
+
+    def direction_pins(self, direction: str) -> tuple[str, ...]:
+        """
+        Get the names of the I/O pins of a direction.
+
+        Args:
+            direction (str): The direction of the pins: "I" (inputs), "Q" (digital outputs), "A"
+                             (analog outputs) or "R" (relays).
+
+        Returns:
+            tuple[str, ...]: The names of the pins of the direction.
+
+        """
+        return self._names_by_direction.get(direction, ())
+
+
 def _make_pin_plc(peripheral_type: PeripheralType, byte2: int, byte3: int, byte4: int) -> int:
     """
     Construct a pin identifier for a peripheral according to the librpiplc specifications.
@@ -72,6 +360,31 @@ def _make_pin_plc(peripheral_type: PeripheralType, byte2: int, byte3: int, byte4
     )
 
 
+def split_pin(pin: int) -> tuple[PeripheralType | None, int, int]:
+    """
+    Split a pin identifier into its peripheral type, address and index.
+
+    This is the inverse of the make_pin_* functions. Direct GPIOs don't have an address, so it will
+    be 0 and the index will be the whole GPIO number.
+
+    Args:
+        pin (int): The pin identifier.
+
+    Returns:
+        tuple[PeripheralType | None, int, int]: The peripheral type (None if the identifier doesn't
+                                                belong to any known peripheral), the address and
+                                                the index of the pin.
+
+    """
+    try:
+        peripheral_type = PeripheralType((pin >> 24) & 0xFF)
+    except ValueError:
+        return None, (pin >> 16) & 0xFF, pin & 0xFF
+    if peripheral_type is PeripheralType.PLC_DIRECT:
+        return peripheral_type, 0, pin & 0xFFFFFF
+    return peripheral_type, (pin >> 16) & 0xFF, pin & 0xFF
+
+
 def make_pin_direct(index: int) -> int:
     """
     Create a pin identifier for a direct GPIO (also known as normal GPIO).
@@ -17,7 +17,7 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .mapping import PLCMappingDict
+from .mapping import PLCPinTable
 
 extras = {
     "DE_RE": 27,
@@ -28,6 +28,8 @@ extras = {
     "EXP_INT": 21,
 }
 
+_table = PLCPinTable(extras=extras)
+
 hw = {
-    "GATEBERRY": PLCMappingDict({**extras}),
+    "GATEBERRY": _table.model("extras"),
 }
@@ -17,7 +17,7 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .mapping import PLCMappingDict
+from .mapping import PLCPinTable
 
 analog0 = {
     "I0.0": 0x00002105,
@@ -162,17 +162,26 @@ relay2 = {
     "R2.8": 0x00004107,
 }
 
+_table = PLCPinTable(
+    analog0=analog0,
+    analog1=analog1,
+    analog2=analog2,
+    relay0=relay0,
+    relay1=relay1,
+    relay2=relay2,
+)
+
 hw = {
-    "RPIPLC_CPU": PLCMappingDict({}),
-    "RPIPLC_19R": PLCMappingDict({**relay0}),
-    "RPIPLC_21": PLCMappingDict({**analog0}),
-    "RPIPLC_38AR": PLCMappingDict({**analog0, **relay1}),
-    "RPIPLC_38R": PLCMappingDict({**relay0, **relay1}),
-    "RPIPLC_42": PLCMappingDict({**analog0, **analog1}),
-    "RPIPLC_50RRA": PLCMappingDict({**relay0, **relay1, **analog2}),
-    "RPIPLC_53ARR": PLCMappingDict({**analog0, **relay1, **relay2}),
-    "RPIPLC_54ARA": PLCMappingDict({**analog0, **relay1, **analog2}),
-    "RPIPLC_57AAR": PLCMappingDict({**analog0, **analog1, **relay2}),
-    "RPIPLC_57R": PLCMappingDict({**relay0, **relay1, **relay2}),
-    "RPIPLC_58": PLCMappingDict({**analog0, **analog1, **analog2}),
+    "RPIPLC_CPU": _table.model(),
+    "RPIPLC_19R": _table.model("relay0"),
+    "RPIPLC_21": _table.model("analog0"),
+    "RPIPLC_38AR": _table.model("analog0", "relay1"),
+    "RPIPLC_38R": _table.model("relay0", "relay1"),
+    "RPIPLC_42": _table.model("analog0", "analog1"),
+    "RPIPLC_50RRA": _table.model("relay0", "relay1", "analog2"),
+    "RPIPLC_53ARR": _table.model("analog0", "relay1", "relay2"),
+    "RPIPLC_54ARA": _table.model("analog0", "relay1", "analog2"),
+    "RPIPLC_57AAR": _table.model("analog0", "analog1", "relay2"),
+    "RPIPLC_57R": _table.model("relay0", "relay1", "relay2"),
+    "RPIPLC_58": _table.model("analog0", "analog1", "analog2"),
 }
@@ -17,7 +17,7 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .mapping import PLCMappingDict
+from .mapping import PLCPinTable
 
 extras = {
     "RE": 17,
@@ -47,6 +47,8 @@ extras = {
     "Q4": 4,
 }
 
+_table = PLCPinTable(extras=extras)
+
 hw = {
-    "TOUCHBERRY_PI": PLCMappingDict({**extras}),
+    "TOUCHBERRY_PI": _table.model("extras"),
 }
@@ -17,12 +17,14 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .mapping import PLCMappingDict
+from .mapping import PLCPinTable
 
 extras = {
     "DE_RE": 27,
 }
 
+_table = PLCPinTable(extras=extras)
+
 hw = {
-    "UPSAFEPI": PLCMappingDict({**extras}),
+    "UPSAFEPI": _table.model("extras"),
 }
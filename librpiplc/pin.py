@@ -0,0 +1,233 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .filters import filtered_read
+from .locking import NO_LOCK
+
+if TYPE_CHECKING:
+    import threading
+    from collections.abc import Callable, Mapping
+    from contextlib import AbstractContextManager
+
+    from .cache import OutputShadow, ReadCache
+    from .filters import FilterPipeline
+    from .lib_types import DigitalLevel, PeripheralType
+
+
+class Pin:
+    """
+    Handle to a single pin of the initialized model.
+
+    The pin identifier and the C library functions are resolved once when the handle is created,
+    so its methods go straight to the C library without looking up the pin name every time. The
+    handle must not be used after the library is deinitialized or initialized with another model.
+    It takes the same locks as the rpiplc instance, so it can be used from several threads.
+
+    Attributes:
+        name (str): The name of the pin.
+        pin_id (int): The pin identifier used by the C library.
+        peripheral_type (PeripheralType | None): The peripheral the pin belongs to (None if it
+                                                 can't be known).
+
+    """
+
+    __slots__ = (
+        "_analog_filters",
+        "_analog_read",
+        "_analog_write",
+        "_bus_lock",
+        "_device_lock",
+        "_digital_read",
+        "_digital_write",
+        "_on_analog_write",
+        "_on_digital_write",
+        "_read_cache",
+        "_shadow",
+        "name",
+        "peripheral_type",
+        "pin_id",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        pin_id: int,
+        peripheral_type: PeripheralType | None,
+        dyn_lib: Any,  # noqa: ANN401
+        *,
+        on_digital_write: Callable[[int, int], None] | None = None,
+        on_analog_write: Callable[[int, int], None] | None = None,
+        shadow: OutputShadow | None = None,
+        read_cache: ReadCache | None = None,
+        device_lock: threading.RLock | None = None,
+        bus_lock: AbstractContextManager[None] | threading.Lock = NO_LOCK,
+        analog_filters: Mapping[int, FilterPipeline] | None = None,
+    ) -> None:
+        """
+        Initialize the pin handle.
+
+        Args:
+            name (str): The name of the pin.
+            pin_id (int): The pin identifier used by the C library.
+            peripheral_type (PeripheralType | None): The peripheral the pin belongs to.
+            dyn_lib (Any): The loaded C library, with its argument and return types set.
+            on_digital_write (Callable[[int, int], None] | None): Function called with the pin
+                                                                 identifier and the written
+                                                                 level after every successful
+                                                                 digital write.
+            on_analog_write (Callable[[int, int], None] | None): Function called with the pin
+                                                                identifier and the written value
+                                                                after every successful analog
+                                                                write.
+            shadow (OutputShadow | None): The output shadow shared with the rpiplc instance, used
+                                          to skip the writes of unchanged values when it's
+                                          enabled.
+            read_cache (ReadCache | None): The read cache shared with the rpiplc instance, used to
+                                           reuse the values read recently.
+            device_lock (threading.RLock | None): The lock of the device of the pin, held while
+                                                  calling the C library (None to not lock it).
+            bus_lock (AbstractContextManager[None] | threading.Lock): The bus lock, held while
+                                                                      calling the C library if
+                                                                      the pin is on the I2C bus.
+            analog_filters (Mapping[int, FilterPipeline] | None): The filters of the analog
+                                                                  reads shared with the rpiplc
+                                                                  instance, by pin identifier.
+
+        """
+        self.name = name
+        self.pin_id = pin_id
+        self.peripheral_type = peripheral_type
+        self._digital_read = dyn_lib.digitalRead
+        self._digital_write = dyn_lib.digitalWrite
+        self._analog_read = dyn_lib.analogRead
+        self._analog_write = dyn_lib.analogWrite
+        self._on_digital_write = on_digital_write
+        self._on_analog_write = on_analog_write
+        self._shadow = shadow
+        self._read_cache = read_cache
+        self._device_lock = device_lock if device_lock is not None else NO_LOCK
+        self._bus_lock = bus_lock
+        self._analog_filters = analog_filters if analog_filters is not None else {}
+
+    def __repr__(self) -> str:
+        """Return the representation of the pin handle."""
+        return f"Pin({self.name!r}, 0x{self.pin_id:08X})"
+
+    def read(self) -> int:
+        """
+        Read the digital value of the pin.
+
+        Returns:
+            int: The digital value read from the pin (0 or 1).
+
+        """
+        read_cache = self._read_cache
+        if read_cache is not None:
+            cached = read_cache.get_digital(self.pin_id)
+            if cached is not None:
+                return cached
+        with self._device_lock:
+            with self._bus_lock:
+                value: int = self._digital_read(self.pin_id)
+            if read_cache is not None:
+                read_cache.put_digital(self.pin_id, value)
+        return value
+
+    def write(self, level: DigitalLevel | bool, *, force: bool = False) -> int:  # noqa: FBT001
+        """
+        Write a digital value to the pin.
+
+        Args:
+            level (DigitalLevel | bool): The digital level to write (LOW or HIGH).
+            force (bool): Whether to write the value even if the output shadow says that the pin
+                          already has it (default is False).
+
+        Returns:
+            int: Return code from the digitalWrite function (0 for success, non-zero for failure).
+
+        """
+        value = 1 if level else 0
+        shadow = self._shadow
+        if shadow is not None and not force and shadow.digital_unchanged(self.pin_id, value):
+            return 0
+        with self._device_lock:
+            with self._bus_lock:
+                rc: int = self._digital_write(self.pin_id, value)
+            if shadow is not None:
+                shadow.digital_written(self.pin_id, value, rc)
+            if self._read_cache is not None:
+                self._read_cache.forget(self.pin_id)
+            if rc == 0 and self._on_digital_write is not None:
+                self._on_digital_write(self.pin_id, value)
+        return rc
+
+    def analog_read(self) -> int:
+        """
+        Read the analog value of the pin, filtered if the pin has a filter.
+
+        Returns:
+            int: The analog value read from the pin (it's normally a number between 0 and 4095).
+
+        """
+        read_cache = self._read_cache
+        if read_cache is not None:
+            cached = read_cache.get_analog(self.pin_id)
+            if cached is not None:
+                return cached
+        with self._device_lock:
+            analog_filter = self._analog_filters.get(self.pin_id)
+            if analog_filter is None:
+                with self._bus_lock:
+                    value: int = self._analog_read(self.pin_id)
+            else:
+                value = filtered_read(analog_filter, self._analog_read, self.pin_id, self._bus_lock)
+            if read_cache is not None:
+                read_cache.put_analog(self.pin_id, value)
+        return value
+
+    def analog_write(self, value: int, *, force: bool = False) -> int:
+        """
+        Write an analog value to the pin.
+
+        Args:
+            value (int): The analog value to write (it's normally a number between 0 and 4095).
+            force (bool): Whether to write the value even if the output shadow says that the pin
+                          already has it (default is False).
+
+        Returns:
+            int: Return code from the analogWrite function (0 for success, non-zero for failure).
+
+        """
+        shadow = self._shadow
+        if shadow is not None and not force and shadow.analog_unchanged(self.pin_id, value):
+            return 0
+        with self._device_lock:
+            with self._bus_lock:
+                rc: int = self._analog_write(self.pin_id, value)
+            if shadow is not None:
+                shadow.analog_written(self.pin_id, value, rc)
+            if self._read_cache is not None:
+                self._read_cache.forget(self.pin_id)
+            if rc == 0 and self._on_analog_write is not None:
+                self._on_analog_write(self.pin_id, value)
+        return rc
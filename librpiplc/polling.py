@@ -0,0 +1,351 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from array import array
+from enum import IntEnum
+from typing import TYPE_CHECKING, NamedTuple
+
+from .scheduler import ScanScheduler
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable
+
+    from . import RPIPLCClass
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Edge(IntEnum):
+    """Edges of a digital input, usable as flags to select which ones to get."""
+
+    RISING = 1
+    FALLING = 2
+    BOTH = 3
+
+
+class EdgeEvent(NamedTuple):
+    """Change of a digital input detected by the edge poller."""
+
+    pin_name: str
+    edge: Edge
+    timestamp_ns: int
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Get the positions of the bits set in a mask, from the lowest one."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class EdgePoller:
+    """
+    Polling engine that detects the rising and falling edges of digital inputs.
+
+    A worker thread reads all the watched pins at a fixed rate with digital_read_many (so the
+    pins of each expander are read with a single digitalReadAll call), packs them into an integer
+    with a bit per pin and compares it with the debounced image of the previous polls with bit
+    operations. Only the pins that differ from the debounced image are handled one by one.
+
+    Each pin can be debounced by time (its new value must stay the same for some seconds) and by
+    count (its new value must be read in some consecutive polls), or both. The pins without
+    debounce change on the first poll that reads a new value. The edges are passed to the
+    subscribed callbacks, from the worker thread, and to the async iterators of events(). The
+    exceptions raised by a callback are logged and don't stop the poller nor the other callbacks.
+
+    """
+
+    def __init__(self, plc: RPIPLCClass | None = None, *, rate_hz: float = 100.0) -> None:
+        """
+        Initialize the poller, without any pin and without starting its worker thread.
+
+        Args:
+            plc (RPIPLCClass | None): The rpiplc instance to use, or None to use the rpiplc
+                                      singleton (default is None).
+            rate_hz (float): The number of polls per second (default is 100).
+
+        Raises:
+            ValueError: If the rate isn't positive.
+
+        """
+        if plc is None:
+            from . import rpiplc  # noqa: PLC0415
+
+            plc = rpiplc
+        if rate_hz <= 0:
+            msg = "The rate must be positive"
+            raise ValueError(msg)
+        self._plc = plc
+        self._scheduler = ScanScheduler(1 / rate_hz)
+        self._scheduler.add_cycle(self.poll)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self._pin_names: list[str] = []
+        self._bits_of: dict[str, int] = {}
+        self._stable = 0
+        self._immediate_mask = 0
+        self._pending_mask = 0
+        self._debounce_ns = array("q")
+        self._debounce_count = array("L")
+        self._pending_since = array("q")
+        self._pending_count = array("L")
+        self._subscriptions: dict[Callable[[EdgeEvent], object], tuple[int, Edge]] = {}
+
+    def __enter__(self) -> EdgePoller:  # noqa: PYI034
+        """Start the poller when entering a "with" block, and stop it when exiting it."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the poller, see stop()."""
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is running or not."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def scheduler(self) -> ScanScheduler:
+        """The scan scheduler of the polls, with their statistics."""
+        return self._scheduler
+
+    def watch(
+        self, pin_names: Iterable[str], *, debounce: float = 0.0, debounce_count: int = 1
+    ) -> None:
+        """
+        Start polling some pins, or change their debounce.
+
+        The current values of the new pins are read right away, without any edge.
+
+        Args:
+            pin_names (Iterable[str]): The names of the pins to poll.
+            debounce (float): Seconds that a new value must last to be accepted (default is 0).
+            debounce_count (int): Number of consecutive polls that must read a new value to
+                                  accept it (default is 1).
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model.
+            ValueError: If debounce is negative or debounce_count is smaller than 1.
+
+        """
+        if debounce < 0 or debounce_count < 1:
+            msg = "debounce can't be negative and debounce_count must be at least 1"
+            raise ValueError(msg)
+        pin_names = list(dict.fromkeys(pin_names))
+        for pin_name in pin_names:
+            self._plc.mapping_index.resolve(pin_name)
+        debounce_ns = round(debounce * 1e9)
+
+        with self._lock:
+            new_pins = [pin_name for pin_name in pin_names if pin_name not in self._bits_of]
+            values = self._plc.digital_read_many(new_pins) if new_pins else {}
+            for pin_name in new_pins:
+                bit = len(self._pin_names)
+                self._pin_names.append(pin_name)
+                self._bits_of[pin_name] = bit
+                if values[pin_name] > 0:
+                    self._stable |= 1 << bit
+                self._debounce_ns.append(0)
+                self._debounce_count.append(1)
+                self._pending_since.append(0)
+                self._pending_count.append(0)
+
+            for pin_name in pin_names:
+                bit = self._bits_of[pin_name]
+                self._debounce_ns[bit] = debounce_ns
+                self._debounce_count[bit] = debounce_count
+                if debounce_ns == 0 and debounce_count == 1:
+                    self._immediate_mask |= 1 << bit
+                else:
+                    self._immediate_mask &= ~(1 << bit)
+                self._pending_mask &= ~(1 << bit)
+
+    def subscribe(
+        self,
+        callback: Callable[[EdgeEvent], object],
+        *,
+        pin_names: Iterable[str] | None = None,
+        edge: Edge = Edge.BOTH,
+    ) -> Callable[[EdgeEvent], object]:
+        """
+        Call a function on the edges of the watched pins.
+
+        Args:
+            callback (Callable[[EdgeEvent], object]): Function called from the worker thread with
+                                                      every edge.
+            pin_names (Iterable[str] | None): The names of the watched pins to get the edges of,
+                                              or None to get the ones of all of them (default is
+                                              None).
+            edge (Edge): The edges to get (default is Edge.BOTH).
+
+        Returns:
+            Callable[[EdgeEvent], object]: The same function, to unsubscribe it.
+
+        Raises:
+            KeyError: If any pin isn't watched.
+
+        """
+        with self._lock:
+            if pin_names is None:
+                mask = -1
+            else:
+                mask = 0
+                for pin_name in pin_names:
+                    mask |= 1 << self._bits_of[pin_name]
+            self._subscriptions[callback] = (mask, edge)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[EdgeEvent], object]) -> None:
+        """
+        Stop calling a subscribed function.
+
+        Args:
+            callback (Callable[[EdgeEvent], object]): The function to unsubscribe.
+
+        Raises:
+            KeyError: If the function isn't subscribed.
+
+        """
+        with self._lock:
+            del self._subscriptions[callback]
+
+    def _discard(self, callback: Callable[[EdgeEvent], object]) -> None:
+        """Unsubscribe a function, if it's still subscribed."""
+        with self._lock:
+            self._subscriptions.pop(callback, None)
+
+    async def events(
+        self, *, pin_names: Iterable[str] | None = None, edge: Edge = Edge.BOTH
+    ) -> AsyncIterator[EdgeEvent]:
+        """
+        Iterate asynchronously over the edges of the watched pins, see subscribe().
+
+        Args:
+            pin_names (Iterable[str] | None): The names of the watched pins to get the edges of,
+                                              or None to get the ones of all of them (default is
+                                              None).
+            edge (Edge): The edges to get (default is Edge.BOTH).
+
+        Yields:
+            EdgeEvent: The edges, from the moment the iteration starts. The iterator stops getting
+                       them once its event loop is closed.
+
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[EdgeEvent] = asyncio.Queue()
+
+        def put(event: EdgeEvent) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # The event loop is closed, so nobody will get the edges anymore
+                self._discard(put)
+
+        self.subscribe(put, pin_names=pin_names, edge=edge)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._discard(put)
+
+    def start(self) -> None:
+        """Start polling in the worker thread, if it isn't already running."""
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._scheduler.run, name="rpiplc-poll", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for the worker thread to finish."""
+        if self._thread is None:
+            return
+        self._scheduler.stop()
+        self._thread.join()
+        self._thread = None
+
+    def poll(self) -> None:
+        """Read the watched pins once and report their edges, it's called by the worker thread."""
+        with self._lock:
+            pin_names = self._pin_names
+            if not pin_names:
+                return
+            values = self._plc.digital_read_many(pin_names)
+            now = time.monotonic_ns()
+            raw = 0
+            for bit, pin_name in enumerate(pin_names):
+                if values[pin_name] > 0:
+                    raw |= 1 << bit
+
+            different = raw ^ self._stable
+            accepted = different & self._immediate_mask
+            accepted |= self._debounce(different & ~self._immediate_mask, now)
+            if not accepted:
+                return
+            self._pending_mask &= ~accepted
+            self._stable ^= accepted
+            rising = accepted & self._stable
+            subscriptions = list(self._subscriptions.items())
+
+        for bit in _bits(accepted):
+            edge = Edge.RISING if (rising >> bit) & 1 else Edge.FALLING
+            event = EdgeEvent(pin_names[bit], edge, now)
+            for callback, (mask, edges) in subscriptions:
+                if (mask >> bit) & 1 and edge & edges:
+                    try:
+                        callback(event)
+                    except Exception:
+                        _LOGGER.exception("Edge callback %r failed with %s", callback, event)
+
+    def _debounce(self, debounced: int, now: int) -> int:
+        """
+        Update the pending changes of the debounced pins and get the ones accepted.
+
+        Args:
+            debounced (int): The mask of the debounced pins whose value differs from the image.
+            now (int): The time of the poll in ns.
+
+        Returns:
+            int: The mask of the pins whose new value is accepted.
+
+        """
+        # The pins that went back to their debounced value before being accepted start again
+        self._pending_mask &= debounced
+        accepted = 0
+        for bit in _bits(debounced):
+            if not (self._pending_mask >> bit) & 1:
+                self._pending_mask |= 1 << bit
+                self._pending_since[bit] = now
+                self._pending_count[bit] = 1
+            else:
+                self._pending_count[bit] += 1
+            if (
+                self._pending_count[bit] >= self._debounce_count[bit]
+                and now - self._pending_since[bit] >= self._debounce_ns[bit]
+            ):
+                accepted |= 1 << bit
+        return accepted
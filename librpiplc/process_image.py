@@ -0,0 +1,317 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from array import array
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, NamedTuple
+
+from .exceptions import UnknownPinError
+from .lib_types import PeripheralType
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from . import RPIPLCClass
+    from .lib_types import DigitalLevel
+    from .mapping import PLCMappingIndex
+
+
+_DIGITAL_INPUT_PERIPHERALS = (
+    PeripheralType.PLC_DIRECT,
+    PeripheralType.PLC_MCP23008,
+    PeripheralType.PLC_MCP23017,
+)
+_ANALOG_INPUT_PERIPHERALS = (PeripheralType.PLC_LTC2309, PeripheralType.PLC_ADS1015)
+
+_UNFLUSHED = -1
+
+
+class ImageLayout(NamedTuple):
+    """Names of the pins of a process image, in the order they are stored."""
+
+    digital_inputs: tuple[str, ...]
+    analog_inputs: tuple[str, ...]
+    digital_outputs: tuple[str, ...]
+    analog_outputs: tuple[str, ...]
+
+
+def image_layout(index: PLCMappingIndex) -> ImageLayout:
+    """
+    Get the layout of the process image of a model.
+
+    The inputs on direct GPIOs and I/O expanders are digital inputs, and the ones on
+    analog-to-digital converters are analog inputs. The Q and R pins are digital outputs and the A
+    pins are analog outputs. It only depends on the mapping, so it can be computed without the C
+    library.
+
+    Args:
+        index (PLCMappingIndex): The reverse index of the mapping of the model.
+
+    Returns:
+        ImageLayout: The names of the pins of each kind, in mapping order.
+
+    """
+    digital_inputs: list[str] = []
+    analog_inputs: list[str] = []
+    for pin_name in index.direction_pins("I"):
+        peripheral_type = index.resolve(pin_name)[1]
+        if peripheral_type in _DIGITAL_INPUT_PERIPHERALS:
+            digital_inputs.append(pin_name)
+        elif peripheral_type in _ANALOG_INPUT_PERIPHERALS:
+            analog_inputs.append(pin_name)
+    return ImageLayout(
+        tuple(digital_inputs),
+        tuple(analog_inputs),
+        (*index.direction_pins("Q"), *index.direction_pins("R")),
+        tuple(index.direction_pins("A")),
+    )
+
+
+class ProcessImage:
+    """
+    PLC-style process image of the inputs and outputs of the initialized model.
+
+    It follows the usual PLC execution model: scan_begin() reads all the inputs of the model at
+    once into the image, then the control logic reads and writes the image in memory, and finally
+    scan_end() writes only the outputs that changed, coalescing the writes of each expander.
+
+    The inputs on direct GPIOs and I/O expanders are read as digital inputs, and the ones on
+    analog-to-digital converters as analog inputs. The Q and R pins are digital outputs and the A
+    pins are analog outputs.
+
+    """
+
+    def __init__(self, plc: RPIPLCClass, index: PLCMappingIndex) -> None:
+        """
+        Initialize the process image with all the I/O pins of a mapping.
+
+        Args:
+            plc (RPIPLCClass): The initialized rpiplc instance used to read and write the pins.
+            index (PLCMappingIndex): The reverse index of the mapping of the initialized model.
+
+        """
+        self._plc = plc
+        self._layout = image_layout(index)
+        digital_inputs, analog_inputs, digital_outputs, analog_outputs = self._layout
+
+        self._digital_input_names = digital_inputs
+        self._digital_input_slots = {name: slot for slot, name in enumerate(digital_inputs)}
+        self._digital_inputs = array("B", bytes(len(digital_inputs)))
+
+        self._analog_input_names = analog_inputs
+        self._analog_input_slots = {name: slot for slot, name in enumerate(analog_inputs)}
+        self._analog_inputs = array("H", bytes(2 * len(analog_inputs)))
+
+        self._digital_output_names = digital_outputs
+        self._digital_output_slots = {name: slot for slot, name in enumerate(digital_outputs)}
+        self._digital_outputs = array("B", bytes(len(digital_outputs)))
+        self._digital_flushed = array("h", [_UNFLUSHED] * len(digital_outputs))
+        self._digital_dirty: set[int] = set()
+
+        self._analog_output_names = analog_outputs
+        self._analog_output_slots = {name: slot for slot, name in enumerate(analog_outputs)}
+        self._analog_outputs = array("H", bytes(2 * len(analog_outputs)))
+        self._analog_flushed = array("l", [_UNFLUSHED] * len(analog_outputs))
+        self._analog_dirty: set[int] = set()
+
+    @property
+    def layout(self) -> ImageLayout:
+        """The names of the pins of the image, see image_layout()."""
+        return self._layout
+
+    @property
+    def digital_input_names(self) -> tuple[str, ...]:
+        """The names of the digital inputs of the image."""
+        return self._digital_input_names
+
+    @property
+    def analog_input_names(self) -> tuple[str, ...]:
+        """The names of the analog inputs of the image."""
+        return self._analog_input_names
+
+    @property
+    def digital_output_names(self) -> tuple[str, ...]:
+        """The names of the digital outputs of the image."""
+        return self._digital_output_names
+
+    @property
+    def analog_output_names(self) -> tuple[str, ...]:
+        """The names of the analog outputs of the image."""
+        return self._analog_output_names
+
+    def scan_begin(self) -> None:
+        """Read all the inputs of the model into the image."""
+        levels = self._plc.digital_read_many(self._digital_input_names)
+        for slot, pin_name in enumerate(self._digital_input_names):
+            self._digital_inputs[slot] = 1 if levels[pin_name] > 0 else 0
+
+        for slot, pin_name in enumerate(self._analog_input_names):
+            self._analog_inputs[slot] = self._plc.analog_read(pin_name)
+
+    def scan_end(self) -> int:
+        """
+        Write the outputs whose value in the image changed since they were last written.
+
+        The outputs that couldn't be written are kept as changed, so they are retried on the next
+        scan_end() call.
+
+        Returns:
+            int: 0 for success, or the first non-zero return code of the underlying calls.
+
+        """
+        rc = 0
+        if self._digital_dirty:
+            dirty = sorted(self._digital_dirty)
+            rc = self._plc.digital_write_many(
+                {
+                    self._digital_output_names[slot]: bool(self._digital_outputs[slot])
+                    for slot in dirty
+                }
+            )
+            if rc == 0:
+                for slot in dirty:
+                    self._digital_flushed[slot] = self._digital_outputs[slot]
+                self._digital_dirty.clear()
+
+        if self._analog_dirty:
+            dirty = sorted(self._analog_dirty)
+            analog_rc = self._plc.analog_write_many(
+                {self._analog_output_names[slot]: self._analog_outputs[slot] for slot in dirty}
+            )
+            if analog_rc == 0:
+                for slot in dirty:
+                    self._analog_flushed[slot] = self._analog_outputs[slot]
+                self._analog_dirty.clear()
+            rc = rc or analog_rc
+
+        return rc
+
+    @contextmanager
+    def scan(self) -> Generator[ProcessImage, None, None]:
+        """
+        Context manager to run a scan cycle with "with" statements.
+
+        It calls scan_begin() when entering the with block and scan_end() when exiting it (unless
+        an exception is raised inside the block).
+
+        """
+        self.scan_begin()
+        yield self
+        self.scan_end()
+
+    def invalidate(self) -> None:
+        """Forget the values written to the outputs, so all of them are written in the next scan."""
+        self._plc.invalidate_output_shadow(
+            (*self._digital_output_names, *self._analog_output_names)
+        )
+        for slot in range(len(self._digital_flushed)):
+            self._digital_flushed[slot] = _UNFLUSHED
+        self._digital_dirty.update(range(len(self._digital_flushed)))
+        for slot in range(len(self._analog_flushed)):
+            self._analog_flushed[slot] = _UNFLUSHED
+        self._analog_dirty.update(range(len(self._analog_flushed)))
+
+    def digital_read(self, pin_name: str) -> int:
+        """
+        Read the digital value of an input or a digital output from the image.
+
+        Args:
+            pin_name (str): The name of the pin to read from.
+
+        Returns:
+            int: The digital value of the pin (0 or 1).
+
+        Raises:
+            UnknownPinError: If the pin isn't a digital pin of the image.
+
+        """
+        slot = self._digital_input_slots.get(pin_name)
+        if slot is not None:
+            return self._digital_inputs[slot]
+        slot = self._digital_output_slots.get(pin_name)
+        if slot is not None:
+            return self._digital_outputs[slot]
+        raise UnknownPinError(pin_name)
+
+    def analog_read(self, pin_name: str) -> int:
+        """
+        Read the analog value of an input or an analog output from the image.
+
+        Args:
+            pin_name (str): The name of the pin to read from.
+
+        Returns:
+            int: The analog value of the pin.
+
+        Raises:
+            UnknownPinError: If the pin isn't an analog pin of the image.
+
+        """
+        slot = self._analog_input_slots.get(pin_name)
+        if slot is not None:
+            return self._analog_inputs[slot]
+        slot = self._analog_output_slots.get(pin_name)
+        if slot is not None:
+            return self._analog_outputs[slot]
+        raise UnknownPinError(pin_name)
+
+    def digital_write(self, pin_name: str, level: DigitalLevel | bool) -> None:  # noqa: FBT001
+        """
+        Write a digital value to an output of the image.
+
+        Args:
+            pin_name (str): The name of the pin to write to.
+            level (DigitalLevel | bool): The digital level to write (LOW or HIGH).
+
+        Raises:
+            UnknownPinError: If the pin isn't a digital output of the image.
+
+        """
+        slot = self._digital_output_slots.get(pin_name)
+        if slot is None:
+            raise UnknownPinError(pin_name)
+        value = 1 if level else 0
+        self._digital_outputs[slot] = value
+        if self._digital_flushed[slot] == value:
+            self._digital_dirty.discard(slot)
+        else:
+            self._digital_dirty.add(slot)
+
+    def analog_write(self, pin_name: str, value: int) -> None:
+        """
+        Write an analog value to an output of the image.
+
+        Args:
+            pin_name (str): The name of the pin to write to.
+            value (int): The analog value to write (it's normally a number between 0 and 4095).
+
+        Raises:
+            UnknownPinError: If the pin isn't an analog output of the image.
+
+        """
+        slot = self._analog_output_slots.get(pin_name)
+        if slot is None:
+            raise UnknownPinError(pin_name)
+        self._analog_outputs[slot] = value
+        if self._analog_flushed[slot] == value:
+            self._analog_dirty.discard(slot)
+        else:
+            self._analog_dirty.add(slot)
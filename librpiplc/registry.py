@@ -0,0 +1,156 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from .exceptions import UnknownPLCConfError
+from .mapping import PLCMappingIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+_RPIPLC_MODELS = (
+    "RPIPLC_CPU",
+    "RPIPLC_19R",
+    "RPIPLC_21",
+    "RPIPLC_38AR",
+    "RPIPLC_38R",
+    "RPIPLC_42",
+    "RPIPLC_50RRA",
+    "RPIPLC_53ARR",
+    "RPIPLC_54ARA",
+    "RPIPLC_57AAR",
+    "RPIPLC_57R",
+    "RPIPLC_58",
+)
+
+# Mapping module and models of each version, the models must match the keys of the "hw"
+# dictionary of the module (and of its "old_" counterpart)
+_VERSIONS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "RPIPLC_V6": ("rpiplc_mapping_v6", _RPIPLC_MODELS),
+    "RPIPLC_V4": ("rpiplc_mapping_v4", _RPIPLC_MODELS),
+    "RPIPLC_V3": ("rpiplc_mapping_v3", _RPIPLC_MODELS),
+    "UPSAFEPI_V6": ("upsafepi_mapping_v6", ("UPSAFEPI",)),
+    "GATEBERRY_V9": ("gateberry_mapping_v9", ("GATEBERRY",)),
+    "TOUCHBERRY_PI_V1": ("touchberry_pi_mapping_v1", ("TOUCHBERRY_PI",)),
+}
+
+
+def available_versions() -> tuple[str, ...]:
+    """
+    Get the names of the available PLC versions.
+
+    Returns:
+        tuple[str, ...]: The names of the available PLC versions.
+
+    """
+    return tuple(_VERSIONS)
+
+
+def available_models(version_name: str) -> tuple[str, ...]:
+    """
+    Get the names of the available models of a PLC version, without importing its mapping.
+
+    Args:
+        version_name (str): The version name of the PLC.
+
+    Returns:
+        tuple[str, ...]: The names of the available models.
+
+    Raises:
+        UnknownPLCConfError: If the version is unknown.
+
+    """
+    try:
+        return _VERSIONS[version_name][1]
+    except KeyError as exc:
+        pretty_versions = "\n" + "\n".join(_VERSIONS.keys())
+        error_str = (
+            f"Unknown version {version_name}, the only available versions are:{pretty_versions}"
+        )
+        raise UnknownPLCConfError(error_str) from exc
+
+
+@cache
+def resolve_model(
+    version_name: str, model_name: str, *, old_library: bool = False
+) -> Mapping[str, int]:
+    """
+    Get the mapping of a PLC model, importing only the mapping module of its version.
+
+    The result is memoized, so resolving the same model again doesn't cost anything.
+
+    Args:
+        version_name (str): The version name of the PLC.
+        model_name (str): The model name of the PLC.
+        old_library (bool): Whether to use the mapping of older versions of librpiplc (<4.X.X)
+                            or not (default is False).
+
+    Returns:
+        Mapping[str, int]: The mapping of the model.
+
+    Raises:
+        UnknownPLCConfError: If the version or model is unknown.
+
+    """
+    models = available_models(version_name)
+    if model_name not in models:
+        pretty_models = "\n" + "\n".join(models)
+        error_str = (
+            f"Unknown model {model_name}, the only available models "
+            f"for {version_name} are:{pretty_models}"
+        )
+        raise UnknownPLCConfError(error_str)
+
+    module_name = _VERSIONS[version_name][0]
+    if old_library:
+        module_name = f"old_{module_name}"
+    hw: dict[str, Mapping[str, int]] = import_module(f".{module_name}", __package__).hw
+    return hw[model_name]
+
+
+@cache
+def model_index(
+    version_name: str, model_name: str, *, old_library: bool = False
+) -> PLCMappingIndex:
+    """
+    Get the reverse index of the mapping of a PLC model.
+
+    The result is memoized, so indexing the same model again doesn't cost anything.
+
+    Args:
+        version_name (str): The version name of the PLC.
+        model_name (str): The model name of the PLC.
+        old_library (bool): Whether to use the mapping of older versions of librpiplc (<4.X.X)
+                            or not (default is False).
+
+    Returns:
+        PLCMappingIndex: The reverse index of the mapping of the model.
+
+    Raises:
+        UnknownPLCConfError: If the version or model is unknown.
+
+    """
+    mapping = resolve_model(version_name, model_name, old_library=old_library)
+    return PLCMappingIndex(mapping, old_library=old_library)
@@ -18,7 +18,7 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .mapping import (
-    PLCMappingDict,
+    PLCPinTable,
     make_pin_ads1015,
     make_pin_direct,
     make_pin_mcp23008,
@@ -168,17 +168,26 @@ relay2 = {
     "R2.8": make_pin_pca9685(0x41, 0x07),
 }
 
+_table = PLCPinTable(
+    analog0=analog0,
+    analog1=analog1,
+    analog2=analog2,
+    relay0=relay0,
+    relay1=relay1,
+    relay2=relay2,
+)
+
 hw = {
-    "RPIPLC_CPU": PLCMappingDict({}),
-    "RPIPLC_19R": PLCMappingDict({**relay0}),
-    "RPIPLC_21": PLCMappingDict({**analog0}),
-    "RPIPLC_38AR": PLCMappingDict({**analog0, **relay1}),
-    "RPIPLC_38R": PLCMappingDict({**relay0, **relay1}),
-    "RPIPLC_42": PLCMappingDict({**analog0, **analog1}),
-    "RPIPLC_50RRA": PLCMappingDict({**relay0, **relay1, **analog2}),
-    "RPIPLC_53ARR": PLCMappingDict({**analog0, **relay1, **relay2}),
-    "RPIPLC_54ARA": PLCMappingDict({**analog0, **relay1, **analog2}),
-    "RPIPLC_57AAR": PLCMappingDict({**analog0, **analog1, **relay2}),
-    "RPIPLC_57R": PLCMappingDict({**relay0, **relay1, **relay2}),
-    "RPIPLC_58": PLCMappingDict({**analog0, **analog1, **analog2}),
+    "RPIPLC_CPU": _table.model(),
+    "RPIPLC_19R": _table.model("relay0"),
+    "RPIPLC_21": _table.model("analog0"),
+    "RPIPLC_38AR": _table.model("analog0", "relay1"),
+    "RPIPLC_38R": _table.model("relay0", "relay1"),
+    "RPIPLC_42": _table.model("analog0", "analog1"),
+    "RPIPLC_50RRA": _table.model("relay0", "relay1", "analog2"),
+    "RPIPLC_53ARR": _table.model("analog0", "relay1", "relay2"),
+    "RPIPLC_54ARA": _table.model("analog0", "relay1", "analog2"),
+    "RPIPLC_57AAR": _table.model("analog0", "analog1", "relay2"),
+    "RPIPLC_57R": _table.model("relay0", "relay1", "relay2"),
+    "RPIPLC_58": _table.model("analog0", "analog1", "analog2"),
 }
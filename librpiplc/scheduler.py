@@ -0,0 +1,525 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from collections import deque
+from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING, NamedTuple
+
+from .lib_types import PeripheralType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from . import RPIPLCClass
+
+_ANALOG_INPUT_PERIPHERALS = (PeripheralType.PLC_LTC2309, PeripheralType.PLC_ADS1015)
+
+# Upper bounds (in ns) of the default histogram buckets, from 10 us to 10 s in 1-2-5 steps
+DEFAULT_BUCKETS = (
+    *(mantissa * 10**exponent for exponent in range(4, 10) for mantissa in (1, 2, 5)),
+    10**10,
+)
+
+
+class OverrunPolicy(Enum):
+    """What the scan scheduler does when a cycle ends after the deadline of the next one."""
+
+    SKIP = 0
+    CATCH_UP = 1
+
+
+class Histogram:
+    """
+    Histogram of durations in nanoseconds, with fixed buckets.
+
+    Each bucket counts the values up to its upper bound (and above the bound of the previous
+    bucket), and an extra last bucket counts the values above all the bounds.
+
+    """
+
+    def __init__(self, bounds: Sequence[int] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            bounds (Sequence[int]): The upper bounds of the buckets in ns, in increasing order
+                                    (default is DEFAULT_BUCKETS, from 10 us to 10 s).
+
+        Raises:
+            ValueError: If the bounds aren't in increasing order.
+
+        """
+        if list(bounds) != sorted(set(bounds)):
+            msg = "The bounds of the histogram must be in increasing order"
+            raise ValueError(msg)
+        self._bounds = tuple(bounds)
+        self._counts = array("Q", bytes(8 * (len(bounds) + 1)))
+        self.reset()
+
+    @property
+    def bounds(self) -> tuple[int, ...]:
+        """The upper bounds of the buckets in ns."""
+        return self._bounds
+
+    @property
+    def counts(self) -> tuple[int, ...]:
+        """The number of values of each bucket, including the last one above all the bounds."""
+        return tuple(self._counts)
+
+    def reset(self) -> None:
+        """Forget all the recorded values."""
+        for bucket in range(len(self._counts)):
+            self._counts[bucket] = 0
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """
+        Record a value.
+
+        Args:
+            value (int): The value in ns.
+
+        """
+        bucket = 0
+        for bound in self._bounds:
+            if value <= bound:
+                break
+            bucket += 1
+        self._counts[bucket] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        self.max = max(value, self.max)
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self) -> float:
+        """The mean of the recorded values in ns (0 if there isn't any)."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> int:
+        """
+        Get an upper estimate of a percentile of the recorded values.
+
+        Args:
+            percent (float): The percentile to get, between 0 and 100.
+
+        Returns:
+            int: The upper bound of the bucket that holds the percentile, capped to the maximum
+                 recorded value (0 if there isn't any).
+
+        """
+        target = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(self._bounds, self._counts):
+            seen += count
+            if seen >= target and seen > 0:
+                return min(bound, self.max)
+        return self.max
+
+
+class ScanStats(NamedTuple):
+    """Counters of the scan scheduler."""
+
+    cycles: int
+    overruns: int
+    skipped: int
+
+
+class ScanScheduler:
+    """
+    Cyclic scheduler that runs the registered cycle functions at a fixed period.
+
+    The start of every cycle is an absolute deadline on the monotonic clock (the first one plus a
+    multiple of the period), so the time spent by the cycle functions doesn't make the cycle drift
+    like a loop with a delay at its end. The scheduler records the jitter (how late each cycle
+    started from its deadline) and the duration of every cycle in histograms.
+
+    A cycle that ends after the deadline of the next one is an overrun. With OverrunPolicy.SKIP
+    the missed deadlines are skipped and the next cycle starts at the next deadline of the
+    period, while with OverrunPolicy.CATCH_UP the missed cycles are run right away, one after
+    the other, until the scheduler is back on time.
+
+    Attributes:
+        durations (Histogram): Durations of the cycles.
+        jitter (Histogram): Delays between the deadlines and the starts of the cycles.
+
+    """
+
+    def __init__(
+        self,
+        period: float,
+        *,
+        policy: OverrunPolicy = OverrunPolicy.SKIP,
+        busy_wait: float = 0.0,
+        on_overrun: Callable[[int, int], None] | None = None,
+    ) -> None:
+        """
+        Initialize the scheduler, without any cycle function.
+
+        Args:
+            period (float): The period of the cycles in seconds.
+            policy (OverrunPolicy): What to do on overruns (default is OverrunPolicy.SKIP).
+            busy_wait (float): Seconds before each deadline that the scheduler spins on the clock
+                               instead of sleeping, to reduce the jitter at the cost of CPU time
+                               (default is 0, only sleep).
+            on_overrun (Callable[[int, int], None] | None): Function called with the number of the
+                                                            cycle and how late it ended (in ns)
+                                                            on every overrun (default is None).
+
+        Raises:
+            ValueError: If the period isn't positive or busy_wait is negative.
+
+        """
+        if period <= 0 or busy_wait < 0:
+            msg = "The period must be positive and busy_wait can't be negative"
+            raise ValueError(msg)
+        self._period = round(period * 1e9)
+        self._policy = policy
+        self._busy_wait = round(busy_wait * 1e9)
+        self._on_overrun = on_overrun
+        self._cycle_functions: list[Callable[[], object]] = []
+        self._stopping = threading.Event()
+        self.durations = Histogram()
+        self.jitter = Histogram()
+        self._cycles = 0
+        self._overruns = 0
+        self._skipped = 0
+        self._next_deadline = 0
+
+    @property
+    def period(self) -> float:
+        """The period of the cycles in seconds."""
+        return self._period / 1e9
+
+    @property
+    def time_left(self) -> float:
+        """Seconds left until the deadline of the next cycle (negative if it already passed)."""
+        return (self._next_deadline - time.monotonic_ns()) / 1e9
+
+    @property
+    def stats(self) -> ScanStats:
+        """The number of cycles run, of overruns and of skipped cycles."""
+        return ScanStats(self._cycles, self._overruns, self._skipped)
+
+    def reset_stats(self) -> None:
+        """Reset the counters and the histograms."""
+        self._cycles = self._overruns = self._skipped = 0
+        self.durations.reset()
+        self.jitter.reset()
+
+    def add_cycle(self, func: Callable[[], object]) -> Callable[[], object]:
+        """
+        Register a function to run on every cycle, after the ones already registered.
+
+        It returns the function, so it can be used as a decorator.
+
+        Args:
+            func (Callable[[], object]): The function to run, without arguments.
+
+        Returns:
+            Callable[[], object]: The same function.
+
+        """
+        self._cycle_functions.append(func)
+        return func
+
+    def remove_cycle(self, func: Callable[[], object]) -> None:
+        """
+        Unregister a cycle function.
+
+        Args:
+            func (Callable[[], object]): The function to stop running.
+
+        Raises:
+            ValueError: If the function isn't registered.
+
+        """
+        self._cycle_functions.remove(func)
+
+    def stop(self) -> None:
+        """Make run() return after the current cycle, it can be called from any thread."""
+        self._stopping.set()
+
+    def run(self, cycles: int | None = None) -> None:
+        """
+        Run the cycles until stop() is called, starting the first one right away.
+
+        An exception raised by a cycle function stops the scheduler and is raised by run().
+
+        Args:
+            cycles (int | None): The number of cycles to run, or None to run until stop() is
+                                 called (default is None).
+
+        """
+        self._stopping.clear()
+        period = self._period
+        deadline = time.monotonic_ns()
+        run_cycles = 0
+        while cycles is None or run_cycles < cycles:
+            self._wait_until(deadline)
+            if self._stopping.is_set():
+                break
+
+            start = time.monotonic_ns()
+            self.jitter.record(start - deadline)
+            self._next_deadline = deadline + period
+            self._cycle()
+            end = time.monotonic_ns()
+            self.durations.record(end - start)
+            self._cycles += 1
+            run_cycles += 1
+
+            deadline += period
+            if end > deadline:
+                self._overruns += 1
+                if self._on_overrun is not None:
+                    self._on_overrun(self._cycles, end - deadline)
+                if self._policy is OverrunPolicy.SKIP:
+                    missed = (end - deadline) // period + 1
+                    self._skipped += missed
+                    deadline += missed * period
+
+    def _cycle(self) -> None:
+        """Run the cycle functions."""
+        for func in tuple(self._cycle_functions):
+            func()
+
+    def _wait_until(self, deadline: int) -> None:
+        """Sleep until a deadline on the monotonic clock, or until stop() is called."""
+        remaining = deadline - time.monotonic_ns() - self._busy_wait
+        if remaining > 0 and self._stopping.wait(remaining / 1e9):
+            return
+        while time.monotonic_ns() < deadline and not self._stopping.is_set():
+            pass
+
+
+class SlowTaskStats(NamedTuple):
+    """Counters of the slow tasks of the multi-rate scheduler."""
+
+    runs: int
+    deferred: int
+    lagged: int
+
+
+class _SlowTask:
+    """Slow task of the multi-rate scheduler, with its estimated cost."""
+
+    __slots__ = ("cost", "countdown", "every", "func", "pending")
+
+    def __init__(self, func: Callable[[], object], every: int, cost: int) -> None:
+        self.func = func
+        self.every = every
+        self.countdown = 1
+        self.cost = cost
+        self.pending = False
+
+
+def _read_task(
+    pin_name: str, read: Callable[[], int], callback: Callable[[str, int], object]
+) -> None:
+    """Read a pin and pass its value to a callback."""
+    callback(pin_name, read())
+
+
+class MultiRateScheduler(ScanScheduler):
+    """
+    Scan scheduler with a fast rate class and slow rate classes that run in the gaps of its cycles.
+
+    The period of the scheduler is the period of the fast class: the cycle functions and the tasks
+    added with every=1 run on every cycle, like in ScanScheduler. The tasks of the slow classes
+    (every=N runs them every N cycles) are queued when they are due, and after the fast tasks of
+    each cycle the queued ones are run in order while their estimated cost fits before the
+    deadline of the next cycle. So the slow work, like I2C conversions, is spread over the idle
+    time of the fast cycles instead of delaying them.
+
+    The cost of a slow task is the time it took to run, following its increases right away and
+    its decreases slowly. Until a task has run once, its cost is the one given when adding it, and
+    if it's unknown (0) the task only runs as the first slow task of a cycle. A task that costs
+    more than a whole cycle can never fit, so it runs as the first slow task of a cycle too,
+    making that cycle overrun.
+
+    """
+
+    def __init__(
+        self,
+        period: float,
+        *,
+        policy: OverrunPolicy = OverrunPolicy.SKIP,
+        busy_wait: float = 0.0,
+        on_overrun: Callable[[int, int], None] | None = None,
+        margin: float = 0.0,
+    ) -> None:
+        """
+        Initialize the scheduler, without any cycle function or task.
+
+        Args:
+            period (float): The period of the fast cycles in seconds.
+            policy (OverrunPolicy): What to do on overruns (default is OverrunPolicy.SKIP).
+            busy_wait (float): Seconds before each deadline that the scheduler spins on the clock
+                               instead of sleeping (default is 0, only sleep).
+            on_overrun (Callable[[int, int], None] | None): Function called with the number of the
+                                                            cycle and how late it ended (in ns)
+                                                            on every overrun (default is None).
+            margin (float): Seconds kept free before each deadline when running slow tasks
+                            (default is 0).
+
+        Raises:
+            ValueError: If the period isn't positive or busy_wait or margin is negative.
+
+        """
+        if margin < 0:
+            msg = "The margin can't be negative"
+            raise ValueError(msg)
+        super().__init__(period, policy=policy, busy_wait=busy_wait, on_overrun=on_overrun)
+        self._margin = round(margin * 1e9)
+        self._slow_tasks: list[_SlowTask] = []
+        self._slow_queue: deque[_SlowTask] = deque()
+        self._slow_runs = 0
+        self._deferred = 0
+        self._lagged = 0
+
+    @property
+    def slow_stats(self) -> SlowTaskStats:
+        """
+        The counters of the slow tasks.
+
+        They are the number of slow tasks run, of cycles that ended with slow tasks waiting
+        because they didn't fit, and of times that a slow task was due while it was still waiting.
+
+        """
+        return SlowTaskStats(self._slow_runs, self._deferred, self._lagged)
+
+    def reset_stats(self) -> None:
+        """Reset the counters and the histograms."""
+        super().reset_stats()
+        self._slow_runs = self._deferred = self._lagged = 0
+
+    def add_task(
+        self, func: Callable[[], object], *, every: int = 1, cost: float = 0.0
+    ) -> Callable[[], object]:
+        """
+        Register a function to run every few cycles.
+
+        Args:
+            func (Callable[[], object]): The function to run, without arguments.
+            every (int): Run it every this number of cycles, 1 to run it on every cycle with the
+                         cycle functions (default is 1).
+            cost (float): The estimated seconds it takes to run, until it has run once (default
+                          is 0, only used when every > 1).
+
+        Returns:
+            Callable[[], object]: The same function.
+
+        Raises:
+            ValueError: If every is smaller than 1.
+
+        """
+        if every < 1:
+            msg = "every must be at least 1"
+            raise ValueError(msg)
+        if every == 1:
+            return self.add_cycle(func)
+        self._slow_tasks.append(_SlowTask(func, every, round(cost * 1e9)))
+        return func
+
+    def add_reads(
+        self,
+        pin_names: Iterable[str],
+        callback: Callable[[str, int], object],
+        *,
+        every: int = 1,
+        plc: RPIPLCClass | None = None,
+    ) -> None:
+        """
+        Read some pins every few cycles, each one as a separate task.
+
+        The pins of analog-to-digital converters are read with analog_read() and the rest with
+        read(), through pin handles.
+
+        Args:
+            pin_names (Iterable[str]): The names of the pins to read.
+            callback (Callable[[str, int], object]): Function called with the name and the value
+                                                     of a pin every time it's read.
+            every (int): Read them every this number of cycles (default is 1).
+            plc (RPIPLCClass | None): The rpiplc instance to use, or None to use the rpiplc
+                                      singleton (default is None).
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model.
+            ValueError: If every is smaller than 1.
+
+        """
+        if plc is None:
+            from . import rpiplc  # noqa: PLC0415
+
+            plc = rpiplc
+        for pin_name in pin_names:
+            handle = plc.pin(pin_name)
+            read = (
+                handle.analog_read
+                if handle.peripheral_type in _ANALOG_INPUT_PERIPHERALS
+                else handle.read
+            )
+            self.add_task(partial(_read_task, pin_name, read, callback), every=every)
+
+    def _cycle(self) -> None:
+        """Run the cycle functions, and then the queued slow tasks that fit in the cycle."""
+        super()._cycle()
+
+        queue = self._slow_queue
+        for task in self._slow_tasks:
+            task.countdown -= 1
+            if task.countdown == 0:
+                task.countdown = task.every
+                if task.pending:
+                    self._lagged += 1
+                else:
+                    task.pending = True
+                    queue.append(task)
+
+        limit = self._next_deadline - self._margin
+        budget = self._period - self._margin
+        ran = False
+        while queue:
+            task = queue[0]
+            start = time.monotonic_ns()
+            if ran:
+                runnable = task.cost > 0 and start + task.cost <= limit
+            else:
+                runnable = start + task.cost <= limit or task.cost > budget
+            if not runnable:
+                self._deferred += 1
+                break
+            ran = True
+            queue.popleft()
+            task.pending = False
+            task.func()
+            cost = time.monotonic_ns() - start
+            task.cost = cost if cost > task.cost else (7 * task.cost + cost) // 8
+            self._slow_runs += 1
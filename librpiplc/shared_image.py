@@ -0,0 +1,391 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from .exceptions import UnknownPLCConfError
+from .process_image import ImageLayout, image_layout
+from .registry import model_index
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .process_image import ProcessImage
+
+DEFAULT_IMAGE_PATH = "/dev/shm/rpiplc-image"  # noqa: S108
+
+_MAGIC = b"RPIM"
+_FORMAT_VERSION = 1
+# Magic, format version, layout checksum, sequence counter, monotonic and wall clock timestamps of
+# the last scan (in ns), and number of digital inputs, analog inputs, digital outputs and analog
+# outputs
+_HEADER = struct.Struct("<4sHxxIIxxxxQQHHHH")
+_SEQ = struct.Struct("<I")
+_SEQ_OFFSET = 12
+_TIMESTAMPS = struct.Struct("<QQ")
+_TIMESTAMPS_OFFSET = 20
+_READ_RETRIES = 1000
+
+
+def _layout_checksum(layout: ImageLayout) -> int:
+    """Get a checksum of the pin names of a layout, to detect readers of another model."""
+    return zlib.crc32("\0".join("\n".join(names) for names in layout).encode())
+
+
+class _Segment(NamedTuple):
+    """Offsets and sizes of the parts of the shared image of a layout."""
+
+    digital_inputs: slice
+    analog_inputs: slice
+    digital_outputs: slice
+    analog_outputs: slice
+    size: int
+
+
+def _segment(layout: ImageLayout) -> _Segment:
+    """Compute where each part of a layout is stored: bit-packed digitals and uint16 analogs."""
+    offset = _HEADER.size
+    parts: list[slice] = []
+    for names, analog in (
+        (layout.digital_inputs, False),
+        (layout.analog_inputs, True),
+        (layout.digital_outputs, False),
+        (layout.analog_outputs, True),
+    ):
+        size = 2 * len(names) if analog else (len(names) + 7) // 8
+        offset += offset & 1 if analog else 0
+        parts.append(slice(offset, offset + size))
+        offset += size
+    return _Segment(parts[0], parts[1], parts[2], parts[3], offset)
+
+
+def _pack_bits(values: Sequence[int], size: int) -> bytes:
+    bits = 0
+    for bit, value in enumerate(values):
+        if value:
+            bits |= 1 << bit
+    return bits.to_bytes(size, "little")
+
+
+def _pack_analogs(values: Sequence[int]) -> bytes:
+    analogs = array("H", values)
+    if sys.byteorder == "big":
+        analogs.byteswap()
+    return analogs.tobytes()
+
+
+class ImageSnapshot(NamedTuple):
+    """Consistent copy of the shared process image."""
+
+    seq: int
+    monotonic_ns: int
+    time_ns: int
+    digital_inputs: dict[str, int]
+    analog_inputs: dict[str, int]
+    digital_outputs: dict[str, int]
+    analog_outputs: dict[str, int]
+
+
+class SharedImageWriter:
+    """
+    Writer of the process image of a model into a shared memory file.
+
+    A single scanner process publishes the values of its process image, and any number of
+    processes can map the file read-only with SharedImageReader to get them without touching the
+    bus. The layout is derived from the mapping of the model (see image_layout()): the digital
+    pins are bit-packed and the analog pins are stored as uint16, after a header with a sequence
+    counter and the timestamps of the last publication.
+
+    The sequence counter works as a seqlock: it's odd while the writer is updating the image, and
+    the readers retry until they copy the image between two equal and even values of it.
+
+    A new writer never modifies the file of a previous one: it atomically replaces it with a new
+    file, so the readers that still map the old file keep reading its last image (see
+    SharedImageReader).
+
+    """
+
+    def __init__(self, layout: ImageLayout, path: str = DEFAULT_IMAGE_PATH) -> None:
+        """
+        Create (or replace) the shared memory file of a layout.
+
+        Args:
+            layout (ImageLayout): The layout of the image, normally ProcessImage.layout.
+            path (str): The path of the shared memory file (default is /dev/shm/rpiplc-image).
+
+        """
+        self._layout = layout
+        self._segment = _segment(layout)
+        self._path = Path(path)
+
+        # The image is built in a new file that then replaces the old one, so the readers that
+        # still map the old file keep a valid (but stale) image instead of getting SIGBUS
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self._path.name}.", dir=self._path.parent)
+        try:
+            try:
+                os.fchmod(fd, 0o644)
+                os.ftruncate(fd, self._segment.size)
+                self._mmap = mmap.mmap(fd, self._segment.size)
+            finally:
+                os.close(fd)
+
+            self._seq = 0
+            _HEADER.pack_into(
+                self._mmap,
+                0,
+                _MAGIC,
+                _FORMAT_VERSION,
+                _layout_checksum(layout),
+                self._seq,
+                0,
+                0,
+                *map(len, layout),
+            )
+            Path(tmp_path).replace(self._path)
+        except BaseException:
+            if hasattr(self, "_mmap"):
+                self._mmap.close()
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def __enter__(self) -> SharedImageWriter:  # noqa: PYI034
+        """Use the writer in a "with" block, closing it when exiting the block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the writer, see close()."""
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """The path of the shared memory file."""
+        return str(self._path)
+
+    def close(self, *, unlink: bool = True) -> None:
+        """
+        Unmap the shared memory file.
+
+        Args:
+            unlink (bool): Whether to remove the file too (default is True).
+
+        """
+        self._mmap.close()
+        if unlink:
+            self._path.unlink(missing_ok=True)
+
+    def publish(
+        self,
+        digital_inputs: Sequence[int],
+        analog_inputs: Sequence[int],
+        digital_outputs: Sequence[int],
+        analog_outputs: Sequence[int],
+    ) -> int:
+        """
+        Publish the values of all the pins, in the order of the layout.
+
+        Args:
+            digital_inputs (Sequence[int]): The values of the digital inputs.
+            analog_inputs (Sequence[int]): The values of the analog inputs.
+            digital_outputs (Sequence[int]): The values of the digital outputs.
+            analog_outputs (Sequence[int]): The values of the analog outputs.
+
+        Returns:
+            int: The sequence counter of the published image.
+
+        Raises:
+            ValueError: If the number of values doesn't match the layout.
+
+        """
+        for values, names in zip(
+            (digital_inputs, analog_inputs, digital_outputs, analog_outputs), self._layout
+        ):
+            if len(values) != len(names):
+                msg = f"Expected {len(names)} values, got {len(values)}"
+                raise ValueError(msg)
+
+        segment = self._segment
+        digital_inputs_data = _pack_bits(
+            digital_inputs, segment.digital_inputs.stop - segment.digital_inputs.start
+        )
+        analog_inputs_data = _pack_analogs(analog_inputs)
+        digital_outputs_data = _pack_bits(
+            digital_outputs, segment.digital_outputs.stop - segment.digital_outputs.start
+        )
+        analog_outputs_data = _pack_analogs(analog_outputs)
+
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        _SEQ.pack_into(self._mmap, _SEQ_OFFSET, self._seq)
+        self._mmap[segment.digital_inputs] = digital_inputs_data
+        self._mmap[segment.analog_inputs] = analog_inputs_data
+        self._mmap[segment.digital_outputs] = digital_outputs_data
+        self._mmap[segment.analog_outputs] = analog_outputs_data
+        _TIMESTAMPS.pack_into(self._mmap, _TIMESTAMPS_OFFSET, time.monotonic_ns(), time.time_ns())
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        _SEQ.pack_into(self._mmap, _SEQ_OFFSET, self._seq)
+        return self._seq
+
+    def publish_image(self, image: ProcessImage) -> int:
+        """
+        Publish the values of a process image, normally after its scan_begin() or scan_end().
+
+        Args:
+            image (ProcessImage): The process image, with the same layout as the writer.
+
+        Returns:
+            int: The sequence counter of the published image.
+
+        Raises:
+            ValueError: If the layout of the image isn't the one of the writer.
+
+        """
+        if image.layout != self._layout:
+            msg = "The layout of the process image doesn't match the shared image"
+            raise ValueError(msg)
+        return self.publish(
+            [image.digital_read(pin_name) for pin_name in image.digital_input_names],
+            [image.analog_read(pin_name) for pin_name in image.analog_input_names],
+            [image.digital_read(pin_name) for pin_name in image.digital_output_names],
+            [image.analog_read(pin_name) for pin_name in image.analog_output_names],
+        )
+
+
+class SharedImageReader:
+    """
+    Read-only view of the process image published by a SharedImageWriter in another process.
+
+    The layout is derived from the PLC version and model, so the C library isn't needed.
+
+    The reader maps the file that exists when it's created. If the scanner restarts, its new
+    SharedImageWriter replaces the file and this reader keeps seeing the last image of the old
+    one (its sequence counter stops changing): the reader must be closed and created again to
+    see the new image.
+
+    """
+
+    def __init__(self, version_name: str, model_name: str, path: str = DEFAULT_IMAGE_PATH) -> None:
+        """
+        Map the shared memory file read-only.
+
+        Args:
+            version_name (str): The version name of the PLC.
+            model_name (str): The model name of the PLC.
+            path (str): The path of the shared memory file (default is /dev/shm/rpiplc-image).
+
+        Raises:
+            FileNotFoundError: If no writer created the file.
+            UnknownPLCConfError: If the version or model is unknown, or the file was written for
+                                 another model.
+
+        """
+        self._layout = image_layout(model_index(version_name, model_name))
+        self._segment = _segment(self._layout)
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            self._mmap = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+        magic, format_version, checksum, *_ = _HEADER.unpack_from(self._mmap)
+        if (
+            magic != _MAGIC
+            or format_version != _FORMAT_VERSION
+            or checksum != _layout_checksum(self._layout)
+            or len(self._mmap) < self._segment.size
+        ):
+            self._mmap.close()
+            msg = f"The shared image {path} wasn't written for {version_name} {model_name}"
+            raise UnknownPLCConfError(msg)
+
+    def __enter__(self) -> SharedImageReader:  # noqa: PYI034
+        """Use the reader in a "with" block, closing it when exiting the block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the reader, see close()."""
+        self.close()
+
+    @property
+    def layout(self) -> ImageLayout:
+        """The names of the pins of the image."""
+        return self._layout
+
+    @property
+    def seq(self) -> int:
+        """The current sequence counter of the image, which changes on every publication."""
+        return int(_SEQ.unpack_from(self._mmap, _SEQ_OFFSET)[0])
+
+    def close(self) -> None:
+        """Unmap the shared memory file."""
+        self._mmap.close()
+
+    def snapshot(self) -> ImageSnapshot:
+        """
+        Get a consistent copy of the image.
+
+        Returns:
+            ImageSnapshot: The values of all the pins, the sequence counter and the timestamps of
+                           the publication.
+
+        Raises:
+            TimeoutError: If the image didn't stay still long enough to be copied.
+
+        """
+        for _ in range(_READ_RETRIES):
+            seq = self.seq
+            if seq & 1:
+                time.sleep(0)
+                continue
+            data = self._mmap[: self._segment.size]
+            if self.seq == seq:
+                return self._decode(data)
+        msg = "The shared image is being written too often to get a consistent snapshot"
+        raise TimeoutError(msg)
+
+    def _decode(self, data: bytes) -> ImageSnapshot:
+        segment = self._segment
+        _, _, _, seq, monotonic_ns, time_ns, *_ = _HEADER.unpack_from(data)
+        digital_inputs = int.from_bytes(data[segment.digital_inputs], "little")
+        digital_outputs = int.from_bytes(data[segment.digital_outputs], "little")
+        analog_inputs = array("H", data[segment.analog_inputs])
+        analog_outputs = array("H", data[segment.analog_outputs])
+        if sys.byteorder == "big":
+            analog_inputs.byteswap()
+            analog_outputs.byteswap()
+        layout = self._layout
+        return ImageSnapshot(
+            seq,
+            monotonic_ns,
+            time_ns,
+            {name: (digital_inputs >> bit) & 1 for bit, name in enumerate(layout.digital_inputs)},
+            dict(zip(layout.analog_inputs, analog_inputs)),
+            {name: (digital_outputs >> bit) & 1 for bit, name in enumerate(layout.digital_outputs)},
+            dict(zip(layout.analog_outputs, analog_outputs)),
+        )
@@ -0,0 +1,211 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from .lib_types import DigitalLevel, PinType
+from .mapping import PLCMappingIndex
+from .registry import model_index
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+
+class SimulatedPLC:
+    """
+    Simulated PLC with the same read and write methods as the rpiplc instance.
+
+    It doesn't need the C library nor the hardware, so it can be used to test programs (or the
+    librpiplc daemon) locally. The pins are resolved with the mappings of the real models, so the
+    pin names that share a pin identifier (like Q0.5 and A0.5) share their value. Reading an output
+    returns the last value written to it, and the inputs return the values given with
+    set_digital_input() and set_analog_input() (0 by default).
+
+    """
+
+    INPUT = PinType.INPUT
+    OUTPUT = PinType.OUTPUT
+    LOW = DigitalLevel.LOW
+    HIGH = DigitalLevel.HIGH
+
+    def __init__(self) -> None:
+        """Initialize the simulated PLC, not initialized with any model."""
+        self._lock = threading.Lock()
+        self._index = PLCMappingIndex({})
+        self._is_initialized = False
+        self._digital: dict[int, int] = {}
+        self._analog: dict[int, int] = {}
+        self._modes: dict[int, PinType] = {}
+
+    @property
+    def mapping_index(self) -> PLCMappingIndex:
+        """The reverse index of the mapping of the initialized model (empty if not initialized)."""
+        return self._index
+
+    def init(self, version_name: str, model_name: str, *, restart: bool = False) -> int:  # noqa: ARG002
+        """
+        Initialize the simulated PLC with a model, resetting all its pins.
+
+        Args:
+            version_name (str): The version name of the PLC.
+            model_name (str): The model name of the PLC.
+            restart (bool): Ignored, the pins are always reset.
+
+        Returns:
+            int: 0 for success, or 1 if it was already initialized.
+
+        Raises:
+            UnknownPLCConfError: If the version or model is unknown.
+
+        """
+        index = model_index(version_name, model_name)
+        with self._lock:
+            was_initialized = self._is_initialized
+            self._index = index
+            self._is_initialized = True
+            self._digital.clear()
+            self._analog.clear()
+            self._modes.clear()
+        return 1 if was_initialized else 0
+
+    def deinit(self, *, restart: bool = True) -> int:  # noqa: ARG002
+        """
+        Deinitialize the simulated PLC.
+
+        Args:
+            restart (bool): Ignored, the pins are always reset.
+
+        Returns:
+            int: 0 for success, or 2 if it was already deinitialized.
+
+        """
+        with self._lock:
+            if not self._is_initialized:
+                return 2
+            self._index = PLCMappingIndex({})
+            self._is_initialized = False
+            self._digital.clear()
+            self._analog.clear()
+            self._modes.clear()
+        return 0
+
+    def set_digital_input(self, pin_name: str, level: int) -> None:
+        """
+        Set the digital value that the reads of a pin return.
+
+        Args:
+            pin_name (str): The name of the pin.
+            level (int): The digital value (0 or 1).
+
+        """
+        pin = self._index.resolve(pin_name)[0]
+        with self._lock:
+            self._digital[pin] = 1 if level else 0
+
+    def set_analog_input(self, pin_name: str, value: int) -> None:
+        """
+        Set the analog value that the reads of a pin return.
+
+        Args:
+            pin_name (str): The name of the pin.
+            value (int): The analog value.
+
+        """
+        pin = self._index.resolve(pin_name)[0]
+        with self._lock:
+            self._analog[pin] = value
+
+    def pin_mode(self, pin_name: str, mode: PinType) -> int:
+        """Set the mode of a pin, see RPIPLCClass.pin_mode()."""
+        pin = self._index.resolve(pin_name)[0]
+        with self._lock:
+            self._modes[pin] = mode
+        return 0
+
+    def digital_write(
+        self,
+        pin_name: str,
+        level: DigitalLevel | int | bool,  # noqa: FBT001
+        *,
+        force: bool = False,  # noqa: ARG002
+    ) -> int:
+        """Write a digital value to a pin, see RPIPLCClass.digital_write()."""
+        pin = self._index.resolve(pin_name)[0]
+        with self._lock:
+            self._digital[pin] = 1 if level else 0
+            self._analog[pin] = 4095 if level else 0
+        return 0
+
+    def digital_write_many(
+        self,
+        levels: Mapping[str, DigitalLevel | int | bool],
+        *,
+        force: bool = False,
+    ) -> int:
+        """Write the digital values of several pins, see RPIPLCClass.digital_write_many()."""
+        for pin_name, level in levels.items():
+            self.digital_write(pin_name, level, force=force)
+        return 0
+
+    def digital_read(self, pin_name: str) -> int:
+        """Read a digital value from a pin, see RPIPLCClass.digital_read()."""
+        pin = self._index.resolve(pin_name)[0]
+        with self._lock:
+            return self._digital.get(pin, 0)
+
+    def digital_read_many(self, pin_names: Iterable[str]) -> dict[str, int]:
+        """Read the digital values of several pins, see RPIPLCClass.digital_read_many()."""
+        return {pin_name: self.digital_read(pin_name) for pin_name in pin_names}
+
+    def analog_write_set_frequency(self, pin_name: str, freq: int) -> int:  # noqa: ARG002
+        """Set the PWM frequency of a pin, see RPIPLCClass.analog_write_set_frequency()."""
+        self._index.resolve(pin_name)
+        return 0
+
+    def analog_write(self, pin_name: str, value: int, *, force: bool = False) -> int:  # noqa: ARG002
+        """Write an analog value to a pin, see RPIPLCClass.analog_write()."""
+        pin = self._index.resolve(pin_name)[0]
+        with self._lock:
+            self._analog[pin] = value
+            self._digital[pin] = 1 if value else 0
+        return 0
+
+    def analog_write_many(self, values: Mapping[str, int], *, force: bool = False) -> int:
+        """Write the analog values of several pins, see RPIPLCClass.analog_write_many()."""
+        for pin_name, value in values.items():
+            self.analog_write(pin_name, value, force=force)
+        return 0
+
+    def analog_read(self, pin_name: str) -> int:
+        """Read an analog value from a pin, see RPIPLCClass.analog_read()."""
+        pin = self._index.resolve(pin_name)[0]
+        with self._lock:
+            return self._analog.get(pin, 0)
+
+    def delay(self, value: int) -> None:
+        """Pause execution for a number of milliseconds, see RPIPLCClass.delay()."""
+        time.sleep(value / 1000)
+
+    def delay_microseconds(self, value: int) -> None:
+        """Pause execution for a number of microseconds, see RPIPLCClass.delay_microseconds()."""
+        time.sleep(value / 1_000_000)
@@ -0,0 +1,291 @@
+"""
+Copyright (c) 2026 Industrial Shields. All rights reserved.
+
+This file is part of python3-librpiplc.
+
+python3-librpiplc is free software: you can redistribute
+it and/or modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation, either version
+3 of the License, or (at your option) any later version.
+
+python3-librpiplc is distributed in the hope that it will
+be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from array import array
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .lib_types import PeripheralType
+from .scheduler import ScanScheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from . import RPIPLCClass
+
+_ANALOG_INPUT_PERIPHERALS = (PeripheralType.PLC_LTC2309, PeripheralType.PLC_ADS1015)
+
+
+def _import_numpy() -> Any:  # noqa: ANN401
+    """Import NumPy when a stream needs it, so importing the library doesn't pay for it."""
+    try:
+        return import_module("numpy")
+    except ImportError:
+        return None
+
+
+class PinSampler:
+    """
+    Reader of a row of samples of several pins, in column order.
+
+    The digital pins are read with a single digital_read_many (which reads each expander at once)
+    and the pins of the analog-to-digital converters with the analog_read of their pin handles
+    (so their filters apply).
+
+    """
+
+    def __init__(self, plc: RPIPLCClass, pin_names: Iterable[str]) -> None:
+        """
+        Resolve the pins.
+
+        Args:
+            plc (RPIPLCClass): The rpiplc instance used to read the pins.
+            pin_names (Iterable[str]): The names of the pins, in column order.
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model.
+
+        """
+        self._plc = plc
+        self.pin_names = tuple(pin_names)
+        self._digital_columns: list[tuple[int, str]] = []
+        self._analog_columns: list[tuple[int, Callable[[], int]]] = []
+        for column, pin_name in enumerate(self.pin_names):
+            handle = plc.pin(pin_name)
+            if handle.peripheral_type in _ANALOG_INPUT_PERIPHERALS:
+                self._analog_columns.append((column, handle.analog_read))
+            else:
+                self._digital_columns.append((column, pin_name))
+        self._digital_pin_names = [pin_name for _, pin_name in self._digital_columns]
+
+    def read_row(self, samples: Any, base: int) -> None:  # noqa: ANN401
+        """
+        Read all the pins into consecutive items of a buffer.
+
+        Args:
+            samples (Any): The buffer, like an array("H") or a flat NumPy uint16 array.
+            base (int): The index of the item of the first pin.
+
+        """
+        if self._digital_columns:
+            values = self._plc.digital_read_many(self._digital_pin_names)
+            for column, pin_name in self._digital_columns:
+                samples[base + column] = 1 if values[pin_name] > 0 else 0
+        for column, analog_read in self._analog_columns:
+            samples[base + column] = analog_read()
+
+
+class SampleBlock(NamedTuple):
+    """
+    Block of samples of several pins taken at a fixed rate.
+
+    With NumPy, timestamps is an int64 array with a row per sample and samples is a uint16 array
+    with a row per sample and a column per pin. Without it, timestamps is an array("q") and
+    samples is an array("H") with the rows one after the other.
+
+    """
+
+    pin_names: tuple[str, ...]
+    timestamps: Any
+    samples: Any
+
+
+class SampleStream:
+    """
+    Iterator over blocks of samples of several pins, taken by a background thread.
+
+    The sampling thread reads all the pins at a fixed rate with a PinSampler, driven by a scan
+    scheduler. Each row of samples is stored with its monotonic_ns timestamp straight into the
+    preallocated buffers of the current block, and the completed blocks are handed off to the
+    iterator as they are, without copying them. If the iterator falls behind by more than
+    max_blocks blocks, the new blocks are dropped (and counted) instead of stopping the sampling.
+
+    The stream must be closed to stop the sampling thread, for example with a "with" statement.
+
+    Attributes:
+        dropped (int): Number of blocks dropped because the iterator didn't take them.
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        plc: RPIPLCClass,
+        pin_names: Iterable[str],
+        rate_hz: float,
+        block_size: int,
+        *,
+        max_blocks: int = 16,
+        use_numpy: bool | None = None,
+    ) -> None:
+        """
+        Initialize the stream, without starting the sampling thread.
+
+        Args:
+            plc (RPIPLCClass): The rpiplc instance used to read the pins.
+            pin_names (Iterable[str]): The names of the pins to sample, in column order.
+            rate_hz (float): The number of samples of each pin per second.
+            block_size (int): The number of samples of each pin in every block.
+            max_blocks (int): The number of completed blocks that can wait for the iterator
+                              (default is 16).
+            use_numpy (bool | None): Whether to use NumPy arrays, or None to use them if NumPy is
+                                     installed (default is None).
+
+        Raises:
+            UnknownPinError: If any pin doesn't exist in the initialized model.
+            ValueError: If the rate isn't positive, or the block size or max_blocks is smaller
+                        than 1.
+            ImportError: If use_numpy is True and NumPy isn't installed.
+
+        """
+        if rate_hz <= 0:
+            msg = "The rate must be positive"
+            raise ValueError(msg)
+        if block_size < 1:
+            msg = "The block size must be at least 1"
+            raise ValueError(msg)
+        if max_blocks < 1:
+            msg = "The maximum number of waiting blocks must be at least 1"
+            raise ValueError(msg)
+        numpy = _import_numpy() if use_numpy is not False else None
+        if use_numpy and numpy is None:
+            msg = "NumPy isn't installed"
+            raise ImportError(msg)
+
+        self._sampler = PinSampler(plc, pin_names)
+        self._pin_names = self._sampler.pin_names
+
+        self._block_size = block_size
+        self._max_blocks = max_blocks
+        self._numpy = numpy
+        self._scheduler = ScanScheduler(1 / rate_hz)
+        self._scheduler.add_cycle(self._sample)
+        self._blocks: queue.Queue[SampleBlock | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self._closed = False
+        self.dropped = 0
+        self._new_block()
+
+    def __enter__(self) -> SampleStream:  # noqa: PYI034
+        """Start the sampling when entering a "with" block, and close the stream when exiting."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the stream, see close()."""
+        self.close()
+
+    def __iter__(self) -> SampleStream:
+        """Get the stream itself as the iterator of the blocks."""
+        return self
+
+    def __next__(self) -> SampleBlock:
+        """
+        Wait for the next completed block, starting the sampling if it isn't running yet.
+
+        Returns:
+            SampleBlock: The block, which isn't used by the stream anymore.
+
+        Raises:
+            StopIteration: If the stream is closed and all its blocks were taken.
+
+        """
+        if self._thread is None and not self._closed:
+            self.start()
+        block = self._blocks.get()
+        if block is None:
+            self._blocks.put(None)
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+        return block
+
+    @property
+    def pin_names(self) -> tuple[str, ...]:
+        """The names of the sampled pins, in column order."""
+        return self._pin_names
+
+    @property
+    def scheduler(self) -> ScanScheduler:
+        """The scan scheduler of the sampling, with its statistics."""
+        return self._scheduler
+
+    def start(self) -> None:
+        """Start the sampling thread, if it isn't already running."""
+        if self._thread is not None or self._closed:
+            return
+        self._thread = threading.Thread(target=self._run, name="rpiplc-stream", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the sampling thread, the blocks already completed can still be iterated."""
+        if self._closed:
+            return
+        self._closed = True
+        self._scheduler.stop()
+        if self._thread is not None:
+            self._thread.join()
+        else:
+            self._blocks.put(None)
+
+    def _run(self) -> None:
+        """Sample the pins until the stream is closed."""
+        try:
+            self._scheduler.run()
+        except BaseException as exc:
+            self._error = exc
+            raise
+        finally:
+            self._blocks.put(None)
+
+    def _new_block(self) -> None:
+        """Allocate the buffers of the next block."""
+        rows = self._block_size
+        columns = len(self._pin_names)
+        if self._numpy is not None:
+            timestamps = self._numpy.zeros(rows, dtype=self._numpy.int64)
+            samples = self._numpy.zeros((rows, columns), dtype=self._numpy.uint16)
+            self._flat_samples = samples.reshape(-1)
+        else:
+            timestamps = array("q", bytes(8 * rows))
+            samples = array("H", bytes(2 * rows * columns))
+            self._flat_samples = samples
+        self._block = SampleBlock(self._pin_names, timestamps, samples)
+        self._row = 0
+
+    def _sample(self) -> None:
+        """Read a row of samples, handing off the block when it's complete."""
+        row = self._row
+        self._block.timestamps[row] = time.monotonic_ns()
+        self._sampler.read_row(self._flat_samples, row * len(self._pin_names))
+
+        self._row = row + 1
+        if self._row < self._block_size:
+            return
+        if self._blocks.qsize() >= self._max_blocks:
+            self.dropped += 1
+            self._row = 0
+            return
+        self._blocks.put(self._block)
+        self._new_block()
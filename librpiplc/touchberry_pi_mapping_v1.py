@@ -17,7 +17,7 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .mapping import PLCMappingDict, make_pin_ads1015, make_pin_direct
+from .mapping import PLCPinTable, make_pin_ads1015, make_pin_direct
 
 extras = {
     "RE": make_pin_direct(17),
@@ -47,6 +47,8 @@ extras = {
     "Q4": make_pin_direct(4),
 }
 
+_table = PLCPinTable(extras=extras)
+
 hw = {
-    "TOUCHBERRY_PI": PLCMappingDict({**extras}),
+    "TOUCHBERRY_PI": _table.model("extras"),
 }
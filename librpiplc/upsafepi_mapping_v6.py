@@ -17,12 +17,14 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-from .mapping import PLCMappingDict, make_pin_direct
+from .mapping import PLCPinTable, make_pin_direct
 
 extras = {
     "DE_RE": make_pin_direct(27),
 }
 
+_table = PLCPinTable(extras=extras)
+
 hw = {
-    "UPSAFEPI": PLCMappingDict({**extras}),
+    "UPSAFEPI": _table.model("extras"),
 }
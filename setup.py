@@ -36,6 +36,7 @@ setup(
         "License :: OSI Approved :: GNU Lesser General Public License v3 or later (LGPLv3+)"
     ],
     extras_require={
+        "numpy": ["numpy"],
         "dev": [
             "python-lsp-server~=1.12.2",
             "ruff~=0.12.1",